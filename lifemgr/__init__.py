@@ -0,0 +1,8 @@
+"""Helpers that back the Claude Code skills with local, indexed state.
+
+Skills stay Markdown workflows; anything that needs to be fast or durable
+(seen-item history, indexes, caches) lives here and is driven through
+``python -m lifemgr <command>`` from the repo root.
+"""
+
+__version__ = "0.3.0.dev0"
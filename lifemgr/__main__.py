@@ -0,0 +1,36 @@
+"""``python -m lifemgr <command> [args]`` — entry point the skills call."""
+
+from __future__ import annotations
+
+import importlib
+import sys
+
+#: command name -> module exposing ``main(argv) -> int``
+COMMANDS = {
+    "seen": "lifemgr.seen",
+    "feeds": "lifemgr.feeds",
+    "capture": "lifemgr.capture",
+    "search": "lifemgr.search",
+    "query": "lifemgr.query",
+    "memory": "lifemgr.memories",
+    "videos": "lifemgr.videos",
+    "git-sync": "lifemgr.gitsync",
+    "cards": "lifemgr.cards",
+    "template": "lifemgr.templates",
+    "standin": "lifemgr.standin",
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help") or argv[0] not in COMMANDS:
+        print("usage: python -m lifemgr <command> [args]\n\ncommands:")
+        for name, module in COMMANDS.items():
+            doc = (importlib.import_module(module).__doc__ or "").strip().splitlines()[0]
+            print(f"  {name:<12} {doc}")
+        return 0 if argv[:1] in ([], ["-h"], ["--help"]) else 2
+    return importlib.import_module(COMMANDS[argv[0]]).main(argv[1:])
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,29 @@
+"""Benchmarks for the lifemgr stores and pipelines.
+
+Each module builds a synthetic workload in a temp directory, times the
+operations that matter to the skills, and prints a small table::
+
+    python -m lifemgr.bench.feeds --feeds 300
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Iterator, Sequence
+
+
+@contextmanager
+def timed(results: list[tuple[str, float]], label: str) -> Iterator[None]:
+    """Append ``(label, seconds)`` to ``results`` when the block exits."""
+    started = time.perf_counter()
+    yield
+    results.append((label, time.perf_counter() - started))
+
+
+def report(title: str, results: Sequence[tuple[str, float]]) -> None:
+    width = max(len(label) for label, _ in results)
+    print(title)
+    for label, seconds in results:
+        shown = f"{seconds * 1000:9.2f} ms" if seconds < 1 else f"{seconds:9.2f} s "
+        print(f"  {label:<{width}}  {shown}")
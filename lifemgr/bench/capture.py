@@ -0,0 +1,68 @@
+"""Capture URL-index build and batch lookup on a synthetic folder.
+
+Writes ``--notes`` Capture notes spread over year/month folders, then times
+the cold build, a 500-URL batch check against an unchanged folder, and the
+same check after a handful of new notes land.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+from pathlib import Path
+
+from ..capture import CaptureIndex
+from . import report, timed
+
+
+def write_capture_corpus(root: Path, n_notes: int) -> list[str]:
+    urls = []
+    for i in range(n_notes):
+        folder = root / f"{2020 + i % 6}" / f"{1 + i % 12:02d}"
+        folder.mkdir(parents=True, exist_ok=True)
+        url = f"https://www.youtube.com/watch?v={i:011d}" if i % 3 == 0 else f"https://blog{i % 97}.example/p/{i}"
+        (folder / f"note-{i}.md").write_text(
+            f'---\ntitle: "Note {i}"\nsource: "{url}"\ntags: [capture]\n---\n\n# Note {i}\n\nSummary.\n',
+            encoding="utf-8")
+        urls.append(url)
+    return urls
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m lifemgr.bench.capture", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--notes", type=int, default=20_000)
+    parser.add_argument("--candidates", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "Capture"
+        urls = write_capture_corpus(root, args.notes)
+        rng = random.Random(1)
+        half = args.candidates // 2
+        # Half already captured (in youtu.be / tracking-param forms), half new.
+        candidates = [u.replace("www.youtube.com/watch?v=", "youtu.be/") + ("?utm_source=rss" if "blog" in u else "")
+                      for u in rng.sample(urls, half)]
+        candidates += [f"https://new.example/p/{i}" for i in range(args.candidates - half)]
+
+        results: list[tuple[str, float]] = []
+        with CaptureIndex(root, Path(tmp) / "index.db") as index:
+            with timed(results, "cold build"):
+                index.refresh(full=True)
+            with timed(results, f"check {args.candidates} (unchanged folder)"):
+                missing = index.unseen(candidates)
+            assert len(missing) == args.candidates - half, len(missing)
+            for i in range(10):
+                (root / "2020" / "01" / f"fresh-{i}.md").write_text(f"---\nsource: https://new.example/p/{i}\n---\n")
+            with timed(results, f"check {args.candidates} (10 new notes)"):
+                missing = index.unseen(candidates)
+            with timed(results, f"check {args.candidates} (re-list every folder)"):
+                index.refresh(full=True)
+                index.unseen(candidates, refresh=False)
+
+    report(f"{args.notes} notes, {args.candidates} candidates ({len(missing)} without a note)", results)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+"""Due-card selection and review updates on a large card store.
+
+Writes N cards across flashcard notes (a third of them with existing
+``<!--SR:-->`` schedules), imports them, then times: picking the next 20
+due cards by rescanning every note (what ``/review-session`` did), the
+same from the index, review updates, a no-op re-import and an export.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from ..cards import CardStore, parse_note
+from . import report, timed
+
+
+def write_notes(root: Path, n_cards: int, per_note: int = 50, seed: int = 7) -> int:
+    rng = random.Random(seed)
+    today = date.today()
+    root.mkdir(parents=True, exist_ok=True)
+    notes = 0
+    for start in range(0, n_cards, per_note):
+        deck = f"deck{notes % 20}"
+        lines = ["---", f"tags: [learning, flashcards/{deck}]", "---", f"# Session {notes}", ""]
+        for i in range(start, min(start + per_note, n_cards)):
+            card = f"Question number {i} about topic {i % 97}::Answer {i}"
+            if i % 3 == 0:
+                due = today + timedelta(days=rng.randint(-30, 60))
+                card += f" <!--SR:!{due.isoformat()},{rng.randint(1, 90)},{rng.randint(130, 300)}-->"
+            lines.append(card)
+        (root / f"session-{notes:05d}.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        notes += 1
+    return notes
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m lifemgr.bench.cards", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cards", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--reviews", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        notes = write_notes(tmp / "notes", args.cards)
+        results: list[tuple[str, float]] = []
+        with CardStore(tmp / "cards.db") as store:
+            with timed(results, f"import {notes} notes"):
+                store.import_notes([tmp / "notes"])
+            now = time.time()
+
+            with timed(results, "next 20 due, rescanning notes"):
+                due = []
+                for path in sorted((tmp / "notes").glob("*.md")):
+                    for nc in parse_note(path.read_text(encoding="utf-8"), str(path)):
+                        if nc.schedule and date.fromisoformat(nc.schedule[0]) <= date.today():
+                            due.append((nc.schedule[0], nc.card.id))
+                scanned = sorted(due)[:20]
+
+            started = time.perf_counter()
+            for _ in range(args.queries):
+                picked = store.due(20, new=5)
+            results.append(("next 20 due + 5 new, indexed (per query)", (time.perf_counter() - started) / args.queries))
+            started = time.perf_counter()
+            for _ in range(args.queries):
+                store.due(20, deck="deck7")
+            results.append(("next 20 due in one deck (per query)", (time.perf_counter() - started) / args.queries))
+
+            rng = random.Random(1)
+            ids = [c.id for c in store.due(args.reviews, new=args.reviews)]
+            started = time.perf_counter()
+            for i, card_id in enumerate(ids[:args.reviews]):
+                store.review(card_id, rng.choice((1, 3, 3, 3, 4)), now=now + i)
+            results.append(("review update (per review)", (time.perf_counter() - started) / min(len(ids), args.reviews)))
+            with timed(results, "next 20 due after reviews"):
+                store.due(20)
+            with timed(results, "re-import, nothing changed"):
+                store.import_notes([tmp / "notes"])
+            with timed(results, "export schedules to notes"):
+                changed = len(store.export_notes())
+            total = sum(s["cards"] for s in store.stats().values())
+
+    report(f"{total} cards in {notes} notes ({len(scanned)} due by scan, {len(picked)} picked, "
+           f"{changed} notes exported)", results)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+"""Sequential vs parallel vs cached ``git-sync`` over N local repos.
+
+Creates N bare "remotes" and clones in a temp directory. Remotes are
+reached through git's ``ext::`` transport behind a ``sleep``, so every
+fetch and ``ls-remote`` pays a simulated network round trip. Syncs them
+one at a time, on the pool, and again with the state file (nothing
+changed, then a tenth of the remotes changed).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+from ..gitsync import sync_all
+from . import report, timed
+
+_IDENTITY = {"GIT_AUTHOR_NAME": "bench", "GIT_AUTHOR_EMAIL": "bench@localhost",
+             "GIT_COMMITTER_NAME": "bench", "GIT_COMMITTER_EMAIL": "bench@localhost"}
+
+
+def _git(*args: str, cwd: Path | None = None) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, env={**os.environ, **_IDENTITY})
+
+
+def make_repos(root: Path, n: int, latency: float) -> list[tuple[Path, Path]]:
+    """``n`` (clone, upstream clone) pairs whose origin sleeps ``latency`` per connection."""
+    pairs = []
+    for i in range(n):
+        bare, work, other = root / f"up{i}.git", root / "spaces" / f"repo{i:03d}", root / f"other{i}"
+        _git("init", "-q", "--bare", str(bare))
+        _git("clone", "-q", str(bare), str(work))
+        (work / "README.md").write_text(f"# repo {i}\n")
+        _git("add", "README.md", cwd=work)
+        _git("commit", "-q", "-m", "init", cwd=work)
+        _git("push", "-q", "origin", "HEAD", cwd=work)
+        _git("clone", "-q", str(bare), str(other))
+        _git("config", "protocol.ext.allow", "always", cwd=work)
+        _git("remote", "set-url", "origin", f"ext::sh -c sleep% {latency};% git-%s% {bare}", cwd=work)
+        pairs.append((work, other))
+    return pairs
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m lifemgr.bench.gitsync", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repos", type=int, default=24)
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds per remote connection")
+    parser.add_argument("--jobs", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pairs = make_repos(tmp, args.repos, args.latency)
+        repos = [work for work, _ in pairs]
+        state = tmp / "git-sync.json"
+
+        results: list[tuple[str, float]] = []
+        with timed(results, "sequential (1 job, no state)"):
+            list(sync_all(repos, jobs=1, state_path=None))
+        with timed(results, f"parallel ({args.jobs} jobs, no state)"):
+            list(sync_all(repos, jobs=args.jobs, state_path=state))
+        with timed(results, "parallel, nothing changed"):
+            cached = sum(r.action == "cached" for r in sync_all(repos, jobs=args.jobs, state_path=state))
+        for _, other in pairs[::10]:
+            _git("commit", "-q", "--allow-empty", "-m", "upstream change", cwd=other)
+            _git("push", "-q", cwd=other)
+        with timed(results, f"parallel, {len(pairs[::10])} remotes changed, --pull"):
+            pulled = sum(r.action == "pulled" for r in
+                         sync_all(repos, jobs=args.jobs, state_path=state, pull=True))
+
+    report(f"{args.repos} repos, {args.latency * 1000:.0f} ms per remote connection "
+           f"({cached} unchanged on re-run, {pulled} pulled)", results)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
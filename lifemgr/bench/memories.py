@@ -0,0 +1,57 @@
+"""``/refresh`` memory loading cost from 100 to 10,000 memories.
+
+For each size, fills a memories folder through the log, then times what a
+session start does: open the store (replaying any new log lines) and load
+a token-budgeted selection. Time and output size should stay flat.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from ..memories import MemoryStore
+from . import report
+
+TYPES = ["preference", "correction", "insight", "decision"]
+TAGS = ["git", "writing", "python", "health", "career", "obsidian", "planning", "learning"]
+
+
+def fill(store: MemoryStore, n: int, seed: int = 11) -> None:
+    rng = random.Random(seed)
+    start = date(2026, 10, 1) - timedelta(days=n // 5)
+    for i in range(n):
+        day = (start + timedelta(days=i // 5)).isoformat()
+        words = " ".join(rng.choice(TAGS) + str(rng.randint(0, 999)) for _ in range(rng.randint(20, 80)))
+        store.add(f"Memory {i}", words, type=rng.choice(TYPES), tags=rng.sample(TAGS, 2), day=day)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m lifemgr.bench.memories", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--budget", type=int, default=1500)
+    args = parser.parse_args(argv)
+
+    results: list[tuple[str, float]] = []
+    sizes = [int(s) for s in args.sizes.split(",")]
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            root, db = Path(tmp) / "memories", Path(tmp) / "memories.db"
+            with MemoryStore(root, db) as store:
+                fill(store, n)
+            started = time.perf_counter()
+            with MemoryStore(root, db) as store:
+                chosen = store.load(args.budget, tags=["git", "writing"], today=date(2026, 10, 1))
+            elapsed = time.perf_counter() - started
+            chars = sum(len(text) for _, text in chosen)
+            results.append((f"{n:>6} memories: {len(chosen):>3} loaded, {chars:>5} chars", elapsed))
+    report(f"session-start load (open + sync + load, budget {args.budget} tokens)", results)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
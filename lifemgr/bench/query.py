@@ -0,0 +1,76 @@
+"""Frontmatter query engine: cold build, warm reload and repeated queries.
+
+Generates ``--notes`` TaskNotes-style notes (half with inline ``tags: [task]``,
+half with TaskNotes' block-list tags and contexts), then times the first parse
+with no cache, a fresh process reloading the pickled table, and repeated
+filter/sort/group queries in one session.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+from pathlib import Path
+
+from ..query import NoteTable
+from . import report, timed
+
+
+def write_tasks(root: Path, n_notes: int, seed: int = 5) -> list[Path]:
+    rng = random.Random(seed)
+    folder = root / "03 TaskNotes"
+    folder.mkdir(parents=True, exist_ok=True)
+    written = []
+    for i in range(n_notes):
+        path = folder / f"task-{i}.md"
+        if i % 2:
+            tags = f"tags:\n  - task\n  - area/{rng.choice(['work', 'home'])}\ncontexts:\n  - \"@desk\"\n  - \"@phone\"\n"
+        else:
+            tags = "tags: [task]\n"
+        path.write_text(
+            f"---\nstatus: {rng.choice(['open', 'in-progress', 'done'])}\n"
+            f"priority: {rng.choice(['high', 'medium', 'low'])}\n"
+            f"due: 2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}\n"
+            f"project: \"[[Project {i % 40}]]\"\n{tags}---\n\n# Task {i}\n\nDetails.\n",
+            encoding="utf-8")
+        written.append(path)
+    return written
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m lifemgr.bench.query", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--notes", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = Path(tmp) / "vault"
+        files = write_tasks(vault, args.notes)
+        cache = Path(tmp) / "cache"
+        results: list[tuple[str, float]] = []
+        with timed(results, "cold build (no cache)"):
+            NoteTable(vault, cache_dir=cache).refresh()
+        with timed(results, "new process: load cache + stat"):
+            tbl = NoteTable(vault, cache_dir=cache)
+            tbl.refresh()
+        for path in files[:10]:
+            path.write_text(path.read_text().replace("status: open", "status: done"))
+        with timed(results, "refresh after 10 edits"):
+            tbl.refresh()
+        where = ["tags~task", "status!=done", "due<=2026-06-30"]
+        with timed(results, f"{args.repeat}x filter+sort (in session)"):
+            for _ in range(args.repeat):
+                rows = tbl.select(where, sort=["priority", "due"], fields=["path", "due", "priority"])
+        results[-1] = (results[-1][0], results[-1][1] / args.repeat)
+        results[-1] = ("  per query", results[-1][1])
+        with timed(results, "group by status"):
+            tbl.group("status", fields=["path"])
+        tagged = len(tbl.select(["tags~task"], fields=["path"]))
+
+    report(f"{args.notes} notes ({tagged} tagged #task, {len(rows)} matched the filter)", results)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+"""Vault search index build, re-index and query latency on a synthetic vault.
+
+Generates ``--notes`` notes with frontmatter, tags and a few headed
+sections drawn from a Zipf-ish vocabulary, then times the cold build, a
+no-op re-index, a re-index after edits, and BM25 queries with and without
+filters.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from ..search import VaultIndex
+from . import report, timed
+
+FOLDERS = ["02 Calendar", "03 TaskNotes", "05 Personal", "07 Knowledge Base/Capture", "08 AI Research"]
+TAGS = ["task", "learning", "capture", "health", "career", "ai", "project", "idea"]
+
+
+def write_vault(root: Path, n_notes: int, seed: int = 7) -> list[Path]:
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(20_000)]
+    weights = [1 / (i + 1) for i in range(len(vocab))]
+    written = []
+    for i in range(n_notes):
+        folder = root / FOLDERS[i % len(FOLDERS)]
+        folder.mkdir(parents=True, exist_ok=True)
+        words = rng.choices(vocab, weights, k=240)
+        sections = "\n\n".join(f"## Section {s}\n\n" + " ".join(words[s * 60:(s + 1) * 60]) for s in range(4))
+        tags = rng.sample(TAGS, 2)
+        path = folder / f"note-{i}.md"
+        path.write_text(f"---\nstatus: {rng.choice(['open', 'done', 'active'])}\ntags: [{', '.join(tags)}]\n---\n"
+                        f"# Note {i}\n\n{sections}\n", encoding="utf-8")
+        written.append(path)
+    return written
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m lifemgr.bench.search", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--notes", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--edits", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = Path(tmp) / "vault"
+        files = write_vault(vault, args.notes)
+        results: list[tuple[str, float]] = []
+        with VaultIndex(vault, Path(tmp) / "index") as index:
+            with timed(results, "cold build"):
+                stats = index.update()
+            with timed(results, "re-index, nothing changed"):
+                index.update()
+            edited = rng.sample(files, args.edits)
+            for n, path in enumerate(edited):
+                if n % 2:
+                    os.utime(path)  # touched but identical: hash check only
+                else:
+                    path.write_text(path.read_text() + "\nappended w42 w7\n")
+            with timed(results, f"re-index, {args.edits} edited/touched"):
+                index.update()
+
+            queries = [" ".join(f"w{rng.randint(0, 3000)}" for _ in range(rng.randint(1, 4)))
+                       for _ in range(args.queries)]
+            for label, kwargs in (("query top-10", {}),
+                                  ("query top-10 --tag learning", {"tags": ["learning"]}),
+                                  ("query top-10 --folder --where", {"folder": "08 AI Research",
+                                                                      "where": {"status": "open"}})):
+                latencies = []
+                for q in queries:
+                    started = time.perf_counter()
+                    index.query(q, 10, **kwargs)
+                    latencies.append(time.perf_counter() - started)
+                results.append((f"{label} (p50)", statistics.median(latencies)))
+                results.append((f"{label} (p95)", statistics.quantiles(latencies, n=20)[-1]))
+
+    report(f"{args.notes} notes, {stats['chunks']} chunks", results)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
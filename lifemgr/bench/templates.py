@@ -0,0 +1,115 @@
+"""Rendering and writing N notes from templates, one at a time vs batched.
+
+Creates N TASK/BUG/SPIKE issues from ``shared/templates/pm`` the way
+``/issue`` did (re-read the template, list ``issues/`` for the next
+number, write the note), then with compiled templates one issue per
+call, then as one ``new_issues`` batch. Also times rendering alone and
+writing N Capture notes into an indexed folder one at a time vs with
+``write_batch``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+
+from .. import query
+from ..capture import CaptureIndex
+from ..templates import ISSUE_KINDS, PM_TEMPLATES, IssueNumbers, Template, load, new_issues, slug, write_batch
+from . import report, timed
+
+CAPTURE_TEMPLATE = """---
+title: "TODO: Title"
+source: ""
+created: "YYYY-MM-DD"
+type: "article"  # article | video | podcast
+tags: ["capture"]
+---
+
+# [Title]
+
+TODO: summary
+"""
+
+
+def naive_issue(ideas: Path, templates: Path, project: str, kind: str, title: str) -> Path:
+    """One ``/issue`` run as the skill did it: read, list, replace, write."""
+    text = (templates / "issues" / f"{kind.upper()}-template.md").read_text(encoding="utf-8")
+    folder = ideas / project / "issues"
+    folder.mkdir(parents=True, exist_ok=True)
+    number = max((int(m.group(1)) for name in os.listdir(folder) if (m := re.match(r"(\d+)-", name))), default=0) + 1
+    today = date.today().isoformat()
+    text = text.replace("TODO: YYYY-MM-DD", today).replace("YYYY-MM-DD", today)
+    text = text.replace("TODO: Project Name", project).replace("TODO: Bug Title", title).replace("[Title]", title)
+    text = re.sub(r"(?<!#)(?<!^)###(?!#)", f"{number:03d}", text, flags=re.MULTILINE)
+    path = folder / f"{number:03d}-{slug(title)}" / f"{kind.upper()}-{number:03d}.md"
+    path.parent.mkdir()
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m lifemgr.bench.templates", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--notes", type=int, default=1000)
+    args = parser.parse_args(argv)
+    specs = [{"kind": ISSUE_KINDS[i % 3], "title": f"Issue {i} about part {i % 37}"} for i in range(args.notes)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        results: list[tuple[str, float]] = []
+        with timed(results, f"{args.notes} issues, read + list + write per issue"):
+            for spec in specs:
+                naive_issue(tmp / "naive", PM_TEMPLATES, "acme", spec["kind"], spec["title"])
+
+        ideas = tmp / "ideas"
+        query.table(ideas, "*/issues/**/*.md", cache_dir=tmp / "query")
+        with IssueNumbers(ideas, tmp / "numbers.db") as numbers:
+            with timed(results, f"{args.notes} issues, compiled, one per call"):
+                for spec in specs:
+                    new_issues("acme", [spec], ideas=ideas, numbers=numbers)
+            with timed(results, f"{args.notes} issues, compiled, one batch"):
+                batch = new_issues("beta", specs, ideas=ideas, numbers=numbers)
+            with timed(results, f"{args.notes} issues, one batch with PLAN + WORKLOG"):
+                new_issues("gamma", specs, ideas=ideas, numbers=numbers, plan=True, worklog=True)
+            with timed(results, "next number, index catching up on the batches"):
+                numbers.allocate("beta")
+            with timed(results, "next number, index current"):
+                numbers.allocate("beta")
+        now = datetime.now()
+        template = load(PM_TEMPLATES / "issues" / "BUG-template.md")
+        with timed(results, f"render only, {args.notes} notes (cached template)"):
+            for i, spec in enumerate(specs):
+                template.render(spec, now=now, number=i + 1)
+
+        capture = Template(CAPTURE_TEMPLATE)
+        notes = [(f"Post {i} on topic {i % 41}", f"https://blog{i % 97}.example/p/{i}") for i in range(args.notes)]
+        (tmp / "one" / "2026").mkdir(parents=True)
+        (tmp / "batch" / "2026").mkdir(parents=True)
+        with CaptureIndex(tmp / "one", tmp / "one.db") as index:
+            index.refresh()
+            with timed(results, f"{args.notes} Capture notes, write + index each"):
+                for title, url in notes:
+                    path = tmp / "one" / "2026" / f"{title}.md"
+                    if path.exists():
+                        path = path.with_name(f"{title} (2).md")
+                    path.write_text(capture.render({"title": title, "source": url}, now=now), encoding="utf-8")
+                    index.add(path)
+        with CaptureIndex(tmp / "batch", tmp / "batch.db") as index:
+            index.refresh()
+            with timed(results, f"{args.notes} Capture notes, write_batch + index once"):
+                write_batch(((tmp / "batch" / "2026" / f"{title}.md",
+                              capture.render({"title": title, "source": url}, now=now)) for title, url in notes),
+                            index=index)
+            indexed = index.count()[0]
+
+    report(f"{args.notes} notes per run ({batch[-1].parent.name} last in batch, {indexed} Capture notes indexed)",
+           results)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
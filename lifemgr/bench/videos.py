@@ -0,0 +1,85 @@
+"""Sequential vs pipelined transcript catchup, cold and warm cache.
+
+Serves synthetic channel feeds and WebVTT transcripts from a stand-in
+host with simulated latency and runs the pipeline with a summarizer that
+sleeps per chunk, first with one worker per stage (the old one-at-a-time
+flow), then with the default pools, then again with every transcript
+already cached. Finally it chunks a three-hour transcript from the cache
+and reports peak memory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from ..seen import SeenStore
+from ..standin import StandinServer, write_video_corpus
+from ..videos import HttpTranscripts, TranscriptCache, TranscriptPipeline, chunk_transcript, excerpt
+from . import report, timed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m lifemgr.bench.videos", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--videos", type=int, default=3, help="videos per channel")
+    parser.add_argument("--minutes", type=int, default=30, help="transcript length")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per request")
+    parser.add_argument("--summary-delay", type=float, default=0.02, help="seconds per summarized chunk")
+    parser.add_argument("--workers", type=int, default=8, help="fetch and summarize workers")
+    args = parser.parse_args(argv)
+
+    def summarize(video, chunk):
+        time.sleep(args.summary_delay)
+        return excerpt(video, chunk)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        channel_ids = write_video_corpus(tmp / "corpus", args.channels, args.videos, minutes=args.minutes)
+        with StandinServer(tmp / "corpus", latency=args.latency) as server, SeenStore(tmp / "catchup.db") as store:
+            for i, channel_id in enumerate(channel_ids):
+                store.upsert_source("channel", channel_id, name=f"Channel {i}",
+                                    priority="high" if i % 5 == 0 else None)
+            sources = store.sources("channel")
+
+            def run(cache_dir: str, workers: int) -> tuple[int, float]:
+                pipeline = TranscriptPipeline(
+                    HttpTranscripts(server.url("transcripts/{video_id}.vtt")), TranscriptCache(tmp / cache_dir),
+                    summarize, feed_url=server.url("channels/{channel_id}.xml"), discover_workers=workers,
+                    fetch_workers=workers, summarize_workers=workers, chunk_words=500)
+                started = time.perf_counter()
+                first = 0.0
+                chunks = 0
+                for result in pipeline.run(sources):
+                    first = first or time.perf_counter() - started
+                    chunks += result.chunks
+                return chunks, first
+
+            results: list[tuple[str, float]] = []
+            with timed(results, "sequential (1 worker per stage)"):
+                chunks, _ = run("cache-seq", 1)
+            with timed(results, f"pipelined ({args.workers} workers per stage)"):
+                _, first = run("cache", args.workers)
+            results.append(("  first video ready after", first))
+            with timed(results, "pipelined, warm cache"):
+                run("cache", args.workers)
+
+            cache = TranscriptCache(tmp / "cache")
+            cache.put("longvideo01", ((s, f"Point {s}, and this is what a long talk sounds like.") for s in range(0, 3 * 3600, 2)))
+            tracemalloc.start()
+            with timed(results, "chunk a 3-hour transcript"):
+                n_long = sum(1 for _ in chunk_transcript(cache.lines("longvideo01")))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    report(f"{args.channels} channels x {args.videos} videos, {args.minutes} min transcripts ({chunks} chunks), "
+           f"{args.latency * 1000:.0f} ms latency, {args.summary_delay * 1000:.0f} ms per summary", results)
+    print(f"  3-hour transcript: {n_long} chunks, peak {peak / 1024:.0f} KiB while chunking")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
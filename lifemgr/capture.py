@@ -0,0 +1,308 @@
+"""Source-URL index for ``07 Knowledge Base/Capture/``.
+
+The catchup skills check whether an item already has a Capture note before
+writing one. Rather than grepping the folder for every candidate, this
+keeps a persistent ``normalized URL -> note path`` table next to the
+notes' mtimes.
+
+Keeping it current is cheap. Each lookup first compares directory mtimes,
+which change whenever a note is added, removed or renamed, and re-lists
+only the directories that moved. The notes in unchanged directories are
+stat'ed against their stored mtimes, which catches in-place edits without
+listing those directories, and only notes whose mtime moved are re-read.
+A missing, corrupt or outdated index file is rebuilt from scratch::
+
+    python -m lifemgr capture unseen URL [URL ...]   # URLs with no note yet
+    python -m lifemgr capture lookup URL [URL ...]   # JSON url -> path|null
+    python -m lifemgr capture add PATH               # index a note just written
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import posixpath
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from . import frontmatter, paths
+from .urls import normalize_url
+
+SCHEMA_VERSION = 3
+#: Frontmatter keys that hold a note's source URL, in priority order.
+URL_FIELDS = ("source", "url", "source_url", "link", "video_url", "youtube_url", "original")
+#: Fallback for notes without frontmatter: a ``Source:``/``URL:`` line near the top.
+_SOURCE_LINE = re.compile(r"^\W*(?:source|url|link|video|original)\W*:\W*.*?(https?://[^\s)>\]]+)",
+                          re.IGNORECASE | re.MULTILINE)
+_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS notes (path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS urls (url TEXT NOT NULL, path TEXT NOT NULL, PRIMARY KEY (url, path)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS urls_path ON urls (path);
+"""
+
+
+def note_urls(path: str | Path) -> list[str]:
+    """Normalized source URLs recorded in a Capture note."""
+    meta, body = frontmatter.read_head(path)
+    found: list[str] = []
+    for key in URL_FIELDS:
+        value = meta.get(key)
+        for v in value if isinstance(value, list) else [value]:
+            if isinstance(v, str) and v.startswith(("http://", "https://")):
+                found.append(normalize_url(v))
+    if not found:
+        found += (normalize_url(m) for m in _SOURCE_LINE.findall(body[:4000]))
+    return list(dict.fromkeys(found))
+
+
+class CaptureIndex:
+    """Persistent URL -> note index over a folder of Markdown notes."""
+
+    def __init__(self, root: str | Path = paths.CAPTURE_DIR, db_path: str | Path | None = None):
+        self.root = Path(root).resolve()
+        self.db_path = Path(db_path) if db_path else paths.CACHE_DIR / "capture-index.db"
+        self.db = self._open()
+        self.last_refresh: dict[str, int] = {}
+
+    def _open(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            db = sqlite3.connect(self.db_path, isolation_level=None)
+            db.executescript(SCHEMA)
+            meta = dict(db.execute("SELECT key, value FROM meta"))
+        except sqlite3.DatabaseError:
+            # Corrupt file: it's only a cache, so start over.
+            self.db_path.unlink(missing_ok=True)
+            return self._open()
+        if meta.get("version") != str(SCHEMA_VERSION) or meta.get("root") != str(self.root):
+            db.executescript("DELETE FROM notes; DELETE FROM dirs; DELETE FROM urls; DELETE FROM meta;")
+            db.executemany("INSERT INTO meta VALUES (?, ?)",
+                           [("version", str(SCHEMA_VERSION)), ("root", str(self.root))])
+        db.execute("PRAGMA journal_mode=WAL")
+        return db
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "CaptureIndex":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # -- keeping current ------------------------------------------------
+
+    def refresh(self, *, full: bool = False) -> dict[str, int]:
+        """Bring the index up to date; returns counts of what changed.
+
+        ``full`` re-lists every directory, not just the ones whose mtime
+        changed.
+        """
+        stats = {"dirs": 0, "indexed": 0, "removed": 0}
+        known_dirs = dict(self.db.execute("SELECT path, mtime_ns FROM dirs"))
+        seen_dirs: dict[str, int] = {}
+        self.db.execute("BEGIN")
+        try:
+            for rel, mtime_ns, entries in self._walk(known_dirs, full):
+                seen_dirs[rel] = mtime_ns
+                if entries is None:
+                    self._check_dir(rel, stats)
+                    continue
+                stats["dirs"] += 1
+                self._sync_dir(rel, entries, stats)
+            for rel in known_dirs.keys() - seen_dirs.keys():
+                stats["removed"] += self._drop_dir(rel)
+            self.db.execute("DELETE FROM dirs")
+            self.db.executemany("INSERT INTO dirs VALUES (?, ?)", seen_dirs.items())
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.last_refresh = stats
+        return stats
+
+    def rebuild(self) -> dict[str, int]:
+        self.db.executescript("DELETE FROM notes; DELETE FROM dirs; DELETE FROM urls;")
+        return self.refresh(full=True)
+
+    def add(self, path: str | Path) -> list[str]:
+        """Index one note right after writing it; returns its URLs."""
+        return self.add_many([path])[0]
+
+    def add_many(self, paths: Iterable[str | Path]) -> list[list[str]]:
+        """``add`` for a batch of notes in one transaction.
+
+        Raises ``ValueError`` without indexing anything if a note isn't
+        under ``root``.
+        """
+        resolved = [Path(p).resolve() for p in paths]
+        outside = [str(p) for p in resolved if not p.is_relative_to(self.root)]
+        if outside:
+            raise ValueError(f"not under {self.root}: {', '.join(outside)}")
+        found = [(p.relative_to(self.root).as_posix(), note_urls(p), p.stat().st_mtime_ns) for p in resolved]
+        self.db.execute("BEGIN")
+        try:
+            for rel, urls, mtime_ns in found:
+                self._index_note(rel, urls, mtime_ns)
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return [urls for _, urls, _ in found]
+
+    def _walk(self, known_dirs: dict[str, int], full: bool) -> Iterator[tuple[str, int, list[os.DirEntry] | None]]:
+        """Yield ``(rel_dir, mtime_ns, entries)``; entries is ``None`` when unchanged.
+
+        An unchanged directory isn't listed at all: its subdirectories can't
+        have changed either, so they come from the previous run's table.
+        """
+        if not self.root.is_dir():
+            return
+        children: dict[str, list[str]] = {}
+        for rel in known_dirs:
+            if rel != ".":
+                children.setdefault(posixpath.dirname(rel) or ".", []).append(rel)
+        stack = ["."]
+        while stack:
+            rel = stack.pop()
+            directory = self.root / rel
+            try:
+                mtime_ns = directory.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            if not full and known_dirs.get(rel) == mtime_ns:
+                stack.extend(children.get(rel, ()))
+                yield rel, mtime_ns, None
+                continue
+            with os.scandir(directory) as it:
+                entries = list(it)
+            stack.extend(posixpath.join(rel, e.name) if rel != "." else e.name for e in entries
+                         if e.is_dir(follow_symlinks=False) and not e.name.startswith("."))
+            yield rel, mtime_ns, [e for e in entries if e.name.endswith(".md") and e.is_file()]
+
+    def _sync_dir(self, rel_dir: str, entries: list[os.DirEntry], stats: dict[str, int]) -> None:
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        known = dict(self.db.execute(
+            "SELECT path, mtime_ns FROM notes WHERE path >= ? AND path < ? AND instr(substr(path, ?), '/') = 0",
+            (prefix, prefix + "\uffff", len(prefix) + 1)))
+        current = {prefix + e.name: e.stat().st_mtime_ns for e in entries}
+        for rel in known.keys() - current.keys():
+            self._drop_note(rel)
+            stats["removed"] += 1
+        for rel, mtime_ns in current.items():
+            if known.get(rel) == mtime_ns:
+                continue
+            self._index_note(rel, note_urls(self.root / rel), mtime_ns)
+            stats["indexed"] += 1
+
+    def _check_dir(self, rel_dir: str, stats: dict[str, int]) -> None:
+        """Re-read the notes edited in place in a directory whose listing didn't change."""
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        root = str(self.root)
+        for rel, known in self.db.execute(
+                "SELECT path, mtime_ns FROM notes WHERE path >= ? AND path < ? AND instr(substr(path, ?), '/') = 0",
+                (prefix, prefix + "\uffff", len(prefix) + 1)).fetchall():
+            try:
+                mtime_ns = os.stat(os.path.join(root, rel)).st_mtime_ns
+            except FileNotFoundError:
+                self._drop_note(rel)
+                stats["removed"] += 1
+                continue
+            if mtime_ns != known:
+                self._index_note(rel, note_urls(self.root / rel), mtime_ns)
+                stats["indexed"] += 1
+
+    def _index_note(self, rel: str, urls: list[str], mtime_ns: int) -> None:
+        self.db.execute("DELETE FROM urls WHERE path=?", (rel,))
+        self.db.executemany("INSERT OR IGNORE INTO urls VALUES (?, ?)", [(u, rel) for u in urls])
+        self.db.execute("INSERT OR REPLACE INTO notes VALUES (?, ?)", (rel, mtime_ns))
+
+    def _drop_note(self, rel: str) -> None:
+        self.db.execute("DELETE FROM urls WHERE path=?", (rel,))
+        self.db.execute("DELETE FROM notes WHERE path=?", (rel,))
+
+    def _drop_dir(self, rel_dir: str) -> int:
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        rows = [r for (r,) in self.db.execute(
+            "SELECT path FROM notes WHERE path >= ? AND path < ? AND instr(substr(path, ?), '/') = 0",
+            (prefix, prefix + "\uffff", len(prefix) + 1))]
+        for rel in rows:
+            self._drop_note(rel)
+        return len(rows)
+
+    # -- lookups --------------------------------------------------------
+
+    def lookup(self, urls: Iterable[str], *, refresh: bool = True) -> dict[str, str | None]:
+        """Map each URL to the path of a note that captures it, or ``None``."""
+        if refresh:
+            self.refresh()
+        urls = list(urls)
+        normalized = {u: normalize_url(u) for u in urls}
+        wanted = list(set(normalized.values()))
+        found: dict[str, str] = {}
+        for i in range(0, len(wanted), _BATCH):
+            batch = wanted[i:i + _BATCH]
+            marks = ",".join("?" * len(batch))
+            found.update(self.db.execute(f"SELECT url, MIN(path) FROM urls WHERE url IN ({marks}) GROUP BY url", batch))
+        return {u: (str(self.root / found[n]) if n in found else None) for u, n in normalized.items()}
+
+    def unseen(self, urls: Iterable[str], *, refresh: bool = True) -> list[str]:
+        """The URLs with no Capture note yet, in input order."""
+        return [u for u, p in self.lookup(urls, refresh=refresh).items() if p is None]
+
+    def count(self) -> tuple[int, int]:
+        notes = self.db.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+        urls = self.db.execute("SELECT COUNT(DISTINCT url) FROM urls").fetchone()[0]
+        return notes, urls
+
+
+# -- CLI ----------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="lifemgr capture", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--root", default=str(paths.CAPTURE_DIR), help="notes folder (default: %(default)s)")
+    parser.add_argument("--db", help="index path (default: .claude/cache/capture-index.db)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    for name, text in (("lookup", "print JSON url -> note path (or null)"),
+                       ("unseen", "print the URLs that have no note yet")):
+        p = sub.add_parser(name, help=text)
+        p.add_argument("urls", nargs="*", help="URLs (default: one per line on stdin)")
+    p = sub.add_parser("add", help="index notes that were just written")
+    p.add_argument("notes", nargs="+")
+    sub.add_parser("refresh", help="bring the index up to date, re-listing every folder")
+    sub.add_parser("rebuild", help="drop and rebuild the index")
+    args = parser.parse_args(argv)
+
+    with CaptureIndex(args.root, args.db) as index:
+        if args.cmd in ("lookup", "unseen"):
+            urls = args.urls or [line.strip() for line in sys.stdin if line.strip()]
+            if args.cmd == "lookup":
+                json.dump(index.lookup(urls), sys.stdout, indent=2)
+                print()
+            else:
+                for url in index.unseen(urls):
+                    print(url)
+        elif args.cmd == "add":
+            try:
+                index.add_many(args.notes)
+            except ValueError as exc:
+                print(exc, file=sys.stderr)
+                return 1
+        else:
+            stats = index.rebuild() if args.cmd == "rebuild" else index.refresh(full=True)
+            notes, urls = index.count()
+            print(f"{notes} notes, {urls} URLs ({stats['indexed']} indexed, {stats['removed']} removed)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,653 @@
+"""Spaced-repetition card store and scheduler for ``/flashcards`` and ``/review-session``.
+
+Cards stay in Markdown, in the format the Obsidian spaced-repetition
+plugin reads: ``Question::Answer`` on one line (``:::`` also makes the
+reversed card), or the question and answer split by a line holding just
+``?`` (``??`` for reversed). Only notes tagged ``#flashcards`` (or
+``#flashcards/<deck>``) are read. ``import`` copies them into a SQLite
+store in ``.claude/state/cards.db``, and re-reads only the notes that
+changed since the last import.
+
+A card's ID is its Obsidian block ID (``^my-card``) when it has one, and
+otherwise a hash of its question and the note's path in the repo, so
+fixing an answer keeps the card's history, and the same question in two
+notes (even two ``Index.md`` in different folders) is two cards; give a
+card a block ID to keep its history when the note moves. Each review is
+one transaction that updates the card and appends to its history.
+Scheduling is SM-2 with four buttons (again, hard, good, easy). Due
+cards come from a partial index on the due date, so "next 20 due" is an
+index range scan at any deck size::
+
+    python -m lifemgr cards import [PATH ...]      # default: learning sessions + vault
+    python -m lifemgr cards due --limit 20 --new 5 [--deck rust]
+    python -m lifemgr cards review CARD_ID good
+    python -m lifemgr cards export                 # write <!--SR:...--> back into the notes
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from . import frontmatter, paths
+
+AGAIN, HARD, GOOD, EASY = 1, 2, 3, 4
+RATINGS = {"again": AGAIN, "hard": HARD, "good": GOOD, "easy": EASY}
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+EASY_BONUS = 1.3
+#: A card rated "again" comes back this many minutes later in the same session.
+RELEARN_MINUTES = 10
+MAX_INTERVAL_DAYS = 36500
+#: Bumped when note parsing changes, so the next import re-reads every note.
+NOTES_VERSION = 4
+#: Notes imported before this version have card IDs that don't include the note's path.
+NOTE_IDS_VERSION = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    id          TEXT PRIMARY KEY,
+    deck        TEXT NOT NULL,
+    front       TEXT NOT NULL,
+    back        TEXT NOT NULL,
+    source      TEXT,
+    line        INTEGER,
+    new         INTEGER NOT NULL DEFAULT 1,
+    due         REAL NOT NULL,
+    interval    REAL NOT NULL DEFAULT 0,
+    ease        REAL NOT NULL DEFAULT 2.5,
+    reps        INTEGER NOT NULL DEFAULT 0,
+    lapses      INTEGER NOT NULL DEFAULT 0,
+    last_review REAL,
+    suspended   INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS cards_queue ON cards (new, due) WHERE suspended = 0;
+CREATE INDEX IF NOT EXISTS cards_deck_queue ON cards (deck, new, due) WHERE suspended = 0;
+CREATE INDEX IF NOT EXISTS cards_source ON cards (source);
+CREATE TABLE IF NOT EXISTS reviews (
+    card_id  TEXT NOT NULL,
+    at       REAL NOT NULL,
+    rating   INTEGER NOT NULL,
+    interval REAL NOT NULL,
+    ease     REAL NOT NULL,
+    due      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reviews_card ON reviews (card_id, at);
+CREATE INDEX IF NOT EXISTS cards_reviewed ON cards (last_review);
+CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+_SR = re.compile(r"\s*<!--SR:((?:![^!>]*)+)-->\s*$")
+_SR_LINE = re.compile(r"^\s*<!--SR:((?:![^!>]*)+)-->\s*$")
+_BLOCK_ID = re.compile(r"\s+\^([A-Za-z0-9-]+)\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_SKIP_DIRS = {".git", ".obsidian", ".trash", "node_modules"}
+
+
+@dataclass
+class Card:
+    id: str
+    deck: str
+    front: str
+    back: str
+    source: str | None = None
+    line: int | None = None
+    new: bool = True
+    due: float = 0.0
+    interval: float = 0.0
+    ease: float = DEFAULT_EASE
+    reps: int = 0
+    lapses: int = 0
+    last_review: float | None = None
+    suspended: bool = False
+
+    @property
+    def due_date(self) -> str:
+        return datetime.fromtimestamp(self.due).date().isoformat()
+
+
+@dataclass
+class Review:
+    card_id: str
+    at: float
+    rating: int
+    interval: float
+    ease: float
+    due: float
+
+
+# -- scheduling -------------------------------------------------------------
+
+
+def schedule(card: Card, rating: int, now: float) -> tuple[float, float, float]:
+    """SM-2 step: ``(interval_days, ease, due)`` after rating ``card`` at ``now``.
+
+    Intervals follow SM-2 (1, 6, then previous x ease), with Anki's hard
+    and easy buttons on top. Overdue cards that were still remembered get
+    credit for the extra time. Intervals over two days get a deterministic
+    +/-5% fuzz so cards imported together don't all come due on the same day.
+    """
+    if rating not in (AGAIN, HARD, GOOD, EASY):
+        raise ValueError(f"rating must be 1-4, got {rating!r}")
+    q = rating + 1  # SM-2 quality: hard=3, good=4, easy=5
+    if rating == AGAIN:
+        ease = max(MIN_EASE, card.ease - 0.2)
+        return 0.0, ease, now + RELEARN_MINUTES * 60
+    ease = max(MIN_EASE, card.ease + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
+    if card.reps == 0:
+        interval = {HARD: 1.0, GOOD: 1.0, EASY: 4.0}[rating]
+    elif card.reps == 1:
+        interval = {HARD: 3.0, GOOD: 6.0, EASY: 8.0}[rating]
+    else:
+        elapsed = (now - card.last_review) / 86400 if card.last_review else card.interval
+        base = max(card.interval, elapsed)
+        if rating == HARD:
+            interval = max(card.interval * 1.2, card.interval + 1)
+        elif rating == GOOD:
+            interval = base * ease
+        else:
+            interval = base * ease * EASY_BONUS
+    if interval > 2:
+        digest = hashlib.blake2b(f"{card.id}:{card.reps}".encode(), digest_size=2).digest()
+        interval *= 0.95 + int.from_bytes(digest, "big") % 101 / 1000
+    interval = float(min(round(interval), MAX_INTERVAL_DAYS))
+    return interval, ease, _start_of_day(now, interval)
+
+
+def _start_of_day(now: float, days_ahead: float) -> float:
+    """Midnight (local time) ``days_ahead`` days after ``now``, so a card is due all day."""
+    day = datetime.fromtimestamp(now).date() + timedelta(days=int(days_ahead))
+    return datetime.combine(day, datetime.min.time()).timestamp()
+
+
+# -- notes ------------------------------------------------------------------
+
+
+@dataclass
+class NoteCard:
+    """A card as found in a note, with where its schedule comment lives."""
+
+    card: Card
+    #: 0-based line of the ``<!--SR:-->`` comment (or where one would go).
+    comment_line: int
+    #: Single-line cards keep the comment at the end of the card's line.
+    inline: bool
+    #: Whether ``comment_line`` already holds a comment (multi-line cards).
+    has_comment_line: bool
+    #: Position within the comment: 0 forward, 1 reversed.
+    slot: int
+    schedule: tuple[str, float, float] | None = None
+
+
+def card_id(front: str, *, block_id: str | None = None, reversed: bool = False, note: str | None = None) -> str:
+    """Stable card ID: the block ID if given, else a hash of the note's path and normalized question."""
+    if block_id:
+        return block_id + ("-r" if reversed else "")
+    text = " ".join(front.lower().split())
+    key = ("r:" if reversed else "f:") + (f"{note}\n" if note else "") + text
+    return hashlib.blake2b(key.encode(), digest_size=6).hexdigest()
+
+
+def note_deck(meta: dict, body: str, default: str) -> str | None:
+    """Deck from a ``flashcards/<deck>`` tag; ``None`` when the note has no flashcards tag."""
+    for tag in frontmatter.tags(meta, body):
+        if tag == "flashcards":
+            return default
+        if tag.startswith("flashcards/"):
+            return tag[len("flashcards/"):]
+    return None
+
+
+def parse_note(text: str, source: str | None = None, *, default_deck: str = "default") -> list[NoteCard]:
+    """Cards in one note's text, in order; ``[]`` unless it's tagged ``#flashcards``."""
+    meta, body, body_line = frontmatter.split(text)
+    deck = note_deck(meta, body, default_deck)
+    if deck is None:
+        return []
+    lines = text.split("\n")
+    found: list[NoteCard] = []
+    para_start = body_line - 1
+    in_fence = False
+    i = para_start
+    while i < len(lines):
+        line = lines[i]
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        if in_fence or _FENCE.match(line) or not line.strip():
+            i += 1
+            para_start = i
+            continue
+        sr = _SR.search(line)
+        content = line[:sr.start()] if sr else line
+        stripped = content.strip()
+        if stripped in ("?", "??") and i > para_start:
+            end = i + 1
+            while end < len(lines) and lines[end].strip() and not _SR_LINE.match(lines[end]):
+                end += 1
+            if end == i + 1:
+                i += 1
+                continue
+            front_lines, back_lines = lines[para_start:i], lines[i + 1:end]
+            block = _BLOCK_ID.search(back_lines[-1])
+            if block:
+                back_lines[-1] = back_lines[-1][:block.start()]
+            has_comment = end < len(lines) and bool(_SR_LINE.match(lines[end]))
+            segments = _segments(lines[end]) if has_comment else []
+            found += _cards("\n".join(front_lines).strip(), "\n".join(back_lines).strip(), stripped == "??",
+                            block.group(1) if block else None, deck, source, para_start + 1,
+                            end if has_comment else end - 1, False, has_comment, segments)
+            i = end + 1 if has_comment else end
+            para_start = i
+            continue
+        if "::" in content and not stripped.startswith(("|", "`")):
+            block = _BLOCK_ID.search(content)
+            if block:
+                content = content[:block.start()]
+            sep = ":::" if ":::" in content else "::"
+            front, back = content.split(sep, 1)
+            if front.strip() and back.strip():
+                found += _cards(front.strip(), back.strip(), sep == ":::", block.group(1) if block else None,
+                                deck, source, i + 1, i, True, False, _segments(sr.group(0)) if sr else [])
+        i += 1
+    return found
+
+
+def _cards(front: str, back: str, both: bool, block_id: str | None, deck: str, source: str | None,
+           line: int, comment_line: int, inline: bool, has_comment_line: bool,
+           segments: list[tuple[str, float, float]]) -> list[NoteCard]:
+    pairs = [(front, back, False)] + ([(back, front, True)] if both else [])
+    note = _note_key(source) if source else None
+    out = []
+    for slot, (q, a, rev) in enumerate(pairs):
+        card = Card(card_id(front, block_id=block_id, reversed=rev, note=note), deck, q, a, source, line)
+        out.append(NoteCard(card, comment_line, inline, has_comment_line, slot,
+                            segments[slot] if slot < len(segments) else None))
+    return out
+
+
+def _note_key(source: str) -> str:
+    """``source`` relative to the repo root, so IDs don't change with the checkout's location."""
+    path = Path(source)
+    return path.relative_to(paths.ROOT).as_posix() if path.is_relative_to(paths.ROOT) else path.as_posix()
+
+
+def _segments(comment: str) -> list[tuple[str, float, float]]:
+    """``<!--SR:!2026-10-20,3,250-->`` -> ``[("2026-10-20", 3.0, 2.5)]``."""
+    match = _SR.search(comment)
+    out = []
+    for part in match.group(1).split("!")[1:] if match else []:
+        try:
+            day, interval, ease = part.split(",")
+            date.fromisoformat(day.strip())
+            out.append((day.strip(), float(interval), float(ease) / 100))
+        except ValueError:
+            break
+    return out
+
+
+def _comment(cards: list[Card]) -> str:
+    return "<!--SR:" + "".join(f"!{c.due_date},{int(c.interval)},{round(c.ease * 100)}" for c in cards) + "-->"
+
+
+# -- store ------------------------------------------------------------------
+
+
+class CardStore:
+    """Cards, their schedule and review history in one SQLite file."""
+
+    def __init__(self, path: str | Path = paths.CARDS_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "CardStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # -- cards ----------------------------------------------------------
+
+    def upsert(self, cards: Iterable[Card], *, now: float | None = None) -> int:
+        """Insert new cards and update the text/location of known ones.
+
+        A known card's schedule is never touched here. Returns the number
+        of cards seen. Call inside ``BEGIN``/``COMMIT`` for batches.
+        """
+        now = time.time() if now is None else now
+        # New cards come up in the order they were added (note order within a batch).
+        rows = [(c.id, c.deck, c.front, c.back, c.source, c.line, c.due or now + i * 1e-6)
+                for i, c in enumerate(cards)]
+        self.db.executemany(
+            "INSERT INTO cards (id, deck, front, back, source, line, due) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET deck=excluded.deck, front=excluded.front, back=excluded.back, "
+            "source=excluded.source, line=excluded.line",
+            rows,
+        )
+        return len(rows)
+
+    def get(self, card_id: str) -> Card | None:
+        row = self.db.execute("SELECT * FROM cards WHERE id=?", (card_id,)).fetchone()
+        return _card(row) if row else None
+
+    def due(self, limit: int = 20, *, new: int = 0, deck: str | None = None,
+            now: float | None = None) -> list[Card]:
+        """Up to ``limit`` cards due by ``now`` (most overdue first), then up to ``new`` unseen cards.
+
+        Both halves are range scans on a partial index over ``(new, due)``
+        (``(deck, new, due)`` with ``deck``), whatever the store size.
+        """
+        now = time.time() if now is None else now
+        where, args = ("deck=? AND ", [deck]) if deck else ("", [])
+        cards = [_card(r) for r in self.db.execute(
+            f"SELECT * FROM cards WHERE {where}suspended=0 AND new=0 AND due<=? ORDER BY due LIMIT ?",
+            (*args, now, limit))]
+        if new > 0:
+            cards += [_card(r) for r in self.db.execute(
+                f"SELECT * FROM cards WHERE {where}suspended=0 AND new=1 ORDER BY due LIMIT ?", (*args, new))]
+        return cards
+
+    def review(self, card_id: str, rating: int | str, *, now: float | None = None) -> Card:
+        """Apply one rating: reschedule the card and append to its history."""
+        now = time.time() if now is None else now
+        rating = RATINGS[rating] if isinstance(rating, str) else rating
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            card = self.get(card_id)
+            if card is None:
+                raise KeyError(card_id)
+            interval, ease, due = schedule(card, rating, now)
+            if rating == AGAIN:
+                card.lapses += 0 if card.new else 1
+                card.reps = 0
+            else:
+                card.reps += 1
+            card.new, card.interval, card.ease, card.due, card.last_review = False, interval, ease, due, now
+            self.db.execute(
+                "UPDATE cards SET new=0, interval=?, ease=?, due=?, reps=?, lapses=?, last_review=? WHERE id=?",
+                (interval, ease, due, card.reps, card.lapses, now, card_id))
+            self.db.execute("INSERT INTO reviews VALUES (?, ?, ?, ?, ?, ?)",
+                            (card_id, now, rating, interval, ease, due))
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return card
+
+    def history(self, card_id: str) -> list[Review]:
+        return [Review(*r) for r in self.db.execute(
+            "SELECT card_id, at, rating, interval, ease, due FROM reviews WHERE card_id=? ORDER BY at", (card_id,))]
+
+    def suspend(self, card_id: str, suspended: bool = True) -> bool:
+        return self.db.execute("UPDATE cards SET suspended=? WHERE id=?", (int(suspended), card_id)).rowcount > 0
+
+    def stats(self, *, now: float | None = None) -> dict[str, dict[str, int]]:
+        """Per deck: total, new, due now and suspended counts."""
+        now = time.time() if now is None else now
+        return {r["deck"]: {"cards": r["cards"], "new": r["new"], "due": r["due"], "suspended": r["suspended"]}
+                for r in self.db.execute(
+                    "SELECT deck, COUNT(*) AS cards, SUM(new=1 AND suspended=0) AS new, "
+                    "SUM(new=0 AND suspended=0 AND due<=?) AS due, SUM(suspended) AS suspended "
+                    "FROM cards GROUP BY deck ORDER BY deck", (now,))}
+
+    # -- notes ----------------------------------------------------------
+
+    def import_notes(self, roots: Iterable[str | Path], *, force: bool = False,
+                     now: float | None = None) -> dict[str, int]:
+        """Import cards from notes under ``roots``, skipping files unchanged since last time.
+
+        Cards that disappeared from a re-read note, or whose note under
+        ``roots`` was deleted or moved away, are removed; their review
+        history is kept. Schedules in ``<!--SR:-->`` comments are adopted
+        for cards the store has never seen reviewed.
+        """
+        now = time.time() if now is None else now
+        roots = [Path(r) for r in roots]
+        stats = {"files": 0, "read": 0, "cards": 0, "removed": 0, "scheduled": 0}
+        known = {r["path"]: (r["mtime_ns"], r["size"]) for r in self.db.execute("SELECT * FROM files")}
+        version = self.db.execute("SELECT value FROM meta WHERE key='notes_version'").fetchone()
+        force = force or (version[0] if version else None) != str(NOTES_VERSION)
+        rekey = version is not None and int(version[0]) < NOTE_IDS_VERSION
+        self.db.execute("BEGIN")
+        try:
+            found_paths = set()
+            for path, st in _markdown_files(roots):
+                stats["files"] += 1
+                key = str(path)
+                found_paths.add(key)
+                if not force and known.get(key) == (st.st_mtime_ns, st.st_size):
+                    continue
+                stats["read"] += 1
+                found = parse_note(path.read_text(encoding="utf-8", errors="replace"), key,
+                                   default_deck=path.parent.name or "default")
+                if rekey:
+                    self._rekey(key, found)
+                self._sync_source(key, found, now, stats)
+                self.db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?)", (key, st.st_mtime_ns, st.st_size))
+            resolved = [r.resolve() for r in roots]
+            for key in known.keys() - found_paths:
+                if any(Path(key).is_relative_to(r) for r in resolved):
+                    self._sync_source(key, [], now, stats)
+                    self.db.execute("DELETE FROM files WHERE path=?", (key,))
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('notes_version', ?)", (str(NOTES_VERSION),))
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return stats
+
+    def _rekey(self, source: str, found: list[NoteCard]) -> None:
+        """Move a note's cards, schedules and history from the IDs an older import gave them to the current ones."""
+        for nc in found:
+            row = self.db.execute("SELECT id FROM cards WHERE source=? AND front=? AND id<>?",
+                                  (source, nc.card.front, nc.card.id)).fetchone()
+            if row and self.get(nc.card.id) is None:
+                self.db.execute("UPDATE cards SET id=? WHERE id=?", (nc.card.id, row[0]))
+                self.db.execute("UPDATE reviews SET card_id=? WHERE card_id=?", (nc.card.id, row[0]))
+
+    def _sync_source(self, source: str, found: list[NoteCard], now: float, stats: dict[str, int]) -> None:
+        # The same question twice in one note is one card.
+        unique: dict[str, NoteCard] = {}
+        for nc in found:
+            unique.setdefault(nc.card.id, nc)
+        stats["cards"] += self.upsert((nc.card for nc in unique.values()), now=now)
+        old = {r[0] for r in self.db.execute("SELECT id FROM cards WHERE source=?", (source,))}
+        gone = old - unique.keys()
+        self.db.executemany("DELETE FROM cards WHERE id=?", [(i,) for i in gone])
+        stats["removed"] += len(gone)
+        for nc in unique.values():
+            if nc.schedule is None:
+                continue
+            day, interval, ease = nc.schedule
+            due = datetime.combine(date.fromisoformat(day), datetime.min.time()).timestamp()
+            stats["scheduled"] += self.db.execute(
+                "UPDATE cards SET new=0, due=?, interval=?, ease=?, reps=MAX(reps, ?) "
+                "WHERE id=? AND last_review IS NULL",
+                (due, interval, max(MIN_EASE, ease), 1 if interval >= 1 else 0, nc.card.id)).rowcount
+
+    def export_notes(self, sources: Iterable[str] | None = None, *, everything: bool = False) -> list[str]:
+        """Write each reviewed card's schedule back into its note as ``<!--SR:-->``.
+
+        By default only notes with a card reviewed since the last export are
+        touched; ``everything`` rewrites every note with a scheduled card.
+        Notes are re-parsed, so a card is found by ID even if lines moved
+        since the import. Returns the paths that changed.
+        """
+        started = time.time()
+        record = sources is None
+        if record:
+            row = self.db.execute("SELECT value FROM meta WHERE key='last_export'").fetchone()
+            since = 0.0 if everything or row is None else float(row[0])
+            sql = ("SELECT DISTINCT source FROM cards WHERE new=0 AND source IS NOT NULL" if everything else
+                   "SELECT DISTINCT source FROM cards WHERE last_review >= ? AND source IS NOT NULL")
+            sources = [r[0] for r in self.db.execute(sql, () if everything else (since,))]
+        changed = []
+        for source in sources:
+            path = Path(source)
+            if not path.exists():
+                continue
+            text = path.read_text(encoding="utf-8", errors="replace")
+            updated = self._render_schedules(text, source)
+            if updated != text:
+                tmp = path.with_name(f".{path.name}.tmp")
+                tmp.write_text(updated, encoding="utf-8")
+                os.replace(tmp, path)
+                st = path.stat()
+                self.db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?)", (source, st.st_mtime_ns, st.st_size))
+                changed.append(source)
+        if record:
+            # Only once every note is written, so a failed export is retried in full.
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('last_export', ?)", (str(started),))
+        return changed
+
+    def _render_schedules(self, text: str, source: str) -> str:
+        lines = text.split("\n")
+        stored = {r["id"]: _card(r) for r in self.db.execute("SELECT * FROM cards WHERE source=?", (source,))}
+        groups: dict[int, list[NoteCard]] = {}
+        for nc in parse_note(text, source, default_deck=Path(source).parent.name or "default"):
+            groups.setdefault(nc.comment_line, []).append(nc)
+        # Bottom-up, so inserted comment lines don't shift the ones still to do.
+        for line_no in sorted(groups, reverse=True):
+            group = sorted(groups[line_no], key=lambda nc: nc.slot)
+            cards = [stored.get(nc.card.id) for nc in group]
+            if any(c is None or c.new for c in cards):
+                continue  # the plugin wants a schedule per card; leave partial groups alone
+            comment = _comment(cards)
+            first = group[0]
+            if first.inline:
+                line = lines[line_no]
+                sr = _SR.search(line)
+                lines[line_no] = (line[:sr.start()] if sr else line.rstrip()) + " " + comment
+            elif first.has_comment_line:
+                lines[line_no] = comment
+            else:
+                lines.insert(line_no + 1, comment)
+        return "\n".join(lines)
+
+
+def _card(row: sqlite3.Row) -> Card:
+    return Card(row["id"], row["deck"], row["front"], row["back"], row["source"], row["line"], bool(row["new"]),
+                row["due"], row["interval"], row["ease"], row["reps"], row["lapses"], row["last_review"],
+                bool(row["suspended"]))
+
+
+def _markdown_files(roots: Iterable[str | Path]) -> Iterator[tuple[Path, os.stat_result]]:
+    stack = [Path(r) for r in roots]
+    while stack:
+        root = stack.pop()
+        if root.is_file():
+            yield root.resolve(), root.stat()
+            continue
+        try:
+            entries = list(os.scandir(root))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in _SKIP_DIRS and not entry.name.startswith("."):
+                    stack.append(Path(entry.path))
+            elif entry.name.endswith(".md"):
+                yield Path(entry.path).resolve(), entry.stat()
+
+
+# -- CLI ----------------------------------------------------------------
+
+
+def _rating(value: str) -> int:
+    if value.lower() in RATINGS:
+        return RATINGS[value.lower()]
+    if value in ("1", "2", "3", "4"):
+        return int(value)
+    raise argparse.ArgumentTypeError("rating is again|hard|good|easy or 1-4")
+
+
+def _card_json(card: Card) -> str:
+    out = asdict(card)
+    out["due"] = card.due_date
+    return json.dumps(out, ensure_ascii=False)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="lifemgr cards", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", default=str(paths.CARDS_DB), help="store path (default: %(default)s)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("import", help="import #flashcards notes (changed files only)")
+    p.add_argument("paths", nargs="*", help=f"files or folders (default: {paths.LEARNING_DIR} and {paths.VAULT_DIR})")
+    p.add_argument("--force", action="store_true", help="re-read every note")
+
+    p = sub.add_parser("due", help="print due cards as JSON lines")
+    p.add_argument("--limit", type=int, default=20, help="review cards (default: %(default)s)")
+    p.add_argument("--new", type=int, default=0, help="also include this many unseen cards")
+    p.add_argument("--deck")
+
+    p = sub.add_parser("review", help="record a rating and print the card's next due date")
+    p.add_argument("id")
+    p.add_argument("rating", type=_rating)
+
+    p = sub.add_parser("history", help="print a card's reviews as JSON lines")
+    p.add_argument("id")
+
+    p = sub.add_parser("suspend", help="suspend or unsuspend a card")
+    p.add_argument("id")
+    p.add_argument("--off", action="store_true")
+
+    sub.add_parser("stats", help="per-deck counts as JSON")
+
+    p = sub.add_parser("export", help="write schedules back into the notes as <!--SR:--> comments")
+    p.add_argument("paths", nargs="*", help="only these notes")
+    p.add_argument("--all", action="store_true", help="every note with a scheduled card, not just recent reviews")
+    args = parser.parse_args(argv)
+
+    with CardStore(args.db) as store:
+        if args.cmd == "import":
+            roots = args.paths or [paths.LEARNING_DIR, paths.VAULT_DIR]
+            stats = store.import_notes(roots, force=args.force)
+            print(f"{stats['read']} of {stats['files']} notes read: {stats['cards']} cards, "
+                  f"{stats['removed']} removed, {stats['scheduled']} schedules adopted", file=sys.stderr)
+        elif args.cmd == "due":
+            for card in store.due(args.limit, new=args.new, deck=args.deck):
+                print(_card_json(card))
+        elif args.cmd == "review":
+            try:
+                card = store.review(args.id, args.rating)
+            except KeyError:
+                print(f"no card {args.id}", file=sys.stderr)
+                return 1
+            print(_card_json(card))
+        elif args.cmd == "history":
+            for review in store.history(args.id):
+                print(json.dumps(asdict(review)))
+        elif args.cmd == "suspend":
+            if not store.suspend(args.id, not args.off):
+                print(f"no card {args.id}", file=sys.stderr)
+                return 1
+        elif args.cmd == "stats":
+            print(json.dumps(store.stats(), indent=2))
+        elif args.cmd == "export":
+            sources = [str(Path(p).resolve()) for p in args.paths] or None
+            for path in store.export_notes(sources, everything=args.all):
+                print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
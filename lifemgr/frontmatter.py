@@ -0,0 +1,229 @@
+"""YAML frontmatter parsing for vault notes and planning docs.
+
+A small parser handles the subset the vault and templates actually use —
+scalars, quoted strings, inline ``[a, b]`` lists, ``- item`` block lists
+and trailing ``# comments`` — which is several times faster than a full
+YAML load. Anything beyond that goes to PyYAML when it's installed.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+try:
+    import yaml
+
+    _Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+except ImportError:  # pragma: no cover - depends on the environment
+    yaml = None
+
+#: Bytes read by ``read_head`` — frontmatter is always at the top.
+HEAD_BYTES = 8192
+
+_FENCE = re.compile(r"^---[ \t]*\r?\n")
+_CLOSE = re.compile(r"^(?:---|\.\.\.)[ \t]*\r?$", re.MULTILINE)
+
+
+def split(text: str) -> tuple[dict[str, Any], str, int]:
+    """Split ``text`` into ``(frontmatter, body, body_line)``.
+
+    ``body_line`` is the 1-based line number the body starts on. Notes
+    without frontmatter (or with frontmatter that doesn't parse) get an
+    empty dict and the whole text as body.
+    """
+    start = _FENCE.match(text)
+    end = _CLOSE.search(text, start.end()) if start else None
+    if end is None:
+        return {}, text, 1
+    raw = text[start.end():end.start()]
+    body_start = text.find("\n", end.end())
+    body_start = len(text) if body_start == -1 else body_start + 1
+    try:
+        meta = parse(raw)
+    except ValueError:
+        meta = {}
+    return meta, text[body_start:], text.count("\n", 0, body_start) + 1
+
+
+def parse(raw: str) -> dict[str, Any]:
+    """Parse a frontmatter block; raises ``ValueError`` if it isn't a mapping."""
+    try:
+        data: Any = _parse_simple(raw)
+    except ValueError:
+        if yaml is None:
+            raise
+        try:
+            data = yaml.load(raw, Loader=_Loader)
+        except yaml.YAMLError as exc:
+            raise ValueError(str(exc)) from exc
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError("frontmatter is not a mapping")
+    return {str(k): _plain(v) for k, v in data.items()}
+
+
+def read(path: str | Path) -> tuple[dict[str, Any], str, int]:
+    """``split`` the whole file at ``path``."""
+    return split(Path(path).read_text(encoding="utf-8", errors="replace"))
+
+
+def read_head(path: str | Path, size: int = HEAD_BYTES) -> tuple[dict[str, Any], str]:
+    """Frontmatter plus the start of the body, reading at most ``size`` bytes.
+
+    Falls back to reading the whole file when the frontmatter is longer.
+    """
+    with open(path, "rb") as fh:
+        head = fh.read(size)
+        more = fh.read(1)
+    text = head.decode("utf-8", errors="replace")
+    meta, body, _ = split(text)
+    if more and not meta and _FENCE.match(text):
+        meta, body, _ = read(path)
+    return meta, body
+
+
+def render(meta: dict[str, Any]) -> str:
+    """Serialize ``meta`` as a ``---`` fenced block, keeping key order."""
+    lines = ["---"]
+    for key, value in meta.items():
+        lines.append(f"{key}: {dump(value)}")
+    lines.append("---")
+    return "\n".join(lines) + "\n"
+
+
+def tags(meta: dict[str, Any], body: str = "") -> list[str]:
+    """Tags from the ``tags`` field plus inline ``#tags`` in ``body``, without ``#``."""
+    raw = meta.get("tags") or meta.get("tag") or []
+    if isinstance(raw, str):
+        raw = re.split(r"[,\s]+", raw)
+    found = [str(t).lstrip("#") for t in raw if t]
+    found += _INLINE_TAG.findall(body)
+    return list(dict.fromkeys(t for t in found if t))
+
+
+_INLINE_TAG = re.compile(r"(?:^|(?<=\s))#([A-Za-z][\w/-]*)")
+
+
+def _plain(value: Any) -> Any:
+    """Dates become ISO strings so values compare and serialize uniformly."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    return value
+
+
+def dump(value: Any) -> str:
+    """One frontmatter value as ``render`` writes it (strings always quoted)."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return ""
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(dump(v) for v in value) + "]"
+    text = str(value)
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+# -- fallback parser ----------------------------------------------------
+
+_KEY = re.compile(r"^([A-Za-z_][\w-]*)\s*:(.*)$")
+_COMMENT = re.compile(r"\s+#.*$")
+_ESCAPE = re.compile(r"\\(.)")
+_ESCAPES = {"n": "\n", "t": "\t"}
+_MAPPING_ITEM = re.compile(r"^[A-Za-z_][\w-]*\s*:(?:\s|$)")
+_NUMBER = re.compile(r"^[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?$")
+
+
+def _parse_simple(raw: str) -> dict[str, Any]:
+    data: dict[str, Any] = {}
+    current: str | None = None
+    block: str | None = None  # key whose value is a ``- item`` list
+    for line in raw.splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if line.startswith((" ", "\t", "-")) and current is not None:
+            item = line.strip()
+            if not item.startswith("- ") or _MAPPING_ITEM.match(item[2:].strip()):
+                raise ValueError(f"nested frontmatter: {line!r}")
+            if block != current:
+                if data[current] is not None:
+                    raise ValueError(f"nested frontmatter: {line!r}")
+                data[current], block = [], current
+            data[current].append(scalar(item[2:]))
+            continue
+        match = _KEY.match(line)
+        if not match:
+            raise ValueError(f"unsupported frontmatter line: {line!r}")
+        current, rest = match.group(1), _strip_comment(match.group(2).strip())
+        if rest[:1] in ("|", ">", "{", "&", "*", "!"):
+            raise ValueError(f"unsupported frontmatter value: {line!r}")
+        data[current] = scalar(rest) if rest else None
+    return data
+
+
+def _strip_comment(text: str) -> str:
+    if "#" not in text:
+        return text
+    if text[:1] in ("'", '"'):
+        end = text.find(text[0], 1)
+        rest = text[end + 1:].strip() if end != -1 else ""
+        if end == -1 or (rest and not rest.startswith("#")) or (text[0] == '"' and "\\" in text[:end]):
+            # Escapes, doubled quotes or multi-line strings: leave to YAML.
+            raise ValueError(f"complex quoted value: {text!r}")
+        return text[: end + 1]
+    return _COMMENT.sub("", text)
+
+
+def scalar(text: str) -> Any:
+    """Parse one frontmatter value (``5``, ``true``, ``\"x\"``, ``[a, b]``)."""
+    text = _strip_comment(text.strip())
+    if text[:1] in ("'", '"') and text[-1:] == text[:1] and len(text) > 1:
+        if text[0] == '"' and "\\" in text:
+            return _ESCAPE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), text[1:-1])
+        return text[1:-1]
+    if text.startswith("["):
+        if not text.endswith("]"):
+            raise ValueError(f"unterminated list: {text!r}")
+        inner = text[1:-1].strip()
+        return [scalar(p) for p in _split_list(inner)] if inner else []
+    low = text.lower()
+    if low in ("true", "yes"):
+        return True
+    if low in ("false", "no"):
+        return False
+    if low in ("null", "~", ""):
+        return None
+    if _NUMBER.match(text):
+        try:
+            return int(text)
+        except ValueError:
+            return float(text)
+    return text
+
+
+def _split_list(text: str) -> list[str]:
+    parts, buf, quote = [], [], ""
+    for ch in text:
+        if quote:
+            buf.append(ch)
+            if ch == quote:
+                quote = ""
+        elif ch in ("'", '"'):
+            quote = ch
+            buf.append(ch)
+        elif ch == ",":
+            parts.append("".join(buf))
+            buf = []
+        else:
+            buf.append(ch)
+    parts.append("".join(buf))
+    return [p.strip() for p in parts]
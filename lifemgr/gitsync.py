@@ -0,0 +1,378 @@
+"""Parallel fetch/status/pull across the repos under ``spaces/`` and the vault.
+
+``/git-sync`` used to visit each repo in turn. This runs every repo's git
+commands on a thread pool (``--jobs``) and prints one table at the end.
+
+Each repo gets a fingerprint made of its HEAD commit, its index mtime and
+a digest of its remote's refs (one ``git ls-remote``, or the local
+``refs/remotes`` with ``--no-fetch``). It's kept in a state file
+(``.claude/cache/git-sync.json``). A repo whose fingerprint matches the
+last run has nothing new to fetch, pull or push, so its previous status
+is reused and no other git command runs. ``--full`` checks everything
+anyway; use it after editing files without running any git command,
+because those edits don't touch the index::
+
+    python -m lifemgr git-sync [--pull] [--push] [--jobs 8] [--json]
+
+``--pull`` fast-forwards clean repos that are only behind. ``--push``
+pushes repos that are only ahead. Diverged repos and repos with conflicts
+are reported and left alone.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from . import paths
+
+STATE_FILE = paths.CACHE_DIR / "git-sync.json"
+STATE_VERSION = 1
+#: Seconds before a single git command is abandoned (network hangs, auth prompts).
+GIT_TIMEOUT = 120.0
+
+_REMOTE_SECTION = re.compile(r'^\s*\[remote "([^"]+)"\]', re.MULTILINE)
+_ENV = {**os.environ, "GIT_TERMINAL_PROMPT": "0", "GIT_ASKPASS": "", "LC_ALL": "C"}
+
+
+@dataclass
+class RepoStatus:
+    path: str
+    branch: str = ""
+    upstream: str = ""
+    ahead: int = 0
+    behind: int = 0
+    dirty: int = 0
+    untracked: int = 0
+    conflicts: int = 0
+    #: What this run did: cached, checked, fetched, pulled, pushed or failed.
+    action: str = "checked"
+    error: str | None = None
+    elapsed: float = 0.0
+
+    @property
+    def name(self) -> str:
+        return Path(self.path).name
+
+    @property
+    def state(self) -> str:
+        if self.error:
+            return "error"
+        if self.conflicts:
+            return "conflict"
+        if self.ahead and self.behind:
+            return "diverged"
+        if self.dirty or self.untracked:
+            return "dirty"
+        if self.behind:
+            return "behind"
+        if self.ahead:
+            return "ahead"
+        if not self.upstream:
+            return "no upstream"
+        return "clean"
+
+
+class GitError(Exception):
+    pass
+
+
+# -- repos and fingerprints -------------------------------------------------
+
+
+def git_dir(repo: str | Path) -> Path | None:
+    """The git directory of a working tree, following ``.git`` files (worktrees, submodules)."""
+    dot = Path(repo) / ".git"
+    if dot.is_dir():
+        return dot
+    if dot.is_file():
+        line = dot.read_text(encoding="utf-8").strip()
+        if line.startswith("gitdir:"):
+            return (Path(repo) / line[7:].strip()).resolve()
+    return None
+
+
+def discover(roots: Iterable[str | Path]) -> list[Path]:
+    """Each root that is a repo, else the repos directly inside it."""
+    found: list[Path] = []
+    for root in roots:
+        root = Path(root)
+        if git_dir(root):
+            found.append(root)
+        elif root.is_dir():
+            found += sorted(Path(e.path) for e in os.scandir(root) if e.is_dir() and git_dir(e.path))
+    return found
+
+
+def _packed_refs(gdir: Path) -> dict[str, str]:
+    refs: dict[str, str] = {}
+    try:
+        with open(gdir / "packed-refs", encoding="utf-8") as fh:
+            for line in fh:
+                if line[:1] not in ("#", "^"):
+                    oid, _, name = line.strip().partition(" ")
+                    refs[name] = oid
+    except FileNotFoundError:
+        pass
+    return refs
+
+
+def _common_dir(gdir: Path) -> Path:
+    """Refs live in the main repo's git dir for linked worktrees."""
+    try:
+        return (gdir / (gdir / "commondir").read_text(encoding="utf-8").strip()).resolve()
+    except FileNotFoundError:
+        return gdir
+
+
+def read_head(gdir: Path) -> str:
+    """HEAD's commit id (or ``ref: <name>`` for an unborn branch), without running git."""
+    head = (gdir / "HEAD").read_text(encoding="utf-8").strip()
+    if not head.startswith("ref:"):
+        return head
+    name = head[4:].strip()
+    common = _common_dir(gdir)
+    try:
+        return (common / name).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return _packed_refs(common).get(name, head)
+
+
+def local_remote_refs(gdir: Path) -> dict[str, str]:
+    """``refs/remotes/*`` from loose files and ``packed-refs``."""
+    common = _common_dir(gdir)
+    refs = {k: v for k, v in _packed_refs(common).items() if k.startswith("refs/remotes/")}
+    base = common / "refs" / "remotes"
+    for dirpath, _, files in os.walk(base):
+        for f in files:
+            path = Path(dirpath) / f
+            refs[path.relative_to(common).as_posix()] = path.read_text(encoding="utf-8").strip()
+    return refs
+
+
+def _remotes(gdir: Path) -> list[str]:
+    try:
+        config = (_common_dir(gdir) / "config").read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return []
+    return _REMOTE_SECTION.findall(config)
+
+
+def _digest(refs: dict[str, str]) -> str:
+    h = hashlib.blake2b(digest_size=12)
+    for name in sorted(refs):
+        h.update(f"{refs[name]} {name}\n".encode())
+    return h.hexdigest()
+
+
+def fingerprint(repo: str | Path, remote_refs: str) -> dict[str, object]:
+    gdir = git_dir(repo)
+    if gdir is None:
+        raise GitError("not a git repository")
+    try:
+        index = (gdir / "index").stat().st_mtime_ns
+    except FileNotFoundError:
+        index = 0
+    return {"head": read_head(gdir), "index": index, "remote": remote_refs}
+
+
+# -- git --------------------------------------------------------------------
+
+
+def git(repo: str | Path, *args: str, timeout: float = GIT_TIMEOUT) -> str:
+    try:
+        proc = subprocess.run(["git", "-C", str(repo), *args], capture_output=True, text=True,
+                              env=_ENV, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise GitError(f"git {args[0]} timed out after {timeout:.0f}s") from None
+    if proc.returncode != 0:
+        message = (proc.stderr.strip() or proc.stdout.strip()).splitlines()
+        raise GitError(f"git {args[0]}: {message[0] if message else f'exit {proc.returncode}'}")
+    return proc.stdout
+
+
+def remote_refs(repo: str | Path, *, online: bool = True) -> str:
+    """Digest of the remote's branch heads; ``""`` for repos with no remote."""
+    gdir = git_dir(repo)
+    if not online:
+        return _digest(local_remote_refs(gdir)) if gdir else ""
+    names = _remotes(gdir) if gdir else []
+    if not names:
+        return ""
+    out = git(repo, "ls-remote", "--heads", "--quiet", "origin" if "origin" in names else names[0])
+    return _digest({name: oid for oid, _, name in (line.partition("\t") for line in out.splitlines())})
+
+
+def status(repo: str | Path) -> RepoStatus:
+    """Parse ``git status --porcelain=v2 --branch``."""
+    result = RepoStatus(str(repo))
+    for line in git(repo, "status", "--porcelain=v2", "--branch").splitlines():
+        if line.startswith("# branch.head "):
+            result.branch = line[14:]
+        elif line.startswith("# branch.upstream "):
+            result.upstream = line[18:]
+        elif line.startswith("# branch.ab "):
+            ahead, behind = line[12:].split()
+            result.ahead, result.behind = int(ahead), -int(behind)
+        elif line.startswith(("1 ", "2 ")):
+            result.dirty += 1
+        elif line.startswith("u "):
+            result.conflicts += 1
+        elif line.startswith("? "):
+            result.untracked += 1
+    return result
+
+
+def sync_repo(repo: str | Path, cached: dict | None = None, *, fetch: bool = True, pull: bool = False,
+              push: bool = False, full: bool = False) -> tuple[RepoStatus, dict | None]:
+    """Bring one repo up to date; returns its status and the state entry to store."""
+    started = time.perf_counter()
+    try:
+        remote = remote_refs(repo, online=fetch)
+        before = fingerprint(repo, remote)
+        if cached and not full and cached.get("fingerprint") == before and not _pending(cached["status"], pull, push):
+            result = RepoStatus(str(repo), **cached["status"], action="cached")
+        else:
+            action = "checked"
+            if fetch and remote and (cached or {}).get("fingerprint", {}).get("remote") != remote:
+                git(repo, "fetch", "--prune", "--quiet")
+                action = "fetched"
+            result = status(repo)
+            if (pull and result.behind and not result.ahead and not result.dirty and not result.conflicts
+                    and result.upstream):
+                git(repo, "merge", "--ff-only", "--quiet", "@{upstream}")
+                result, action = status(repo), "pulled"
+            if push and result.ahead and not result.behind and not result.conflicts and result.upstream:
+                git(repo, "push", "--quiet")
+                result, action = status(repo), "pushed"
+                remote = remote_refs(repo, online=fetch)
+            result.action = action
+        # After status, which may have refreshed (and rewritten) the index.
+        entry = {"fingerprint": fingerprint(repo, remote), "status": _stored(result)}
+    except (GitError, OSError) as exc:
+        result, entry = RepoStatus(str(repo), action="failed", error=str(exc)), None
+    result.path = str(repo)
+    result.elapsed = time.perf_counter() - started
+    return result, entry
+
+
+def _pending(cached: dict, pull: bool, push: bool) -> bool:
+    """Whether a cached status still calls for a pull or push this run."""
+    return (pull and cached["behind"] > 0 and not cached["dirty"]) or (push and cached["ahead"] > 0)
+
+
+def _stored(result: RepoStatus) -> dict:
+    return {k: v for k, v in asdict(result).items() if k not in ("path", "action", "error", "elapsed")}
+
+
+# -- state and the whole run --------------------------------------------------
+
+
+def load_state(path: str | Path = STATE_FILE) -> dict[str, dict]:
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+    return data.get("repos", {}) if data.get("version") == STATE_VERSION else {}
+
+
+def save_state(repos: dict[str, dict], path: str | Path = STATE_FILE) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps({"version": STATE_VERSION, "repos": repos}, indent=1, sort_keys=True),
+                   encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def sync_all(repos: Iterable[str | Path], *, jobs: int = 8, state_path: str | Path | None = STATE_FILE,
+             **options: bool) -> Iterator[RepoStatus]:
+    """``sync_repo`` over ``repos`` on ``jobs`` threads, yielding results as they finish.
+
+    The state file is rewritten once, after the last repo. Repos that fail
+    keep no entry, so they're checked in full next time.
+    """
+    state = load_state(state_path) if state_path else {}
+    keys = {str(Path(r).resolve()): r for r in repos}
+    fresh: dict[str, dict] = {}
+    with ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix="git") as executor:
+        futures = {executor.submit(sync_repo, repo, state.get(key), **options): key for key, repo in keys.items()}
+        try:
+            for future in as_completed(futures):
+                result, entry = future.result()
+                if entry is not None:
+                    fresh[futures[future]] = entry
+                yield result
+        finally:
+            for future in futures:
+                future.cancel()
+    if state_path:
+        # Keep entries for repos outside this run (a narrower --root).
+        save_state({**{k: v for k, v in state.items() if k not in keys}, **fresh}, state_path)
+
+
+def table(results: list[RepoStatus]) -> str:
+    """Fixed-width summary: one row per repo, problems first."""
+    order = {"error": 0, "conflict": 1, "diverged": 2, "dirty": 3, "behind": 4, "ahead": 5}
+    rows = [("repo", "branch", "ahead", "behind", "dirty", "conflicts", "state", "action")]
+    for r in sorted(results, key=lambda r: (order.get(r.state, 9), r.name.lower())):
+        rows.append((r.name, r.branch, str(r.ahead), str(r.behind), str(r.dirty + r.untracked), str(r.conflicts),
+                     r.state, r.action))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(w) if i < 2 or i > 5 else cell.rjust(w)
+                       for i, (cell, w) in enumerate(zip(row, widths))).rstrip() for row in rows]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    for r in results:
+        if r.error:
+            lines.append(f"{r.name}: {r.error}")
+    return "\n".join(lines)
+
+
+# -- CLI ----------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="lifemgr git-sync", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--root", action="append",
+                        help=f"repo or folder of repos (default: {paths.SPACES_DIR} and {paths.VAULT_DIR})")
+    parser.add_argument("--jobs", "-j", type=int, default=8, help="repos processed at once")
+    parser.add_argument("--pull", action="store_true", help="fast-forward repos that are only behind")
+    parser.add_argument("--push", action="store_true", help="push repos that are only ahead")
+    parser.add_argument("--no-fetch", action="store_true", help="don't contact remotes")
+    parser.add_argument("--full", action="store_true", help="ignore the cached state")
+    parser.add_argument("--state", default=str(STATE_FILE), help="state file (default: %(default)s)")
+    parser.add_argument("--json", action="store_true", help="one JSON line per repo instead of a table")
+    args = parser.parse_args(argv)
+
+    repos = discover(args.root or [paths.SPACES_DIR, paths.VAULT_DIR])
+    if not repos:
+        print("no git repositories found", file=sys.stderr)
+        return 1
+    started = time.perf_counter()
+    results = []
+    for result in sync_all(repos, jobs=args.jobs, state_path=args.state, fetch=not args.no_fetch,
+                           pull=args.pull, push=args.push, full=args.full):
+        results.append(result)
+        if args.json:
+            print(json.dumps({**asdict(result), "state": result.state}), flush=True)
+    if not args.json:
+        print(table(results))
+    cached = sum(r.action == "cached" for r in results)
+    failed = sum(r.error is not None for r in results)
+    print(f"{len(results)} repos ({cached} unchanged, {failed} failed) in {time.perf_counter() - started:.1f}s",
+          file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
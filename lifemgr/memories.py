@@ -0,0 +1,560 @@
+"""Append-only memory log, compact index and token-budgeted loader.
+
+Memories stay one Markdown file each in ``.claude/memories/``. Instead of
+rewriting ``index.json`` on every capture, each capture appends one line to
+``log.jsonl``. A SQLite index in ``.claude/cache/memories.db`` (by date,
+type and tag) replays only the log lines it hasn't seen yet, so opening the
+store costs the same with 100 memories or 10,000. Writers hold an exclusive
+lock on ``log.lock``, so a capture can't land between compaction reading
+the log and replacing it.
+
+``/refresh`` loads context with a budget instead of reading whole days of
+memories. The loader scores a bounded candidate set (the most recent
+memories, tag matches and pinned ones) and fills the budget greedily::
+
+    python -m lifemgr memory add --type preference --tags writing "Prefers short PR descriptions"
+    python -m lifemgr memory load --budget 1500 --tags git,writing
+    python -m lifemgr memory compact              # merge near-duplicates
+    python -m lifemgr memory migrate              # one-shot, from index.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+from . import frontmatter, paths
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so writers from separate processes aren't serialized
+    fcntl = None
+
+SCHEMA_VERSION = 1
+#: Rough chars-per-token for budget estimates; close enough for English prose.
+CHARS_PER_TOKEN = 4
+#: How many recent / tag-matching memories the loader considers at most.
+CANDIDATES = 200
+#: Recency half-life, in days, for load scoring.
+HALF_LIFE_DAYS = 14.0
+#: Types that describe how to work with the user; they outrank plain notes.
+TYPE_WEIGHT = {"correction": 1.5, "preference": 1.4, "decision": 1.2, "insight": 1.0}
+#: Jaccard similarity over word shingles above which two memories are merged.
+DUPLICATE_THRESHOLD = 0.7
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS memories (
+    id            TEXT PRIMARY KEY,
+    date          TEXT NOT NULL,
+    type          TEXT NOT NULL,
+    title         TEXT NOT NULL,
+    file          TEXT NOT NULL,
+    tokens        INTEGER NOT NULL,
+    pinned        INTEGER NOT NULL DEFAULT 0,
+    superseded_by TEXT
+);
+CREATE INDEX IF NOT EXISTS memories_date ON memories (date DESC, id DESC) WHERE superseded_by IS NULL;
+CREATE INDEX IF NOT EXISTS memories_type ON memories (type, date DESC, id DESC) WHERE superseded_by IS NULL;
+CREATE INDEX IF NOT EXISTS memories_pinned ON memories (date) WHERE pinned = 1 AND superseded_by IS NULL;
+CREATE TABLE IF NOT EXISTS memory_tags (tag TEXT NOT NULL, id TEXT NOT NULL, PRIMARY KEY (tag, id)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS memory_tags_id ON memory_tags (id);
+"""
+
+_SLUG = re.compile(r"[^a-z0-9]+")
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+@dataclass
+class Memory:
+    id: str
+    date: str
+    type: str
+    title: str
+    file: str
+    tokens: int
+    tags: list[str] = field(default_factory=list)
+    pinned: bool = False
+
+
+class MemoryStore:
+    """Memories folder plus its append-only log and derived index."""
+
+    def __init__(self, root: str | Path = paths.MEMORIES_DIR, db_path: str | Path | None = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.log_path = self.root / "log.jsonl"
+        # Compaction replaces log.jsonl, so writers lock a file that stays put.
+        self.lock_path = self.root / "log.lock"
+        self._lock_fh: Any = None
+        self._lock_depth = 0
+        self.db_path = Path(db_path) if db_path else paths.CACHE_DIR / "memories.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.db_path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        self.sync()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "MemoryStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # -- log ------------------------------------------------------------
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the exclusive writer lock; re-entrant within one store."""
+        if self._lock_depth == 0 and fcntl is not None:
+            self._lock_fh = open(self.lock_path, "a")
+            fcntl.flock(self._lock_fh, fcntl.LOCK_EX)
+        self._lock_depth += 1
+        try:
+            yield
+        finally:
+            self._lock_depth -= 1
+            if self._lock_depth == 0 and self._lock_fh is not None:
+                self._lock_fh.close()  # releases the lock
+                self._lock_fh = None
+
+    def _generation(self) -> str:
+        """The log's generation id, from its header line (created if missing)."""
+        if not self.log_path.exists() or self.log_path.stat().st_size == 0:
+            with self._locked():
+                if not self.log_path.exists() or self.log_path.stat().st_size == 0:
+                    header = {"op": "header", "generation": uuid.uuid4().hex, "version": SCHEMA_VERSION}
+                    self.log_path.write_text(json.dumps(header) + "\n", encoding="utf-8")
+        with open(self.log_path, encoding="utf-8") as fh:
+            return json.loads(fh.readline()).get("generation", "")
+
+    def _append(self, events: Iterable[dict[str, Any]]) -> None:
+        lines = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events)
+        with self._locked():
+            self._generation()
+            with open(self.log_path, "a", encoding="utf-8") as fh:
+                fh.write(lines)
+                fh.flush()
+                os.fsync(fh.fileno())
+        self.sync()
+
+    def sync(self) -> int:
+        """Apply log lines the index hasn't seen; rebuilds after a compaction."""
+        generation = self._generation()
+        meta = dict(self.db.execute("SELECT key, value FROM meta"))
+        offset = int(meta.get("offset", 0))
+        size = self.log_path.stat().st_size
+        if meta.get("generation") != generation or meta.get("root") != str(self.root.resolve()) or size < offset:
+            self.db.executescript("DELETE FROM memories; DELETE FROM memory_tags; DELETE FROM meta;")
+            offset = 0
+        if offset == size:
+            return 0
+        applied = 0
+        self.db.execute("BEGIN")
+        try:
+            with open(self.log_path, "rb") as fh:
+                fh.seek(offset)
+                for raw in fh:
+                    if not raw.endswith(b"\n"):
+                        break  # a capture still being written; pick it up next time
+                    offset += len(raw)
+                    self._apply(json.loads(raw))
+                    applied += 1
+            self.db.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                                [("generation", generation), ("offset", str(offset)),
+                                 ("root", str(self.root.resolve()))])
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return applied
+
+    def _apply(self, event: dict[str, Any]) -> None:
+        op = event.get("op")
+        if op == "add":
+            self.db.execute("INSERT OR REPLACE INTO memories VALUES (?, ?, ?, ?, ?, ?, ?, NULL)",
+                            (event["id"], event["date"], event["type"], event["title"], event["file"],
+                             event["tokens"], int(event.get("pinned", False))))
+            self.db.execute("DELETE FROM memory_tags WHERE id=?", (event["id"],))
+            self.db.executemany("INSERT OR IGNORE INTO memory_tags VALUES (?, ?)",
+                                [(t, event["id"]) for t in event.get("tags", [])])
+        elif op == "merge":
+            self.db.executemany("UPDATE memories SET superseded_by=? WHERE id=?",
+                                [(event["into"], i) for i in event["ids"]])
+        elif op == "tags":
+            self.db.executemany("INSERT OR IGNORE INTO memory_tags VALUES (?, ?)",
+                                [(t, event["id"]) for t in event["tags"]])
+        elif op == "pin":
+            self.db.execute("UPDATE memories SET pinned=? WHERE id=?", (int(event["pinned"]), event["id"]))
+        elif op == "delete":
+            self.db.execute("DELETE FROM memories WHERE id=?", (event["id"],))
+            self.db.execute("DELETE FROM memory_tags WHERE id=?", (event["id"],))
+
+    # -- capture --------------------------------------------------------
+
+    def add(self, title: str, body: str = "", *, type: str = "insight", tags: Sequence[str] = (),
+            day: str | None = None, pinned: bool = False) -> Memory:
+        """Write a memory file and append it to the log."""
+        day = day or date.today().isoformat()
+        tags = _clean_tags(tags)
+        digest = hashlib.sha1(f"{day}\0{title}\0{body}".encode()).hexdigest()[:6]
+        slug = _SLUG.sub("-", title.lower()).strip("-")[:48] or "memory"
+        name = f"{day}-{slug}-{digest}.md"
+        meta = {"date": day, "type": type, "tags": tags}
+        text = frontmatter.render(meta) + f"\n# {title}\n\n{body.strip()}\n"
+        _write_atomic(self.root / name, text)
+        memory = Memory(f"{day}-{digest}", day, type, title, name, _tokens(text), tags, pinned)
+        self._append([_add_event(memory)])
+        return memory
+
+    def pin(self, memory_id: str, pinned: bool = True) -> None:
+        self._append([{"op": "pin", "id": memory_id, "pinned": pinned}])
+
+    # -- reading --------------------------------------------------------
+
+    def get(self, memory_id: str) -> Memory | None:
+        row = self.db.execute("SELECT id, date, type, title, file, tokens, pinned FROM memories WHERE id=?",
+                              (memory_id,)).fetchone()
+        return self._memory(row) if row else None
+
+    def count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM memories WHERE superseded_by IS NULL").fetchone()[0]
+
+    def find(self, *, types: Sequence[str] = (), tags: Sequence[str] = (), since: str | None = None,
+             limit: int = 50) -> list[Memory]:
+        """Live memories filtered by type, any of ``tags`` and date, newest first."""
+        sql = "SELECT id, date, type, title, file, tokens, pinned FROM memories m WHERE superseded_by IS NULL"
+        args: list[Any] = []
+        if types:
+            sql += f" AND type IN ({','.join('?' * len(types))})"
+            args += list(types)
+        if tags:
+            # EXISTS (rather than IN) keeps the scan on the date index, so a
+            # common tag still stops after ``limit`` rows instead of sorting.
+            sql += (" AND EXISTS (SELECT 1 FROM memory_tags t WHERE t.id = m.id"
+                    f" AND t.tag IN ({','.join('?' * len(tags))}))")
+            args += _clean_tags(tags)
+        if since:
+            sql += " AND date >= ?"
+            args.append(since)
+        sql += " ORDER BY date DESC, id DESC LIMIT ?"
+        return [self._memory(r) for r in self.db.execute(sql, [*args, limit])]
+
+    def _memory(self, row: Sequence[Any]) -> Memory:
+        tags = [t for (t,) in self.db.execute("SELECT tag FROM memory_tags WHERE id=? ORDER BY tag", (row[0],))]
+        return Memory(row[0], row[1], row[2], row[3], row[4], row[5], tags, bool(row[6]))
+
+    def read(self, memory: Memory) -> str:
+        """The memory's Markdown, without frontmatter."""
+        try:
+            _, body, _ = frontmatter.read(self.root / memory.file)
+        except FileNotFoundError:
+            return ""
+        return body.strip()
+
+    def load(self, budget: int = 1500, *, tags: Sequence[str] = (), types: Sequence[str] = (),
+             today: date | None = None) -> list[tuple[Memory, str]]:
+        """The best memories that fit in ``budget`` tokens, highest score first.
+
+        Candidates are the ``CANDIDATES`` most recent memories, tag matches
+        and pinned ones. The cost doesn't grow with the total memory count.
+        Each is scored by recency (``HALF_LIFE_DAYS``), type weight and tag
+        overlap, and the budget is filled greedily.
+        """
+        today = today or date.today()
+        wanted = set(_clean_tags(tags))
+        pool = {m.id: m for m in self.find(types=types, limit=CANDIDATES)}
+        if wanted:
+            pool.update((m.id, m) for m in self.find(types=types, tags=list(wanted), limit=CANDIDATES))
+        pinned = self.db.execute("SELECT id, date, type, title, file, tokens, pinned FROM memories "
+                                 "WHERE pinned = 1 AND superseded_by IS NULL LIMIT ?", (CANDIDATES,))
+        pool.update((r[0], self._memory(r)) for r in pinned.fetchall())
+
+        def score(m: Memory) -> float:
+            try:
+                age = (today - date.fromisoformat(m.date)).days
+            except ValueError:
+                age = 365
+            recency = math.pow(0.5, max(age, 0) / HALF_LIFE_DAYS)
+            overlap = len(wanted & set(m.tags)) / len(wanted) if wanted else 0.0
+            return (recency + 2 * overlap) * TYPE_WEIGHT.get(m.type, 1.0) + (10 if m.pinned else 0)
+
+        chosen: list[tuple[Memory, str]] = []
+        spent = 0
+        for memory in sorted(pool.values(), key=score, reverse=True):
+            if spent + memory.tokens > budget:
+                continue
+            text = self.read(memory)
+            if text:
+                chosen.append((memory, text))
+                spent += memory.tokens
+            if budget - spent < 20:
+                break
+        return chosen
+
+    # -- maintenance ----------------------------------------------------
+
+    def compact(self, *, threshold: float = DUPLICATE_THRESHOLD, dry_run: bool = False) -> list[list[str]]:
+        """Merge near-duplicate memories and rewrite the log without dead entries.
+
+        Memories of the same type whose word-shingle Jaccard similarity is at
+        least ``threshold`` are merged into the newest one: tags are unioned
+        and the older files move to ``archive/``. Candidate pairs come from
+        MinHash banding, so this stays roughly linear in the memory count.
+        Returns the merged groups (newest id first).
+        """
+        with self._locked():
+            # Captures from other processes wait until the log is rewritten.
+            self.sync()
+            live = self.find(limit=1_000_000)
+            merged = _duplicates(live, {m.id: _shingles(self.read(m)) for m in live}, threshold)
+            if dry_run:
+                return merged
+            by_id = {m.id: m for m in live}
+            events = []
+            archive = self.root / "archive"
+            for group in merged:
+                keep, rest = group[0], group[1:]
+                tags = sorted({t for i in group for t in by_id[i].tags} - set(by_id[keep].tags))
+                if tags:
+                    events.append({"op": "tags", "id": keep, "tags": tags})
+                events.append({"op": "merge", "into": keep, "ids": rest})
+                archive.mkdir(exist_ok=True)
+                for i in rest:
+                    src = self.root / by_id[i].file
+                    if src.exists():
+                        shutil.move(str(src), archive / src.name)
+            if events:
+                self._append(events)
+            self._rewrite_log()
+        return merged
+
+    def _rewrite_log(self) -> None:
+        """Replace the log with one ``add`` per live memory (new generation)."""
+        with self._locked():
+            self.sync()
+            live = self.find(limit=1_000_000)
+            header = {"op": "header", "generation": uuid.uuid4().hex, "version": SCHEMA_VERSION}
+            lines = [json.dumps(header)] + [json.dumps(_add_event(m), ensure_ascii=False) for m in reversed(live)]
+            _write_atomic(self.log_path, "\n".join(lines) + "\n")
+            self.sync()
+
+    def migrate_index_json(self, path: str | Path | None = None) -> int:
+        """Import the legacy ``index.json`` list (and any untracked memory files).
+
+        Entries already in the log are skipped, so it's safe to re-run.
+        Returns the number of memories added.
+        """
+        path = Path(path) if path else self.root / "index.json"
+        entries = json.loads(path.read_text(encoding="utf-8")) if path.exists() else []
+        if isinstance(entries, dict):
+            entries = entries.get("memories", [])
+        with self._locked():
+            self.sync()
+            known = {f for (f,) in self.db.execute("SELECT file FROM memories")}
+            events = []
+            listed: set[str] = set()
+            for entry in entries:
+                name = entry.get("file") or entry.get("path") or entry.get("filename")
+                if not name:
+                    continue
+                name = Path(name).name
+                listed.add(name)
+                if name not in known and (self.root / name).exists():
+                    events.append(_add_event(self._from_file(name, entry)))
+            for file in sorted(self.root.glob("*.md")):
+                if file.name not in known and file.name not in listed and file.name != "about-me.md":
+                    events.append(_add_event(self._from_file(file.name, {})))
+            if events:
+                self._append(events)
+        return len(events)
+
+    def _from_file(self, name: str, entry: dict[str, Any]) -> Memory:
+        text = (self.root / name).read_text(encoding="utf-8", errors="replace")
+        meta, body, _ = frontmatter.split(text)
+        day = str(entry.get("date") or meta.get("date") or name[:10])
+        try:
+            date.fromisoformat(day[:10])
+            day = day[:10]
+        except ValueError:
+            day = datetime.fromtimestamp((self.root / name).stat().st_mtime).date().isoformat()
+        title = str(entry.get("title") or entry.get("summary") or meta.get("title")
+                    or _first_heading(body) or Path(name).stem)
+        tags = _clean_tags(entry.get("tags") or meta.get("tags") or [])
+        kind = str(entry.get("type") or meta.get("type") or "insight")
+        digest = hashlib.sha1(name.encode()).hexdigest()[:6]
+        return Memory(f"{day}-{digest}", day, kind, title[:200], name, _tokens(text), tags)
+
+
+def _add_event(m: Memory) -> dict[str, Any]:
+    return {"op": "add", "id": m.id, "date": m.date, "type": m.type, "title": m.title,
+            "file": m.file, "tokens": m.tokens, "tags": m.tags, "pinned": m.pinned}
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def _clean_tags(tags: Any) -> list[str]:
+    if isinstance(tags, str):
+        tags = re.split(r"[,\s]+", tags)
+    return sorted({str(t).strip().lstrip("#").lower() for t in tags if str(t).strip()})
+
+
+def _first_heading(body: str) -> str | None:
+    match = re.search(r"^#+\s+(.+)$", body, re.MULTILINE)
+    return match.group(1).strip() if match else None
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _duplicates(live: list[Memory], shingles: dict[str, frozenset[int]], threshold: float) -> list[list[str]]:
+    """Groups of same-type memories at least ``threshold`` similar, newest first."""
+    by_id = {m.id: m for m in live}
+    parent = {m.id: m.id for m in live}
+
+    def root(x: str) -> str:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in _candidate_pairs(live, shingles):
+        if by_id[a].type != by_id[b].type:
+            continue
+        sa, sb = shingles[a], shingles[b]
+        if sa and sb and len(sa & sb) / len(sa | sb) >= threshold:
+            parent[root(a)] = root(b)
+    groups: dict[str, list[str]] = {}
+    for m in live:
+        groups.setdefault(root(m.id), []).append(m.id)
+    return [sorted(g, key=lambda i: (by_id[i].date, i), reverse=True) for g in groups.values() if len(g) > 1]
+
+
+def _shingles(text: str, k: int = 3) -> frozenset[int]:
+    words = _WORD.findall(text.lower())
+    if len(words) < k:
+        return frozenset([hash(" ".join(words))]) if words else frozenset()
+    return frozenset(hash(" ".join(words[i:i + k])) for i in range(len(words) - k + 1))
+
+
+def _candidate_pairs(live: list[Memory], shingles: dict[str, frozenset[int]],
+                     bands: int = 16, rows: int = 2) -> Iterator[tuple[str, str]]:
+    """Pairs likely to be similar, via MinHash locality-sensitive hashing."""
+    mask = (1 << 61) - 1
+    seeds = [(2 * i + 1) * 0x9E3779B97F4A7C15 & mask for i in range(bands * rows)]
+    buckets: dict[tuple[int, tuple[int, ...]], list[str]] = {}
+    for m in live:
+        sh = shingles[m.id]
+        if not sh:
+            continue
+        sig = [min((h * s) & mask for h in sh) for s in seeds]
+        for b in range(bands):
+            buckets.setdefault((b, tuple(sig[b * rows:(b + 1) * rows])), []).append(m.id)
+    seen: set[tuple[str, str]] = set()
+    for ids in buckets.values():
+        for i, a in enumerate(ids):
+            for b in ids[i + 1:]:
+                pair = (a, b) if a < b else (b, a)
+                if pair not in seen:
+                    seen.add(pair)
+                    yield pair
+
+
+# -- CLI ----------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="lifemgr memory", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--root", default=str(paths.MEMORIES_DIR), help="memories folder (default: %(default)s)")
+    parser.add_argument("--db", help="index path (default: .claude/cache/memories.db)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("add", help="capture a memory")
+    p.add_argument("title")
+    p.add_argument("--body", help="details (default: stdin if piped)")
+    p.add_argument("--type", default="insight", help="preference | correction | insight | decision | ...")
+    p.add_argument("--tags", default="")
+    p.add_argument("--pin", action="store_true", help="always load this memory")
+
+    p = sub.add_parser("load", help="print the best memories that fit a token budget")
+    p.add_argument("--budget", type=int, default=1500, help="approximate tokens (default: %(default)s)")
+    p.add_argument("--tags", default="", help="boost memories with these tags")
+    p.add_argument("--types", default="", help="only these types")
+    p.add_argument("--with-profile", action="store_true", help="print about-me.md first (counts toward budget)")
+
+    p = sub.add_parser("find", help="list memories by type/tag/date")
+    p.add_argument("--types", default="")
+    p.add_argument("--tags", default="")
+    p.add_argument("--since", help="YYYY-MM-DD")
+    p.add_argument("--limit", type=int, default=50)
+
+    p = sub.add_parser("pin", help="pin or unpin a memory")
+    p.add_argument("id")
+    p.add_argument("--off", action="store_true")
+
+    p = sub.add_parser("compact", help="merge near-duplicates and rewrite the log")
+    p.add_argument("--threshold", type=float, default=DUPLICATE_THRESHOLD)
+    p.add_argument("--dry-run", action="store_true")
+
+    p = sub.add_parser("migrate", help="import index.json and untracked memory files")
+    p.add_argument("--index", help="path to index.json (default: ROOT/index.json)")
+    args = parser.parse_args(argv)
+
+    with MemoryStore(args.root, args.db) as store:
+        if args.cmd == "add":
+            body = args.body if args.body is not None else ("" if sys.stdin.isatty() else sys.stdin.read())
+            memory = store.add(args.title, body, type=args.type, tags=_clean_tags(args.tags), pinned=args.pin)
+            print(memory.id)
+        elif args.cmd == "load":
+            budget = args.budget
+            if args.with_profile and (profile := store.root / "about-me.md").exists():
+                text = profile.read_text(encoding="utf-8").strip()
+                budget -= _tokens(text)
+                print(text + "\n")
+            chosen = store.load(max(budget, 0), tags=_clean_tags(args.tags), types=_clean_tags(args.types))
+            used = sum(m.tokens for m, _ in chosen)
+            print(f"## Memories ({len(chosen)} of {store.count()}, ~{used} tokens)\n")
+            for memory, text in chosen:
+                tags = f" [{', '.join(memory.tags)}]" if memory.tags else ""
+                print(f"<!-- {memory.id} · {memory.date} · {memory.type}{tags} -->\n{text}\n")
+        elif args.cmd == "find":
+            for m in store.find(types=_clean_tags(args.types), tags=_clean_tags(args.tags),
+                                since=args.since, limit=args.limit):
+                print(f"{m.id}  {m.type:<11} {m.title}  [{', '.join(m.tags)}]")
+        elif args.cmd == "pin":
+            store.pin(args.id, not args.off)
+        elif args.cmd == "compact":
+            before = store.count()
+            groups = store.compact(threshold=args.threshold, dry_run=args.dry_run)
+            for group in groups:
+                print(" <- ".join(group))
+            print(f"{len(groups)} groups merged; {before} -> {store.count()} memories"
+                  + (" (dry run)" if args.dry_run else ""))
+        elif args.cmd == "migrate":
+            print(f"{store.migrate_index_json(args.index)} memories imported; index.json is no longer written")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,29 @@
+"""Well-known locations inside the framework checkout."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+#: Repo root. ``LIFEMGR_ROOT`` overrides it for tests and odd layouts.
+ROOT = Path(os.environ.get("LIFEMGR_ROOT") or Path(__file__).resolve().parent.parent)
+
+CLAUDE_DIR = ROOT / ".claude"
+SKILLS_DIR = CLAUDE_DIR / "skills"
+MEMORIES_DIR = CLAUDE_DIR / "memories"
+LEARNING_DIR = CLAUDE_DIR / "learning-sessions"
+
+#: Durable state that can't be rebuilt from the vault (seen items, reviews).
+STATE_DIR = CLAUDE_DIR / "state"
+#: Derived indexes; safe to delete at any time.
+CACHE_DIR = CLAUDE_DIR / "cache"
+
+VAULT_DIR = ROOT / "my-vault"
+SPACES_DIR = ROOT / "spaces"
+CAPTURE_DIR = VAULT_DIR / "07 Knowledge Base" / "Capture"
+TEMPLATES_DIR = ROOT / "shared" / "templates"
+
+FEEDS_JSON = SKILLS_DIR / "rss-catchup" / "references" / "feeds.json"
+CHANNELS_JSON = SKILLS_DIR / "youtube-catchup" / "references" / "channels.json"
+CATCHUP_DB = STATE_DIR / "catchup.db"
+CARDS_DB = STATE_DIR / "cards.db"
@@ -0,0 +1,537 @@
+"""Incremental BM25 (plus optional embedding) search over ``my-vault/``.
+
+``/research``, ``/study-notes``, ``/synthesize`` and ``/refresh`` query this
+instead of globbing and grepping the vault. Each note is split into chunks
+at its headings. Chunk text goes into an SQLite FTS5 table, which ranks
+with BM25. Path, heading, line range, tags and frontmatter go into plain
+columns so results can be filtered.
+
+Re-indexing only reads files whose mtime or size changed, and only
+re-chunks those whose content hash changed too. ``query`` re-scans the
+vault first only when the last update is older than ``UPDATE_EVERY``, so
+a burst of queries pays for one scan; ``--refresh`` forces it.
+
+Semantic search is optional. When ``fastembed`` or
+``sentence-transformers`` and ``numpy`` are installed, ``index --embed``
+also stores one vector per chunk in a memory-mapped float32 file, and
+``query --semantic`` blends cosine similarity with BM25 using reciprocal
+rank fusion::
+
+    python -m lifemgr search index [--embed]
+    python -m lifemgr search query "spaced repetition" -k 8 --tag learning
+    python -m lifemgr search query "sleep" --folder "05 Personal" --where status=active
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+from . import frontmatter, paths
+
+SCHEMA_VERSION = 3
+#: Chunks longer than this are split again at blank lines.
+MAX_CHUNK_CHARS = 2400
+SKIP_DIRS = {".obsidian", ".trash", ".git", "node_modules"}
+#: Reciprocal-rank-fusion constant for hybrid queries.
+RRF_K = 60
+#: ``query`` updates the index first when the last update is older than this.
+UPDATE_EVERY = 300.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    path     TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size     INTEGER NOT NULL,
+    sha1     TEXT NOT NULL,
+    meta     TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id         INTEGER PRIMARY KEY,
+    path       TEXT NOT NULL,
+    heading    TEXT NOT NULL,
+    line_start INTEGER NOT NULL,
+    line_end   INTEGER NOT NULL,
+    vector_row INTEGER
+);
+CREATE INDEX IF NOT EXISTS chunks_path ON chunks (path);
+CREATE TABLE IF NOT EXISTS tags (path TEXT NOT NULL, tag TEXT NOT NULL, PRIMARY KEY (tag, path)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_path ON tags (path);
+CREATE TABLE IF NOT EXISTS fields (
+    path  TEXT NOT NULL,
+    key   TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (key, value, path)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS fields_path ON fields (path);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(heading, body, tokenize = 'porter unicode61');
+"""
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class Chunk:
+    heading: str
+    line_start: int
+    line_end: int
+    text: str
+
+
+@dataclass
+class Hit:
+    path: str
+    heading: str
+    line_start: int
+    line_end: int
+    score: float
+    snippet: str
+    tags: list[str]
+
+
+def chunk_markdown(body: str, first_line: int = 1) -> list[Chunk]:
+    """Split a note body at headings (outside code fences).
+
+    Each chunk's ``heading`` is the heading trail (``H1 > H2``). Line
+    numbers are 1-based and inclusive, offset by ``first_line`` so they
+    point into the original file even when frontmatter was stripped.
+    """
+    chunks: list[Chunk] = []
+    trail: list[tuple[int, str]] = []
+    lines = body.splitlines()
+    start, in_fence = 0, False
+
+    def flush(end: int) -> None:
+        text = "\n".join(lines[start:end]).strip()
+        if text:
+            heading = " > ".join(t for _, t in trail)
+            chunks.extend(_split_long(heading, start + first_line, lines[start:end]))
+
+    for i, line in enumerate(lines):
+        if _FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        match = None if in_fence else _HEADING.match(line)
+        if match:
+            flush(i)
+            level = len(match.group(1))
+            trail = [t for t in trail if t[0] < level] + [(level, match.group(2))]
+            start = i
+    flush(len(lines))
+    return chunks
+
+
+def _split_long(heading: str, line_start: int, lines: list[str]) -> Iterator[Chunk]:
+    buf: list[str] = []
+    size, offset = 0, 0
+    for i, line in enumerate(lines):
+        if size > MAX_CHUNK_CHARS and not line.strip():
+            yield Chunk(heading, line_start + offset, line_start + i - 1, "\n".join(buf).strip())
+            buf, size, offset = [], 0, i + 1
+            continue
+        buf.append(line)
+        size += len(line) + 1
+    if "".join(buf).strip():
+        yield Chunk(heading, line_start + offset, line_start + len(lines) - 1, "\n".join(buf).strip())
+
+
+class VaultIndex:
+    """On-disk search index over a vault folder."""
+
+    def __init__(self, root: str | Path = paths.VAULT_DIR, index_dir: str | Path | None = None):
+        self.root = Path(root).resolve()
+        self.index_dir = Path(index_dir) if index_dir else paths.CACHE_DIR / "vault-search"
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.index_dir / "index.db", isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        meta = dict(self.db.execute("SELECT key, value FROM meta"))
+        if meta.get("version") != str(SCHEMA_VERSION) or meta.get("root") != str(self.root):
+            self.reset()
+        self._vectors: _VectorStore | None = None
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "VaultIndex":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def reset(self) -> None:
+        """Drop everything; the next ``update`` indexes from scratch."""
+        self.db.executescript("DELETE FROM files; DELETE FROM chunks; DELETE FROM tags; DELETE FROM fields; "
+                              "DELETE FROM chunks_fts; DELETE FROM meta;")
+        self.db.executemany("INSERT INTO meta VALUES (?, ?)",
+                            [("version", str(SCHEMA_VERSION)), ("root", str(self.root))])
+        _VectorStore.remove(self.index_dir)
+
+    # -- indexing -------------------------------------------------------
+
+    def update(self, *, embed: bool = False, progress: bool = False) -> dict[str, int]:
+        """Re-index changed notes; returns counts of what was touched."""
+        stats = {"scanned": 0, "indexed": 0, "unchanged": 0, "removed": 0, "chunks": 0}
+        known = {p: (m, s, h) for p, m, s, h in self.db.execute("SELECT path, mtime_ns, size, sha1 FROM files")}
+        present: set[str] = set()
+        vectors = self.vectors(create=True) if embed else None
+        self.db.execute("BEGIN")
+        try:
+            for rel, st in self._scan():
+                stats["scanned"] += 1
+                present.add(rel)
+                old = known.get(rel)
+                if old and old[0] == st.st_mtime_ns and old[1] == st.st_size:
+                    continue
+                data = (self.root / rel).read_bytes()
+                sha1 = hashlib.sha1(data).hexdigest()
+                if old and old[2] == sha1:
+                    self.db.execute("UPDATE files SET mtime_ns=?, size=? WHERE path=?",
+                                    (st.st_mtime_ns, st.st_size, rel))
+                    stats["unchanged"] += 1
+                    continue
+                stats["chunks"] += self._index_file(rel, data, st, sha1)
+                stats["indexed"] += 1
+                if progress and stats["indexed"] % 1000 == 0:
+                    print(f"  {stats['indexed']} notes indexed", file=sys.stderr)
+            for rel in known.keys() - present:
+                self._drop(rel)
+                stats["removed"] += 1
+            if vectors is not None:
+                # Covers both the notes just indexed and any indexed before
+                # embeddings were switched on.
+                pending = self.db.execute(
+                    "SELECT c.id, f.heading || char(10) || f.body FROM chunks c "
+                    "JOIN chunks_fts f ON f.rowid = c.id WHERE c.vector_row IS NULL").fetchall()
+                rows = vectors.add([t for _, t in pending])
+                self.db.executemany("UPDATE chunks SET vector_row=? WHERE id=?",
+                                    [(row, chunk_id) for (chunk_id, _), row in zip(pending, rows)])
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('updated_at', ?)", (str(time.time()),))
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return stats
+
+    def stale(self, max_age: float = UPDATE_EVERY) -> bool:
+        """Whether the last ``update`` is more than ``max_age`` seconds old."""
+        row = self.db.execute("SELECT value FROM meta WHERE key='updated_at'").fetchone()
+        return row is None or time.time() - float(row[0]) > max_age
+
+    def _scan(self) -> Iterator[tuple[str, os.stat_result]]:
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = list(it)
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS and not entry.name.startswith("."):
+                        stack.append(Path(entry.path))
+                elif entry.name.endswith(".md"):
+                    yield Path(entry.path).relative_to(self.root).as_posix(), entry.stat()
+
+    def _index_file(self, rel: str, data: bytes, st: os.stat_result, sha1: str) -> int:
+        self._drop(rel)
+        meta, body, body_line = frontmatter.split(data.decode("utf-8", errors="replace"))
+        self.db.execute("INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+                        (rel, st.st_mtime_ns, st.st_size, sha1, json.dumps(meta, default=str)))
+        self.db.executemany("INSERT OR IGNORE INTO tags VALUES (?, ?)",
+                            [(rel, t.lower()) for t in frontmatter.tags(meta, body)])
+        self.db.executemany("INSERT OR IGNORE INTO fields VALUES (?, ?, ?)",
+                            [(rel, key, _field_value(v)) for key, value in meta.items()
+                             for v in (value if isinstance(value, list) else [value])
+                             if not isinstance(v, dict)])
+        title = Path(rel).stem
+        chunks = chunk_markdown(body, body_line) or [Chunk("", body_line, body_line, "")]
+        for chunk in chunks:
+            cur = self.db.execute("INSERT INTO chunks (path, heading, line_start, line_end) VALUES (?, ?, ?, ?)",
+                                  (rel, chunk.heading, chunk.line_start, chunk.line_end))
+            heading = f"{title} > {chunk.heading}" if chunk.heading else title
+            self.db.execute("INSERT INTO chunks_fts (rowid, heading, body) VALUES (?, ?, ?)",
+                            (cur.lastrowid, heading, chunk.text))
+        return len(chunks)
+
+    def _drop(self, rel: str) -> None:
+        ids = [r for (r,) in self.db.execute("SELECT id FROM chunks WHERE path=?", (rel,))]
+        if ids:
+            self.db.executemany("DELETE FROM chunks_fts WHERE rowid=?", [(i,) for i in ids])
+            self.db.execute("DELETE FROM chunks WHERE path=?", (rel,))
+        self.db.execute("DELETE FROM tags WHERE path=?", (rel,))
+        self.db.execute("DELETE FROM fields WHERE path=?", (rel,))
+        self.db.execute("DELETE FROM files WHERE path=?", (rel,))
+
+    def vectors(self, *, create: bool = False) -> "_VectorStore | None":
+        if self._vectors is None and (create or _VectorStore.exists(self.index_dir)):
+            self._vectors = _VectorStore(self.index_dir)
+        return self._vectors
+
+    # -- querying -------------------------------------------------------
+
+    def query(self, text: str, k: int = 10, *, tags: Sequence[str] = (), folder: str | None = None,
+              where: dict[str, Any] | None = None, semantic: bool = False) -> list[Hit]:
+        """Top-``k`` chunks for ``text``, optionally filtered.
+
+        ``tags`` must all be present on the note; ``folder`` is a vault-relative
+        path prefix; ``where`` matches frontmatter fields exactly (list fields
+        match if they contain the value).
+        """
+        filters, args = self._filters(tags, folder, where)
+        ranked = self._bm25(text, filters, args, k * 4 if semantic else k)
+        if semantic:
+            vectors = self.vectors()
+            if vectors is None:
+                raise RuntimeError("no embeddings yet; run `lifemgr search index --embed` first")
+            ranked = _fuse(ranked, self._semantic(vectors, text, filters, args, k * 4))
+        return self._hits(ranked[:k], text)
+
+    def _filters(self, tags: Sequence[str], folder: str | None,
+                 where: dict[str, Any] | None) -> tuple[list[str], list[Any]]:
+        filters: list[str] = []
+        args: list[Any] = []
+        for tag in tags:
+            filters.append("c.path IN (SELECT path FROM tags WHERE tag=?)")
+            args.append(tag.lstrip("#").lower())
+        if folder:
+            prefix = folder.strip("/") + "/"
+            filters.append("c.path >= ? AND c.path < ?")
+            args += [prefix, prefix + "\uffff"]
+        for field, value in (where or {}).items():
+            filters.append("c.path IN (SELECT path FROM fields WHERE key=? AND value=?)")
+            args += [field, _field_value(value)]
+        return filters, args
+
+    def _bm25(self, text: str, filters: list[str], args: list[Any], limit: int) -> list[tuple[int, float]]:
+        terms = _TOKEN.findall(text.lower())
+        if not terms:
+            return []
+        match = " OR ".join(f'"{t}"' for t in dict.fromkeys(terms))
+        sql = ("SELECT c.id, bm25(chunks_fts, 2.0, 1.0) AS rank FROM chunks_fts "
+               "JOIN chunks c ON c.id = chunks_fts.rowid WHERE chunks_fts MATCH ?")
+        for clause in filters:
+            sql += f" AND {clause}"
+        sql += " ORDER BY rank LIMIT ?"
+        # bm25() is negative, lower is better; flip it so higher scores win.
+        return [(cid, -rank) for cid, rank in self.db.execute(sql, [match, *args, limit])]
+
+    def _semantic(self, vectors: "_VectorStore", text: str, filters: list[str], args: list[Any],
+                  limit: int) -> list[tuple[int, float]]:
+        sql = "SELECT c.vector_row, c.id FROM chunks c WHERE c.vector_row IS NOT NULL"
+        for clause in filters:
+            sql += f" AND {clause}"
+        rows = dict(self.db.execute(sql, args)) if filters else None
+        scored = vectors.search(text, limit, allowed=rows.keys() if rows is not None else None)
+        if rows is None:
+            rows = dict(self.db.execute(
+                f"SELECT vector_row, id FROM chunks WHERE vector_row IN ({','.join('?' * len(scored))})",
+                [r for r, _ in scored]))
+        return [(rows[r], s) for r, s in scored if r in rows]
+
+    def _hits(self, ranked: list[tuple[int, float]], text: str) -> list[Hit]:
+        hits = []
+        match = " OR ".join(f'"{t}"' for t in dict.fromkeys(_TOKEN.findall(text.lower()))) or '""'
+        for chunk_id, score in ranked:
+            path, heading, start, end = self.db.execute(
+                "SELECT path, heading, line_start, line_end FROM chunks WHERE id=?", (chunk_id,)).fetchone()
+            row = self.db.execute("SELECT snippet(chunks_fts, 1, '**', '**', ' … ', 24) FROM chunks_fts "
+                                  "WHERE chunks_fts MATCH ? AND rowid=?", (match, chunk_id)).fetchone()
+            if row is None:
+                row = self.db.execute("SELECT substr(body, 1, 200) FROM chunks_fts WHERE rowid=?",
+                                      (chunk_id,)).fetchone()
+            note_tags = [t for (t,) in self.db.execute("SELECT tag FROM tags WHERE path=?", (path,))]
+            snippet = " ".join(row[0].split()) if row else ""
+            hits.append(Hit(path, heading, start, end, round(score, 4), snippet, note_tags))
+        return hits
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "notes": self.db.execute("SELECT COUNT(*) FROM files").fetchone()[0],
+            "chunks": self.db.execute("SELECT COUNT(*) FROM chunks").fetchone()[0],
+            "embedded": self.db.execute("SELECT COUNT(*) FROM chunks WHERE vector_row IS NOT NULL").fetchone()[0],
+        }
+
+
+def _field_value(value: Any) -> str:
+    """Frontmatter values as stored in ``fields``: ``true``/``false``, ``""`` for null."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return "" if value is None else str(value)
+
+
+def _fuse(*rankings: list[tuple[int, float]]) -> list[tuple[int, float]]:
+    scores: dict[int, float] = {}
+    for ranking in rankings:
+        for rank, (chunk_id, _) in enumerate(ranking):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (RRF_K + rank + 1)
+    return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+
+
+# -- optional embeddings ------------------------------------------------
+
+
+class _VectorStore:
+    """Append-only float32 matrix in ``vectors.f32``, read via ``numpy.memmap``.
+
+    Rows of re-indexed chunks are simply orphaned; ``lifemgr search index
+    --rebuild`` reclaims the space.
+    """
+
+    MODEL = "BAAI/bge-small-en-v1.5"
+
+    def __init__(self, index_dir: Path):
+        try:
+            import numpy
+        except ImportError as exc:
+            raise RuntimeError("semantic search needs numpy: pip install numpy fastembed") from exc
+        self.np = numpy
+        self.path = index_dir / "vectors.f32"
+        self.info_path = index_dir / "vectors.json"
+        info = json.loads(self.info_path.read_text()) if self.info_path.exists() else {}
+        self.model_name = info.get("model", self.MODEL)
+        self.dim: int | None = info.get("dim")
+        self._model: Any = None
+
+    @staticmethod
+    def exists(index_dir: Path) -> bool:
+        return (index_dir / "vectors.json").exists()
+
+    @staticmethod
+    def remove(index_dir: Path) -> None:
+        for name in ("vectors.f32", "vectors.json"):
+            (index_dir / name).unlink(missing_ok=True)
+
+    def _embed(self, texts: list[str]) -> Any:
+        if self._model is None:
+            try:
+                from fastembed import TextEmbedding
+
+                model = TextEmbedding(self.model_name)
+                self._model = lambda batch: list(model.embed(batch))
+            except ImportError:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                except ImportError as exc:
+                    raise RuntimeError("semantic search needs an embedding library: "
+                                       "pip install fastembed (or sentence-transformers)") from exc
+                model = SentenceTransformer(self.model_name, device="cpu")
+                self._model = lambda batch: model.encode(batch, batch_size=64)
+        matrix = self.np.asarray(self._model(texts), dtype=self.np.float32)
+        norms = self.np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / self.np.maximum(norms, 1e-12)
+
+    def rows(self) -> int:
+        if not self.dim or not self.path.exists():
+            return 0
+        return self.path.stat().st_size // (4 * self.dim)
+
+    def add(self, texts: list[str]) -> range:
+        """Embed and append ``texts``; returns their row numbers."""
+        if not texts:
+            return range(0)
+        first = self.rows()
+        with open(self.path, "ab") as fh:
+            for i in range(0, len(texts), 256):
+                matrix = self._embed(texts[i:i + 256])
+                if self.dim is None:
+                    self.dim = int(matrix.shape[1])
+                fh.write(matrix.tobytes())
+        self.info_path.write_text(json.dumps({"model": self.model_name, "dim": self.dim}))
+        return range(first, first + len(texts))
+
+    def search(self, text: str, k: int, *, allowed: Any = None) -> list[tuple[int, float]]:
+        n = self.rows()
+        if not n:
+            return []
+        matrix = self.np.memmap(self.path, dtype=self.np.float32, mode="r", shape=(n, self.dim))
+        query = self._embed([text])[0]
+        if allowed is not None:
+            rows = self.np.fromiter(allowed, dtype=self.np.int64)
+            if not len(rows):
+                return []
+            scores = matrix[rows] @ query
+        else:
+            rows = None
+            scores = matrix @ query
+        top = self.np.argsort(-scores)[:k]
+        return [(int(rows[i] if rows is not None else i), float(scores[i])) for i in top]
+
+
+# -- CLI ----------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="lifemgr search", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--vault", default=str(paths.VAULT_DIR), help="vault root (default: %(default)s)")
+    parser.add_argument("--index-dir", help="index location (default: .claude/cache/vault-search)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("index", help="bring the index up to date")
+    p.add_argument("--embed", action="store_true", help="also compute embeddings (needs fastembed + numpy)")
+    p.add_argument("--rebuild", action="store_true", help="drop everything and index from scratch")
+
+    p = sub.add_parser("query", help="print the top-k matching chunks")
+    p.add_argument("text")
+    p.add_argument("-k", type=int, default=10)
+    p.add_argument("--tag", action="append", default=[], help="require a tag (repeatable)")
+    p.add_argument("--folder", help="vault-relative folder prefix, e.g. '07 Knowledge Base'")
+    p.add_argument("--where", action="append", default=[], metavar="FIELD=VALUE",
+                   help="frontmatter filter (repeatable)")
+    p.add_argument("--semantic", action="store_true", help="blend in embedding similarity")
+    p.add_argument("--refresh", action="store_true", help="update the index before querying even if it's recent")
+    p.add_argument("--no-update", action="store_true",
+                   help=f"never update first (default: update when older than {UPDATE_EVERY:.0f}s)")
+    p.add_argument("--json", action="store_true")
+
+    sub.add_parser("stats", help="note and chunk counts")
+    args = parser.parse_args(argv)
+
+    with VaultIndex(args.vault, args.index_dir) as index:
+        if args.cmd == "index":
+            if args.rebuild:
+                index.reset()
+            started = time.perf_counter()
+            stats = index.update(embed=args.embed, progress=True)
+            print(", ".join(f"{v} {k}" for k, v in stats.items()) + f" in {time.perf_counter() - started:.2f}s")
+        elif args.cmd == "query":
+            if args.refresh or (not args.no_update and index.stale()):
+                index.update()
+            where = dict(_field(w) for w in args.where)
+            try:
+                hits = index.query(args.text, args.k, tags=args.tag, folder=args.folder,
+                                   where=where, semantic=args.semantic)
+            except RuntimeError as exc:
+                print(f"error: {exc}", file=sys.stderr)
+                return 1
+            if args.json:
+                json.dump([asdict(h) for h in hits], sys.stdout, indent=2, ensure_ascii=False)
+                print()
+            for hit in [] if args.json else hits:
+                print(f"{hit.path}:{hit.line_start}-{hit.line_end}  [{hit.score}]  {hit.heading}")
+                print(f"    {hit.snippet}")
+        else:
+            print(json.dumps(index.stats()))
+    return 0
+
+
+def _field(text: str) -> tuple[str, Any]:
+    field, _, value = text.partition("=")
+    return field.strip(), frontmatter.scalar(value)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
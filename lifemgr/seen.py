@@ -0,0 +1,449 @@
+"""SQLite-backed source config and seen-item history for the catchup skills.
+
+``/rss-catchup`` and ``/youtube-catchup`` used to keep everything in
+``feeds.json`` / ``channels.json`` and rewrite the whole file on every run.
+This store keeps one row per source (feed or channel) and one row per seen
+item, keyed by a 16-byte hash of the item's GUID or normalized URL, so a
+"have I seen this?" check is a single primary-key probe and marking an item
+seen is a single insert.
+
+Usage from a skill::
+
+    python -m lifemgr seen migrate            # one-shot, from the JSON files
+    python -m lifemgr seen sources --kind feed
+    python -m lifemgr seen unseen URL [URL ...]
+    python -m lifemgr seen mark --source URL URL [URL ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from . import paths
+from .urls import item_hash
+
+KINDS = ("feed", "channel")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    id            INTEGER PRIMARY KEY,
+    kind          TEXT NOT NULL,
+    key           TEXT NOT NULL,
+    name          TEXT NOT NULL DEFAULT '',
+    category      TEXT,
+    priority      TEXT,
+    extra         TEXT NOT NULL DEFAULT '{}',
+    enabled       INTEGER NOT NULL DEFAULT 1,
+    etag          TEXT,
+    last_modified TEXT,
+    last_fetched  REAL,
+    UNIQUE (kind, key)
+);
+CREATE TABLE IF NOT EXISTS seen (
+    hash      BLOB PRIMARY KEY,
+    source_id INTEGER,
+    seen_at   REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS seen_source ON seen (source_id);
+-- Validators from a fetch whose items aren't all marked seen yet.
+CREATE TABLE IF NOT EXISTS pending_fetch (
+    source_id     INTEGER PRIMARY KEY,
+    etag          TEXT,
+    last_modified TEXT,
+    items         TEXT NOT NULL
+);
+"""
+
+# Keys that map onto real columns; anything else in a JSON entry is kept in
+# ``extra`` so a round trip through the store loses nothing.
+_COLUMNS = ("name", "category", "priority", "enabled", "etag", "last_modified", "last_fetched")
+_KEY_FIELDS = {"feed": ("url", "feed_url", "xmlUrl"), "channel": ("channel_id", "id", "url")}
+_TOP_SEEN_FIELDS = ("seen", "seen_items", "seen_urls", "processed", "processed_videos", "history")
+_SOURCE_SEEN_FIELDS = ("seen", "seen_items", "seen_urls", "processed", "processed_videos")
+_FETCHED_FIELDS = ("last_fetched", "last_checked", "last_run", "last_updated")
+
+
+@dataclass
+class Source:
+    """A feed or channel the catchup skills follow."""
+
+    id: int
+    kind: str
+    key: str
+    name: str = ""
+    category: str | None = None
+    priority: str | None = None
+    enabled: bool = True
+    etag: str | None = None
+    last_modified: str | None = None
+    last_fetched: float | None = None
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    def to_config(self) -> dict[str, Any]:
+        """The entry as it would appear in ``feeds.json`` / ``channels.json``."""
+        key_field = "url" if self.kind == "feed" else "channel_id"
+        out: dict[str, Any] = {"name": self.name, key_field: self.key}
+        if self.category:
+            out["category"] = self.category
+        if self.priority:
+            out["priority"] = self.priority
+        if not self.enabled:
+            out["enabled"] = False
+        out.update(self.extra)
+        return out
+
+
+class SeenStore:
+    """Source config plus seen-item hashes in a single SQLite file.
+
+    The connection runs in WAL mode, so a crash mid-run can lose at most the
+    last uncommitted batch and never corrupts earlier history.
+    """
+
+    def __init__(self, path: str | Path = paths.CATCHUP_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "SeenStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # -- sources --------------------------------------------------------
+
+    def upsert_source(self, kind: str, key: str, **fields: Any) -> Source:
+        """Insert or update a source; unknown fields go into ``extra``."""
+        if kind not in KINDS:
+            raise ValueError(f"unknown source kind {kind!r}; expected one of {KINDS}")
+        cols = {k: fields.pop(k) for k in _COLUMNS if k in fields}
+        if "enabled" in cols:
+            cols["enabled"] = int(bool(cols["enabled"]))
+        row = self.db.execute("SELECT extra FROM sources WHERE kind=? AND key=?", (kind, key)).fetchone()
+        extra = json.loads(row["extra"]) if row else {}
+        extra.update(fields)
+        cols["extra"] = json.dumps(extra, sort_keys=True)
+        names = ", ".join(cols)
+        marks = ", ".join("?" for _ in cols)
+        updates = ", ".join(f"{c}=excluded.{c}" for c in cols)
+        self.db.execute(
+            f"INSERT INTO sources (kind, key, {names}) VALUES (?, ?, {marks}) "
+            f"ON CONFLICT (kind, key) DO UPDATE SET {updates}",
+            (kind, key, *cols.values()),
+        )
+        source = self.source(kind, key)
+        assert source is not None
+        return source
+
+    def source(self, kind: str, key: str) -> Source | None:
+        row = self.db.execute("SELECT * FROM sources WHERE kind=? AND key=?", (kind, key)).fetchone()
+        return _source(row) if row else None
+
+    def sources(self, kind: str | None = None, *, enabled_only: bool = True) -> list[Source]:
+        """Sources of ``kind`` (or all), ``priority: high`` first."""
+        sql = "SELECT * FROM sources WHERE 1=1"
+        args: list[Any] = []
+        if kind:
+            sql += " AND kind=?"
+            args.append(kind)
+        if enabled_only:
+            sql += " AND enabled=1"
+        sql += " ORDER BY CASE priority WHEN 'high' THEN 0 WHEN 'low' THEN 2 ELSE 1 END, name"
+        return [_source(r) for r in self.db.execute(sql, args)]
+
+    def remove_source(self, kind: str, key: str, *, forget_items: bool = False) -> bool:
+        source = self.source(kind, key)
+        if source is None:
+            return False
+        with self.transaction():
+            if forget_items:
+                self.db.execute("DELETE FROM seen WHERE source_id=?", (source.id,))
+            self.db.execute("DELETE FROM pending_fetch WHERE source_id=?", (source.id,))
+            self.db.execute("DELETE FROM sources WHERE id=?", (source.id,))
+        return True
+
+    def record_fetch(self, source_id: int, *, etag: str | None = None, last_modified: str | None = None,
+                     fetched_at: float | None = None, pending: Iterable[Iterable[str]] = ()) -> None:
+        """Store the validators from the latest fetch of a source.
+
+        ``pending`` holds the identifiers of each unseen item the fetch
+        returned. Until all of them are marked seen, the validators are
+        held back and the previous ones stay in use, so an interrupted run
+        gets the same items again instead of a ``304``. ``None``
+        validators keep the previous value, so a server that stops sending
+        one doesn't wipe out a still-usable validator.
+        """
+        items = [[item_hash(i).hex() for i in ids if i] for ids in pending]
+        with self.transaction():
+            self.db.execute("UPDATE sources SET last_fetched=? WHERE id=?",
+                            (time.time() if fetched_at is None else fetched_at, source_id))
+            self.db.execute("DELETE FROM pending_fetch WHERE source_id=?", (source_id,))
+            if any(items):
+                self.db.execute("INSERT INTO pending_fetch VALUES (?, ?, ?, ?)",
+                                (source_id, etag, last_modified, json.dumps(items)))
+            else:
+                self._set_validators(source_id, etag, last_modified)
+
+    def _set_validators(self, source_id: int, etag: str | None, last_modified: str | None) -> None:
+        self.db.execute("UPDATE sources SET etag=COALESCE(?, etag), last_modified=COALESCE(?, last_modified) "
+                        "WHERE id=?", (etag, last_modified, source_id))
+
+    def _settle(self, source_id: int) -> bool:
+        """Adopt a source's held-back validators once its items are all seen."""
+        row = self.db.execute("SELECT * FROM pending_fetch WHERE source_id=?", (source_id,)).fetchone()
+        if row is None:
+            return False
+        for hashes in json.loads(row["items"]):
+            if hashes and not any(self.db.execute("SELECT 1 FROM seen WHERE hash=?", (bytes.fromhex(h),)).fetchone()
+                                  for h in hashes):
+                return False
+        self._set_validators(source_id, row["etag"], row["last_modified"])
+        self.db.execute("DELETE FROM pending_fetch WHERE source_id=?", (source_id,))
+        return True
+
+    # -- seen items -----------------------------------------------------
+
+    def __contains__(self, identifier: str) -> bool:
+        return self.db.execute("SELECT 1 FROM seen WHERE hash=?", (item_hash(identifier),)).fetchone() is not None
+
+    def is_seen(self, *identifiers: str) -> bool:
+        """True if any of an item's identifiers (GUID, link, ...) was seen."""
+        return any(i in self for i in identifiers if i)
+
+    def unseen(self, identifiers: Iterable[str]) -> list[str]:
+        """The subset of ``identifiers`` not seen yet, in input order."""
+        return [i for i in identifiers if i and i not in self]
+
+    def mark_seen(self, identifiers: Iterable[str], source_id: int | None = None,
+                  *, seen_at: float | None = None) -> int:
+        """Record identifiers as seen in one transaction; returns rows added.
+
+        With ``source_id``, the source's held-back validators (see
+        ``record_fetch``) are adopted once the last of its items is seen.
+        """
+        now = time.time() if seen_at is None else seen_at
+        rows = [(item_hash(i), source_id, now) for i in identifiers if i]
+        with self.transaction():
+            before = self.db.total_changes
+            self.db.executemany("INSERT OR IGNORE INTO seen (hash, source_id, seen_at) VALUES (?, ?, ?)", rows)
+            added = self.db.total_changes - before
+            if source_id is not None:
+                self._settle(source_id)
+            return added
+
+    def count_seen(self, source_id: int | None = None) -> int:
+        if source_id is None:
+            return self.db.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+        return self.db.execute("SELECT COUNT(*) FROM seen WHERE source_id=?", (source_id,)).fetchone()[0]
+
+    def prune(self, older_than_days: float) -> int:
+        """Forget items seen more than ``older_than_days`` ago."""
+        cutoff = time.time() - older_than_days * 86400
+        return self.db.execute("DELETE FROM seen WHERE seen_at < ?", (cutoff,)).rowcount
+
+    def transaction(self) -> "_Transaction":
+        return _Transaction(self.db)
+
+    # -- JSON interop ---------------------------------------------------
+
+    def migrate_json(self, path: str | Path, kind: str) -> tuple[int, int]:
+        """Import a legacy ``feeds.json`` / ``channels.json``.
+
+        Accepts the documented ``{"feeds": [...]}`` / ``{"channels": [...]}``
+        layout along with the seen-history shapes older skill versions wrote:
+        a top-level list of URLs/IDs, or per-source ``seen`` lists and
+        ``last_checked`` timestamps. Safe to run more than once. Returns
+        ``(sources, items)`` imported.
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        entries = data.get(kind + "s", []) if isinstance(data, dict) else data
+        n_sources = n_items = 0
+        with self.transaction():
+            for entry in entries:
+                entry = dict(entry)
+                key = next((entry.pop(f) for f in _KEY_FIELDS[kind] if entry.get(f)), None)
+                if key is None:
+                    continue
+                seen = [x for f in _SOURCE_SEEN_FIELDS for x in _as_ids(entry.pop(f, None))]
+                fetched = next((entry.pop(f) for f in _FETCHED_FIELDS if f in entry), None)
+                if fetched is not None:
+                    entry["last_fetched"] = _timestamp(fetched)
+                source = self.upsert_source(kind, key, **entry)
+                n_sources += 1
+                n_items += self.mark_seen(seen, source.id)
+            if isinstance(data, dict):
+                top = [x for f in _TOP_SEEN_FIELDS for x in _as_ids(data.get(f))]
+                n_items += self.mark_seen(top)
+        return n_sources, n_items
+
+    def export_config(self, kind: str) -> dict[str, Any]:
+        """Source config in the JSON layout the skills document (no history)."""
+        return {kind + "s": [s.to_config() for s in self.sources(kind, enabled_only=False)]}
+
+
+class _Transaction:
+    """``BEGIN``/``COMMIT`` around a block; nested uses join the outer one."""
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+        self.owner = False
+
+    def __enter__(self) -> sqlite3.Connection:
+        if not self.db.in_transaction:
+            self.db.execute("BEGIN")
+            self.owner = True
+        return self.db
+
+    def __exit__(self, exc_type: object, *exc: object) -> None:
+        if self.owner:
+            self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+def _source(row: sqlite3.Row) -> Source:
+    return Source(
+        id=row["id"], kind=row["kind"], key=row["key"], name=row["name"],
+        category=row["category"], priority=row["priority"], enabled=bool(row["enabled"]),
+        etag=row["etag"], last_modified=row["last_modified"], last_fetched=row["last_fetched"],
+        extra=json.loads(row["extra"]),
+    )
+
+
+def _as_ids(value: Any) -> Iterator[str]:
+    """Flatten the assorted seen-history shapes into identifier strings."""
+    if not value:
+        return
+    if isinstance(value, dict):
+        # {"<url or id>": <timestamp or metadata>}
+        yield from (str(k) for k in value)
+        return
+    for item in value:
+        if isinstance(item, str):
+            yield item
+        elif isinstance(item, dict):
+            for f in ("guid", "id", "video_id", "url", "link"):
+                if item.get(f):
+                    yield str(item[f])
+
+
+def _timestamp(value: Any) -> float | None:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        from datetime import datetime
+
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+# -- CLI ----------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="lifemgr seen", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", default=str(paths.CATCHUP_DB), help="store path (default: %(default)s)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("migrate", help="import feeds.json / channels.json")
+    p.add_argument("--feeds", default=str(paths.FEEDS_JSON))
+    p.add_argument("--channels", default=str(paths.CHANNELS_JSON))
+
+    p = sub.add_parser("sources", help="list sources as JSON")
+    p.add_argument("--kind", choices=KINDS)
+    p.add_argument("--all", action="store_true", help="include disabled sources")
+
+    p = sub.add_parser("add-source", help="add or update a source")
+    p.add_argument("kind", choices=KINDS)
+    p.add_argument("key", help="feed URL or channel ID")
+    p.add_argument("--name", default="")
+    p.add_argument("--category")
+    p.add_argument("--priority", choices=("high", "medium", "low"))
+
+    p = sub.add_parser("remove-source", help="stop following a source")
+    p.add_argument("kind", choices=KINDS)
+    p.add_argument("key")
+    p.add_argument("--forget-items", action="store_true")
+
+    p = sub.add_parser("unseen", help="print the identifiers not seen yet")
+    p.add_argument("ids", nargs="*", help="GUIDs/URLs (default: one per line on stdin)")
+
+    p = sub.add_parser("mark", help="record identifiers as seen")
+    p.add_argument("--source", help="feed URL or channel ID the items came from")
+    p.add_argument("--kind", choices=KINDS, default="feed")
+    p.add_argument("ids", nargs="*", help="GUIDs/URLs (default: one per line on stdin)")
+
+    p = sub.add_parser("export", help="print source config in the legacy JSON layout")
+    p.add_argument("kind", choices=KINDS)
+
+    sub.add_parser("stats", help="source and item counts")
+
+    args = parser.parse_args(argv)
+    with SeenStore(args.db) as store:
+        if args.cmd == "migrate":
+            for kind, path in (("feed", args.feeds), ("channel", args.channels)):
+                if Path(path).exists():
+                    n_sources, n_items = store.migrate_json(path, kind)
+                    print(f"{path}: {n_sources} {kind}s, {n_items} seen items")
+                else:
+                    print(f"{path}: not found, skipped")
+        elif args.cmd == "sources":
+            kinds = [args.kind] if args.kind else list(KINDS)
+            out = {k + "s": [s.to_config() | {"etag": s.etag, "last_modified": s.last_modified,
+                                              "last_fetched": s.last_fetched}
+                             for s in store.sources(k, enabled_only=not args.all)]
+                   for k in kinds}
+            json.dump(out, sys.stdout, indent=2)
+            print()
+        elif args.cmd == "add-source":
+            store.upsert_source(args.kind, args.key, name=args.name or args.key,
+                                **{k: v for k, v in (("category", args.category),
+                                                     ("priority", args.priority)) if v})
+        elif args.cmd == "remove-source":
+            if not store.remove_source(args.kind, args.key, forget_items=args.forget_items):
+                print(f"no such {args.kind}: {args.key}", file=sys.stderr)
+                return 1
+        elif args.cmd == "unseen":
+            for ident in store.unseen(_ids(args.ids)):
+                print(ident)
+        elif args.cmd == "mark":
+            source_id = None
+            if args.source:
+                source = store.source(args.kind, args.source)
+                if source is None:
+                    print(f"no such {args.kind}: {args.source}", file=sys.stderr)
+                    return 1
+                source_id = source.id
+            print(store.mark_seen(_ids(args.ids), source_id))
+        elif args.cmd == "export":
+            json.dump(store.export_config(args.kind), sys.stdout, indent=2)
+            print()
+        elif args.cmd == "stats":
+            for kind in KINDS:
+                print(f"{kind}s: {len(store.sources(kind, enabled_only=False))}")
+            print(f"seen items: {store.count_seen()}")
+    return 0
+
+
+def _ids(args: list[str]) -> list[str]:
+    return args or [line.strip() for line in sys.stdin if line.strip()]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
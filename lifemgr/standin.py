@@ -0,0 +1,210 @@
+"""Local HTTP stand-in server and fixture corpus for offline runs.
+
+Serves files from a directory over keep-alive HTTP/1.1 with ETag and
+Last-Modified validators, answering conditional requests with ``304``.
+An optional per-request latency makes it behave like a slow remote host.
+Used by the benchmarks and for trying the catchup pipeline without the
+network::
+
+    python -m lifemgr standin DIR [--port 8000] [--latency 0.05]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+from xml.sax.saxutils import escape
+
+
+class StandinServer:
+    """Serve ``root`` on ``127.0.0.1`` from a background thread.
+
+    Use as a context manager; ``url(path)`` builds URLs against the bound
+    port. ``requests`` counts requests by status code.
+    """
+
+    def __init__(self, root: str | Path, *, port: int = 0, latency: float = 0.0):
+        self.root = Path(root).resolve()
+        self.latency = latency
+        self.requests: dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), _handler(self))
+        self.httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int:
+        return self.httpd.server_address[1]
+
+    def url(self, path: str = "") -> str:
+        return f"http://127.0.0.1:{self.port}/{path.lstrip('/')}"
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _count(self, status: int) -> None:
+        with self._lock:
+            self.requests[status] = self.requests.get(status, 0) + 1
+
+
+def _handler(server: StandinServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            if server.latency:
+                time.sleep(server.latency)
+            path = (server.root / unquote(urlsplit(self.path).path).lstrip("/")).resolve()
+            if not path.is_file() or server.root not in path.parents:
+                self._reply(404, b"not found\n", "text/plain")
+                return
+            body = path.read_bytes()
+            mtime = int(path.stat().st_mtime)
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+            headers = {"ETag": etag, "Last-Modified": formatdate(mtime, usegmt=True)}
+            if self._not_modified(etag, mtime):
+                self._reply(304, b"", None, headers)
+                return
+            ctype = "application/xml" if path.suffix in (".xml", ".rss", ".atom") else "text/plain; charset=utf-8"
+            self._reply(200, body, ctype, headers)
+
+        def _not_modified(self, etag: str, mtime: int) -> bool:
+            if inm := self.headers.get("If-None-Match"):
+                return etag in (t.strip() for t in inm.split(","))
+            if ims := self.headers.get("If-Modified-Since"):
+                try:
+                    return mtime <= parsedate_to_datetime(ims).timestamp()
+                except (TypeError, ValueError):
+                    return False
+            return False
+
+        def _reply(self, status: int, body: bytes, ctype: str | None,
+                   headers: dict[str, str] | None = None) -> None:
+            server._count(status)
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            if ctype:
+                self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    return Handler
+
+
+def write_feed_corpus(root: str | Path, n_feeds: int, items_per_feed: int = 20,
+                      *, body_chars: int = 800) -> list[Path]:
+    """Write ``n_feeds`` fixture feeds (alternating RSS 2.0 and Atom)."""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    filler = escape(("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20)[:body_chars])
+    written = []
+    for f in range(n_feeds):
+        if f % 2 == 0:
+            items = "".join(
+                f"<item><title>Feed {f} post {i}</title><link>https://feed{f}.example/p/{i}</link>"
+                f"<guid>https://feed{f}.example/p/{i}</guid>"
+                f"<pubDate>Mon, 0{1 + i % 9} Jun 2026 12:00:00 GMT</pubDate>"
+                f"<description>{filler}</description></item>"
+                for i in range(items_per_feed))
+            doc = f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed {f}</title>{items}</channel></rss>'
+            path = root / f"feed{f}.rss"
+        else:
+            items = "".join(
+                f'<entry><title>Feed {f} post {i}</title><link href="https://feed{f}.example/p/{i}"/>'
+                f"<id>tag:feed{f}.example,2026:{i}</id><updated>2026-06-0{1 + i % 9}T12:00:00Z</updated>"
+                f"<summary>{filler}</summary></entry>"
+                for i in range(items_per_feed))
+            doc = (f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">'
+                   f"<title>Feed {f}</title>{items}</feed>")
+            path = root / f"feed{f}.atom"
+        path.write_text(doc, encoding="utf-8")
+        written.append(path)
+    return written
+
+
+def write_video_corpus(root: str | Path, n_channels: int, videos_per_channel: int = 5,
+                       *, minutes: int = 20) -> list[str]:
+    """Write YouTube-style channel feeds and WebVTT transcripts; returns channel IDs.
+
+    Feeds go to ``channels/<channel_id>.xml`` and transcripts to
+    ``transcripts/<video_id>.vtt``, one five-second cue per line of text.
+    """
+    root = Path(root)
+    (root / "channels").mkdir(parents=True, exist_ok=True)
+    (root / "transcripts").mkdir(parents=True, exist_ok=True)
+    sentence = "so the next thing we want to look at is how the pieces fit together."
+    cues = "".join(
+        f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}.000 --> "
+        f"{(s + 5) // 3600:02d}:{(s + 5) // 60 % 60:02d}:{(s + 5) % 60:02d}.000\n"
+        f"Point {s // 5}, {sentence}\n\n"
+        for s in range(0, minutes * 60, 5))
+    transcript = "WEBVTT\nKind: captions\nLanguage: en\n\n" + cues
+    channel_ids = []
+    for c in range(n_channels):
+        channel_id = f"UCstandin{c:015d}"
+        entries = []
+        for v in range(videos_per_channel):
+            video_id = f"c{c:03d}v{v:06d}"
+            entries.append(
+                f"<entry><id>yt:video:{video_id}</id><yt:videoId>{video_id}</yt:videoId>"
+                f"<title>Channel {c} video {v}</title>"
+                f'<link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>'
+                f"<author><name>Channel {c}</name></author>"
+                f"<published>2026-06-{1 + v % 28:02d}T12:00:00+00:00</published></entry>")
+            (root / "transcripts" / f"{video_id}.vtt").write_text(transcript, encoding="utf-8")
+        doc = ('<?xml version="1.0"?><feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" '
+               f'xmlns="http://www.w3.org/2005/Atom"><title>Channel {c}</title>{"".join(entries)}</feed>')
+        (root / "channels" / f"{channel_id}.xml").write_text(doc, encoding="utf-8")
+        channel_ids.append(channel_id)
+    return channel_ids
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="lifemgr standin", description=__doc__.split("\n\n")[0])
+    parser.add_argument("root", help="directory to serve")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to sleep per request")
+    parser.add_argument("--feeds", type=int, default=0, help="write this many fixture feeds into ROOT first")
+    parser.add_argument("--channels", type=int, default=0,
+                        help="write this many fixture channels and their transcripts into ROOT first")
+    args = parser.parse_args(argv)
+    if args.feeds:
+        write_feed_corpus(args.root, args.feeds)
+    if args.channels:
+        write_video_corpus(args.root, args.channels)
+    server = StandinServer(args.root, port=args.port, latency=args.latency)
+    print(f"serving {server.root} at {server.url()}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,602 @@
+"""Compiled note templates and batched note writing.
+
+``/good-morning``, ``/issue``, ``/plan`` and project scaffolding all start
+from a template: the vault's ``Daily Template.md``, ``shared/templates/pm``
+and ``shared/templates/idea-minimal``. ``load`` parses a template once into
+literal text and typed fields, and keeps it until the file's mtime or
+size changes:
+
+- every frontmatter key is a field typed by its default value; a trailing
+  ``# a | b | c`` comment lists the values it accepts
+- ``TODO: ...`` values are placeholders, ``YYYY-MM-DD`` is the date and
+  ``###`` is the issue number, in the frontmatter and in the body
+- in headings, ``[Label]`` and ``TODO Label`` are text fields
+  (``[Idea Name]`` fills from ``idea``, ``[Bug Title]`` from ``title``)
+- Obsidian's ``{{date}}``, ``{{date:dddd, MMMM D}}``, ``{{time}}`` and
+  ``{{title}}``
+
+Fenced code blocks are copied as they are, so the WORKLOG entry template
+keeps its ``### YYYY-MM-DD HH:MM`` heading. Placeholders nobody fills in
+keep their text, so ``TODO:`` still marks what is left to write.
+
+New issue numbers come from a counter seeded from the ``query`` issue
+index, not from listing ``issues/``, and ``write_batch`` writes many
+rendered notes in one pass, each atomically::
+
+    python -m lifemgr template fields shared/templates/pm/issues/BUG-template.md
+    python -m lifemgr template issue acme --kind bug --title "Login fails" --plan --worklog
+    python -m lifemgr template scaffold ideas/acme --idea "Acme"
+    python -m lifemgr template daily [--date 2026-10-18]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Sequence
+
+from . import frontmatter, paths, query
+from .capture import CaptureIndex
+
+PM_TEMPLATES = paths.TEMPLATES_DIR / "pm"
+IDEA_TEMPLATE = paths.TEMPLATES_DIR / "idea-minimal"
+DAILY_TEMPLATE = paths.VAULT_DIR / "09 System" / "Templates" / "Daily Template.md"
+ISSUE_KINDS = ("task", "bug", "spike")
+#: Files in a project template that describe the template itself.
+TEMPLATE_DOCS = ("TEMPLATE-USAGE.md",)
+
+_KEY = re.compile(r"^([A-Za-z_][\w-]*)\s*:(.*)$")
+_VALUE_COMMENT = re.compile(r"""^(\s*(?:"(?:[^"\\]|\\.)*"|'[^']*'|\[[^\]]*\]|[^#]*?))(\s+#.*)?$""")
+_OPTION = re.compile(r"^[\w.-]+$")
+_DATE_PLACEHOLDER = re.compile(r"^(?:TODO:\s*)?YYYY-MM-DD$")
+_NUMBER_PLACEHOLDER = re.compile(r"^(?:TODO:\s*)?###$")
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_INLINE = (r"(?P<obsidian>\{\{\s*(?P<otype>date|time|title)\s*(?::(?P<ofmt>[^}]*))?\}\})"
+           r"|(?P<date>(?:TODO:\s*)?YYYY-MM-DD)"
+           r"|(?P<number>(?:TODO:\s*)?(?<!#)###(?!#))")
+_BODY = re.compile(_INLINE)
+_HEADING = re.compile(_INLINE + r"|(?:TODO:?\s+)?\[(?P<label>[^\]]+)\]|TODO:?\s+(?P<rest>[^\[\]#:]+?)[ \t]*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+#: Heading placeholder labels whose field isn't just the label slugified.
+_LABEL_FIELDS = {"project name": "idea", "idea name": "idea", "your name": "author"}
+_MOMENT = re.compile(r"\[[^\]]*\]|YYYY|YY|MMMM|MMM|MM|M|DD|Do|D|dddd|ddd|HH|H|hh|h|mm|ss|A|a")
+
+
+@dataclass(frozen=True)
+class Field:
+    """One fillable value in a template.
+
+    ``kind`` is ``text``, ``int``, ``float``, ``bool``, ``list``, ``date``,
+    ``time`` or ``number`` (a zero-padded issue number). ``placeholder``
+    is true when the default is a ``TODO:``/``YYYY-MM-DD``/``###`` marker
+    rather than a real value.
+    """
+
+    name: str
+    kind: str
+    default: Any = None
+    options: tuple[str, ...] = ()
+    placeholder: bool = False
+    format: str = ""
+
+    def coerce(self, value: Any) -> Any:
+        """``value`` converted to this field's type; ``ValueError`` if it doesn't fit."""
+        if self.kind == "number":
+            number = query.issue_number(value)
+            if number is None:
+                raise ValueError(f"{self.name}: not an issue number: {value!r}")
+            value = f"{int(number):03d}"
+        elif self.kind == "date":
+            if isinstance(value, datetime):
+                value = value.date()
+            value = value.isoformat() if isinstance(value, date) else date.fromisoformat(str(value)).isoformat()
+        elif self.kind == "list":
+            if isinstance(value, str):
+                value = [v.strip() for v in value.split(",") if v.strip()]
+            value = list(value)
+        elif self.kind == "bool":
+            value = value if isinstance(value, bool) else str(value).lower() in ("true", "yes", "1")
+        elif self.kind in ("int", "float"):
+            value = (int if self.kind == "int" else float)(value)
+        else:
+            value = str(value)
+        if self.options and str(value) not in self.options:
+            raise ValueError(f"{self.name}: {value!r} is not one of {' | '.join(self.options)}")
+        return value
+
+
+@dataclass
+class Context:
+    """What one ``render`` call fills in."""
+
+    values: Mapping[str, Any]
+    now: datetime
+    number: str | None
+
+    def value(self, field: Field) -> Any:
+        """The value for ``field``, or ``None`` to keep the template's text."""
+        if field.name in self.values and self.values[field.name] is not None:
+            return field.coerce(self.values[field.name])
+        if field.kind == "date" and field.placeholder:
+            return _moment(field.format, self.now) if field.format else self.now.date().isoformat()
+        if field.kind == "time":
+            return _moment(field.format or "HH:mm", self.now)
+        if field.kind == "number" and field.placeholder:
+            return self.number
+        return None
+
+
+class Template:
+    """A parsed template: frontmatter lines and body segments around ``Field``s."""
+
+    def __init__(self, text: str, path: str | Path | None = None):
+        self.path = Path(path) if path else None
+        self.fields: dict[str, Field] = {}
+        meta, body, body_line = frontmatter.split(text)
+        lines = text.splitlines(keepends=True)
+        head = lines[:body_line - 1] if meta else []
+        #: Frontmatter: literal text, inline fields, or ``(field, raw lines, comment)``.
+        self._meta: list[str | Field | tuple[Field, str, str]] = self._compile_meta(head, meta)
+        self._body: list[str | Field] = self._compile_body("".join(lines[len(head):]))
+
+    def _add(self, field: Field) -> Field:
+        """Register ``field`` (the first field of a name wins) and return it."""
+        self.fields.setdefault(field.name, field)
+        return field
+
+    def _compile_meta(self, head: list[str], meta: dict[str, Any]) -> list[str | Field | tuple[Field, str, str]]:
+        out: list[str | Field | tuple[Field, str, str]] = []
+        for line in head:
+            match = _KEY.match(line)
+            if "{{" in line:
+                # ``created: {{date}}``: substitute in place, keep the line as written.
+                out += self._compile_lines(line, _BODY)
+                continue
+            if not match or match.group(1) not in meta:
+                if out and isinstance(out[-1], tuple) and line.startswith((" ", "\t", "- ")):
+                    # Block list items belong to the key above them.
+                    field, raw, comment = out[-1]
+                    out[-1] = (field, raw + line, comment)
+                else:
+                    out.append(line)
+                continue
+            key, rest = match.group(1), match.group(2).rstrip("\r\n")
+            split = _VALUE_COMMENT.match(rest)
+            comment = (split.group(2) or "") if split else ""
+            options = tuple(o.strip() for o in comment.lstrip(" \t#").split("|"))
+            if len(options) < 2 or not all(_OPTION.match(o) for o in options):
+                options = ()
+            out.append((self._add(_meta_field(key, meta[key], options)), line, comment))
+        return out
+
+    def _compile_body(self, body: str) -> list[str | Field]:
+        out: list[str | Field] = []
+        fence = ""
+        for line in body.splitlines(keepends=True):
+            marker = _FENCE.match(line)
+            if fence or marker:
+                if marker and (not fence or marker.group(1) == fence):
+                    fence = "" if fence else marker.group(1)
+                out.append(line)
+            else:
+                out += self._compile_lines(line, _HEADING if line.startswith("#") else _BODY)
+        merged: list[str | Field] = []
+        for item in out:
+            if isinstance(item, str) and merged and isinstance(merged[-1], str):
+                merged[-1] += item
+            else:
+                merged.append(item)
+        return merged
+
+    def _compile_lines(self, line: str, pattern: re.Pattern[str]) -> list[str | Field]:
+        out: list[str | Field] = []
+        pos = 0
+        for match in pattern.finditer(line):
+            field = self._body_field(match, line)
+            if field is not None:
+                out += [line[pos:match.start()], field]
+                pos = match.end()
+        out.append(line[pos:])
+        return [item for item in out if item != ""]
+
+    def _body_field(self, match: re.Match[str], line: str) -> Field | None:
+        text = match.group()
+        if match.group("obsidian"):
+            kind = match.group("otype")
+            if kind == "title":
+                return self._add(Field("title", "text", text, placeholder=True))
+            fmt = (match.group("ofmt") or "").strip() or ("YYYY-MM-DD" if kind == "date" else "HH:mm")
+            return self._add(Field(kind, kind, text, placeholder=True, format=fmt))
+        if match.group("date"):
+            return self._add(Field("date", "date", text, placeholder=True))
+        if match.group("number"):
+            if not line[:match.start()].strip():
+                return None  # a ``###`` heading, not a number
+            return self._add(Field("number", "number", text, placeholder=True))
+        label = (match.group("label") or match.group("rest")).strip()
+        low = label.lower()
+        name = _LABEL_FIELDS.get(low) or ("title" if low == "title" or low.endswith(" title") else
+                                          re.sub(r"\W+", "_", low).strip("_"))
+        return self._add(Field(name, "text", text, placeholder=True))
+
+    def render(self, values: Mapping[str, Any] | None = None, *, now: datetime | None = None,
+               number: int | str | None = None) -> str:
+        """Fill in the template.
+
+        ``values`` maps field names to values (unknown names are ignored so
+        one mapping can render several templates); dates default to
+        ``now`` and ``###`` to ``number``. Raises ``ValueError`` for a
+        value of the wrong type or outside a field's options.
+        """
+        ctx = Context(values or {}, now or datetime.now(),
+                      None if number is None else Field("number", "number").coerce(number))
+        parts: list[str] = []
+        for item in self._meta:
+            if not isinstance(item, tuple):
+                parts.append(self._fill(item, ctx))
+                continue
+            field, raw, comment = item
+            value = ctx.value(field)
+            if value is None:
+                parts.append(raw)
+            else:
+                parts.append(f"{field.name}: {frontmatter.dump(value)}{comment}\n")
+        parts += (self._fill(item, ctx) for item in self._body)
+        return "".join(parts)
+
+    @staticmethod
+    def _fill(item: str | Field, ctx: Context) -> str:
+        if isinstance(item, str):
+            return item
+        value = ctx.value(item)
+        return item.default if value is None else str(value)
+
+
+def _meta_field(key: str, default: Any, options: tuple[str, ...]) -> Field:
+    if isinstance(default, bool):
+        kind = "bool"
+    elif isinstance(default, (int, float)):
+        kind = type(default).__name__
+    elif isinstance(default, list):
+        kind = "list"
+    elif isinstance(default, str) and (_DATE_PLACEHOLDER.match(default) or _ISO_DATE.match(default)):
+        kind = "date"
+    elif isinstance(default, str) and _NUMBER_PLACEHOLDER.match(default):
+        kind = "number"
+    else:
+        kind = "text"
+    items = default if isinstance(default, list) else [default]
+    placeholder = any(isinstance(v, str) and (v.startswith("TODO") or _DATE_PLACEHOLDER.match(v)
+                                              or _NUMBER_PLACEHOLDER.match(v)) for v in items)
+    return Field(key, kind, default, options, placeholder)
+
+
+def _moment(fmt: str, when: datetime) -> str:
+    """Format ``when`` with a moment.js pattern, as Obsidian's ``{{date:...}}`` does."""
+    def token(match: re.Match[str]) -> str:
+        t = match.group()
+        if t.startswith("["):
+            return t[1:-1]
+        day = when.day
+        suffix = "th" if 10 <= day % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(day % 10, "th")
+        return {"YYYY": f"{when.year:04d}", "YY": f"{when.year % 100:02d}", "MMMM": when.strftime("%B"),
+                "MMM": when.strftime("%b"), "MM": f"{when.month:02d}", "M": str(when.month),
+                "DD": f"{day:02d}", "Do": f"{day}{suffix}", "D": str(day), "dddd": when.strftime("%A"),
+                "ddd": when.strftime("%a"), "HH": f"{when.hour:02d}", "H": str(when.hour),
+                "hh": f"{(when.hour % 12) or 12:02d}", "h": str((when.hour % 12) or 12),
+                "mm": f"{when.minute:02d}", "ss": f"{when.second:02d}",
+                "A": "AM" if when.hour < 12 else "PM", "a": "am" if when.hour < 12 else "pm"}[t]
+    return _MOMENT.sub(token, fmt)
+
+
+# -- cache --------------------------------------------------------------
+
+_CACHE: dict[str, tuple[int, int, Template]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def load(path: str | Path) -> Template:
+    """The compiled template at ``path``, reparsed only when the file changed."""
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    with _CACHE_LOCK:
+        hit = _CACHE.get(key)
+    if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return hit[2]
+    template = Template(Path(key).read_text(encoding="utf-8"), key)
+    with _CACHE_LOCK:
+        _CACHE[key] = (st.st_mtime_ns, st.st_size, template)
+    return template
+
+
+# -- issue numbers ------------------------------------------------------
+
+NUMBERS_SCHEMA = "CREATE TABLE IF NOT EXISTS numbers (project TEXT PRIMARY KEY, last INTEGER NOT NULL)"
+
+
+class IssueNumbers:
+    """Allocates ``###`` issue numbers per project.
+
+    The next number is one past the larger of the highest issue in the
+    ``query`` index and the last number handed out here, so numbers
+    allocated but not yet written (or not yet indexed) are never reused.
+    Allocation is one ``BEGIN IMMEDIATE`` transaction, so concurrent
+    ``/issue`` runs get distinct numbers. The counter lives in the cache
+    directory; losing it only loses the not-yet-written reservations.
+    """
+
+    def __init__(self, ideas: str | Path = paths.ROOT / "ideas", db_path: str | Path | None = None):
+        self.ideas = Path(ideas)
+        self.db_path = Path(db_path) if db_path else paths.CACHE_DIR / "issue-numbers.db"
+        self.db = self._open()
+        self._highest: dict[str, tuple[float, int]] = {}
+
+    def _open(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            db = sqlite3.connect(self.db_path, isolation_level=None, timeout=30)
+            db.execute(NUMBERS_SCHEMA)
+        except sqlite3.DatabaseError:
+            # Corrupt file: it's only a cache, so start over.
+            self.db_path.unlink(missing_ok=True)
+            return self._open()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "IssueNumbers":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def highest(self, project: str) -> int:
+        """Highest issue number in ``project`` according to the index.
+
+        Read from the index's paths alone, and only again after the index
+        has been refreshed.
+        """
+        tbl = query.table(self.ideas, "*/issues/**/*.md")
+        hit = self._highest.get(project)
+        if hit is None or hit[0] != tbl.refreshed_at:
+            prefix = f"{project}/issues/"
+            found = (query.issue_number(rel[len(prefix):].split("/")[0]) for rel in tbl.paths if rel.startswith(prefix))
+            hit = self._highest[project] = (tbl.refreshed_at, max((int(n) for n in found if n), default=0))
+        return hit[1]
+
+    def allocate(self, project: str, n: int = 1) -> list[int]:
+        """Reserve ``n`` consecutive numbers for ``project``."""
+        # Refreshing the index walks the filesystem; do it before taking
+        # the write lock so other allocators aren't kept waiting on it.
+        highest = self.highest(project)
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.db.execute("SELECT last FROM numbers WHERE project=?", (project,)).fetchone()
+            start = max(row[0] if row else 0, highest) + 1
+            self.db.execute("INSERT OR REPLACE INTO numbers VALUES (?, ?)", (project, start + n - 1))
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+        return list(range(start, start + n))
+
+
+# -- writing ------------------------------------------------------------
+
+
+def write_batch(notes: Iterable[tuple[str | Path, str]], *, exists: str = "rename",
+                index: CaptureIndex | None = None) -> list[Path | None]:
+    """Write rendered notes; returns where each one went (``None`` if skipped).
+
+    Each target directory is created and listed once for the whole batch
+    instead of once per note, and each note is written to a temporary file
+    and renamed into place. When a name is taken (on disk or earlier in the
+    batch), ``exists`` decides: ``rename`` to ``name (2).md``, ``skip`` or
+    ``replace``. Notes under ``index.root`` are added to that Capture index
+    in one transaction.
+    """
+    if exists not in ("rename", "skip", "replace"):
+        raise ValueError(f"exists must be rename, skip or replace, not {exists!r}")
+    listed: dict[Path, set[str]] = {}
+    written: list[Path | None] = []
+    for path, text in notes:
+        path = Path(path)
+        names = listed.get(path.parent)
+        if names is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            names = listed[path.parent] = set(os.listdir(path.parent))
+        if path.name in names and exists != "replace":
+            if exists == "skip":
+                written.append(None)
+                continue
+            n = 2
+            while f"{path.stem} ({n}){path.suffix}" in names:
+                n += 1
+            path = path.with_name(f"{path.stem} ({n}){path.suffix}")
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+        names.add(path.name)
+        written.append(path)
+    if index is not None:
+        index.add_many(p for p in written if p is not None and p.resolve().is_relative_to(index.root))
+    return written
+
+
+def slug(text: str, limit: int = 60) -> str:
+    """``"Login fails!"`` -> ``"login-fails"``, for folder names."""
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")[:limit].rstrip("-")
+
+
+def issue_notes(project: str, number: int, kind: str, values: Mapping[str, Any], *,
+                ideas: str | Path = paths.ROOT / "ideas", templates: str | Path = PM_TEMPLATES,
+                plan: bool = False, worklog: bool = False, now: datetime | None = None) -> list[tuple[Path, str]]:
+    """``(path, text)`` for one issue (and its PLAN/WORKLOG) in ``issues/NNN-slug/``."""
+    kind = kind.upper()
+    templates = Path(templates)
+    values = {"idea": project, **values}
+    folder = Path(ideas) / project / "issues" / f"{number:03d}-{slug(str(values.get('title') or kind))}"
+    notes = [(folder / f"{kind}-{number:03d}.md",
+              load(templates / "issues" / f"{kind}-template.md").render(values, now=now, number=number))]
+    if plan:
+        notes.append((folder / "PLAN.md", load(templates / "PLAN-template.md").render(
+            {"issue_type": kind.lower(), **values}, now=now, number=number)))
+    if worklog:
+        notes.append((folder / "WORKLOG.md", load(templates / "WORKLOG-template.md").render(values, now=now,
+                                                                                            number=number)))
+    return notes
+
+
+def new_issues(project: str, specs: Sequence[Mapping[str, Any]], *, ideas: str | Path = paths.ROOT / "ideas",
+               templates: str | Path = PM_TEMPLATES, plan: bool = False, worklog: bool = False,
+               numbers: IssueNumbers | None = None, now: datetime | None = None) -> list[Path]:
+    """Create one issue per spec (``kind`` plus field values) with fresh numbers.
+
+    All numbers are reserved in one transaction and all notes written in
+    one ``write_batch``; returns the issue notes' paths.
+    """
+    own = numbers is None
+    numbers = numbers or IssueNumbers(ideas)
+    try:
+        allocated = numbers.allocate(project, len(specs))
+    finally:
+        if own:
+            numbers.close()
+    notes: list[tuple[Path, str]] = []
+    firsts = []
+    for number, spec in zip(allocated, specs):
+        spec = dict(spec)
+        kind = str(spec.pop("kind", "task"))
+        if kind.lower() not in ISSUE_KINDS:
+            raise ValueError(f"kind must be one of {', '.join(ISSUE_KINDS)}, not {kind!r}")
+        firsts.append(len(notes))
+        notes += issue_notes(project, number, kind, spec, ideas=ideas, templates=templates,
+                             plan=plan, worklog=worklog, now=now)
+    written = write_batch(notes, exists="skip")
+    return [written[i] for i in firsts]
+
+
+def scaffold(dest: str | Path, values: Mapping[str, Any], *, template: str | Path = IDEA_TEMPLATE,
+             now: datetime | None = None) -> list[Path]:
+    """Render a project template folder into ``dest``; ``FileExistsError`` if it isn't empty."""
+    dest, template = Path(dest), Path(template)
+    if dest.exists() and any(dest.iterdir()):
+        raise FileExistsError(f"{dest} already exists and isn't empty")
+    notes: list[tuple[Path, str]] = []
+    for src in sorted(template.rglob("*")):
+        if not src.is_file() or src.name in TEMPLATE_DOCS:
+            continue
+        text = (load(src).render(values, now=now) if src.suffix == ".md"
+                else src.read_text(encoding="utf-8"))
+        notes.append((dest / src.relative_to(template), text))
+    return [p for p in write_batch(notes, exists="replace") if p]
+
+
+def daily(day: date | None = None, *, vault: str | Path = paths.VAULT_DIR, template: str | Path = DAILY_TEMPLATE,
+          folder: str = "02 Calendar") -> Path | None:
+    """Today's (or ``day``'s) daily note from the vault template; ``None`` if it exists."""
+    when = datetime.combine(day, datetime.now().time()) if day else datetime.now()
+    name = when.date().isoformat()
+    text = load(template).render({"title": name}, now=when)
+    return write_batch([(Path(vault) / folder / f"{name}.md", text)], exists="skip")[0]
+
+
+# -- CLI ----------------------------------------------------------------
+
+
+def _assignment(text: str) -> tuple[str, str]:
+    key, sep, value = text.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {text!r}")
+    return key.strip(), value
+
+
+def _now(text: str | None) -> datetime | None:
+    return datetime.combine(date.fromisoformat(text), datetime.now().time()) if text else None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="lifemgr template", description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    fill = argparse.ArgumentParser(add_help=False)
+    fill.add_argument("--set", dest="values", action="append", type=_assignment, default=[],
+                      metavar="KEY=VALUE", help="fill a field (repeatable)")
+    fill.add_argument("--date", help="date to fill in instead of today (YYYY-MM-DD)")
+
+    p = sub.add_parser("fields", help="list a template's fields as NAME KIND DEFAULT [OPTIONS]")
+    p.add_argument("template")
+
+    p = sub.add_parser("render", parents=[fill], help="render a template to stdout or a file")
+    p.add_argument("template")
+    p.add_argument("--number", help="issue number for ###")
+    p.add_argument("-o", "--output", help="write here (atomically) instead of stdout")
+
+    p = sub.add_parser("issue", parents=[fill], help="create the next-numbered issue in a project")
+    p.add_argument("project")
+    p.add_argument("--kind", choices=ISSUE_KINDS, default="task")
+    p.add_argument("--title", required=True)
+    p.add_argument("--plan", action="store_true", help="also create PLAN.md")
+    p.add_argument("--worklog", action="store_true", help="also create WORKLOG.md")
+    p.add_argument("--ideas", default=str(paths.ROOT / "ideas"))
+    p.add_argument("--templates", default=str(PM_TEMPLATES))
+
+    p = sub.add_parser("scaffold", parents=[fill], help="create a project folder from a template folder")
+    p.add_argument("dest")
+    p.add_argument("--idea", help="project name (fills idea, [Idea Name] and TODO: Project Name)")
+    p.add_argument("--template", default=str(IDEA_TEMPLATE))
+
+    p = sub.add_parser("daily", help="create the daily note from the vault's Daily Template")
+    p.add_argument("--date", help="day to create (default: today)")
+    p.add_argument("--vault", default=str(paths.VAULT_DIR))
+    p.add_argument("--template", help=f"default: {DAILY_TEMPLATE.relative_to(paths.VAULT_DIR)} in the vault")
+    p.add_argument("--folder", default="02 Calendar")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.cmd == "fields":
+            for field in load(args.template).fields.values():
+                default = frontmatter.dump(field.default) if field.default is not None else ""
+                print("\t".join([field.name, field.kind, default, " | ".join(field.options)]).rstrip())
+        elif args.cmd == "render":
+            text = load(args.template).render(dict(args.values), now=_now(args.date), number=args.number)
+            if args.output:
+                print(write_batch([(args.output, text)], exists="replace")[0])
+            else:
+                sys.stdout.write(text)
+        elif args.cmd == "issue":
+            spec = {**dict(args.values), "kind": args.kind, "title": args.title}
+            for path in new_issues(args.project, [spec], ideas=args.ideas, templates=args.templates,
+                                   plan=args.plan, worklog=args.worklog, now=_now(args.date)):
+                print(path)
+        elif args.cmd == "scaffold":
+            values = dict(args.values)
+            if args.idea:
+                values["idea"] = args.idea
+            for path in scaffold(args.dest, values, template=args.template, now=_now(args.date)):
+                print(path)
+        else:
+            template = args.template or Path(args.vault) / DAILY_TEMPLATE.relative_to(paths.VAULT_DIR)
+            day = date.fromisoformat(args.date) if args.date else None
+            path = daily(day, vault=args.vault, template=template, folder=args.folder)
+            if path is None:
+                print("daily note already exists", file=sys.stderr)
+            else:
+                print(path)
+    except (ValueError, OSError) as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
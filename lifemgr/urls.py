@@ -0,0 +1,83 @@
+"""URL normalization and hashing shared by the catchup stores."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+#: Query parameters that only carry tracking information.
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref", "ref_src", "source", "si", "feature",
+})
+TRACKING_PREFIXES = ("utm_", "_hs", "mkt_")
+#: Hosts where a name in ``TRACKING_PARAMS`` selects content and must be kept
+#: (``?ref=`` is the branch or tag on code forges).
+KEEP_PARAMS = {
+    "github.com": frozenset({"ref"}),
+    "gitlab.com": frozenset({"ref"}),
+    "bitbucket.org": frozenset({"ref"}),
+    "codeberg.org": frozenset({"ref"}),
+}
+
+
+def _is_tracking(key: str, host: str = "") -> bool:
+    key = key.lower()
+    if key in KEEP_PARAMS.get(host, ()):
+        return False
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PREFIXES)
+
+
+_YOUTUBE_HOSTS = frozenset({"youtube.com", "m.youtube.com", "music.youtube.com", "youtube-nocookie.com"})
+_YOUTUBE_PATHS = ("/shorts/", "/embed/", "/live/", "/v/")
+_VIDEO_ID = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
+
+def youtube_id(url: str) -> str | None:
+    """The 11-character video ID of a YouTube URL, or ``None``."""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower().removeprefix("www.")
+    candidate = None
+    if host == "youtu.be":
+        candidate = parts.path.strip("/").split("/")[0]
+    elif host in _YOUTUBE_HOSTS:
+        if parts.path.rstrip("/") == "/watch":
+            candidate = dict(parse_qsl(parts.query)).get("v")
+        else:
+            for prefix in _YOUTUBE_PATHS:
+                if parts.path.startswith(prefix):
+                    candidate = parts.path[len(prefix):].split("/")[0]
+                    break
+    return candidate if candidate and _VIDEO_ID.match(candidate) else None
+
+
+def normalize_url(url: str) -> str:
+    """Return a canonical form of ``url`` for equality checks.
+
+    Lowercases scheme and host, drops ``www.``, default ports, fragments,
+    trailing slashes and tracking parameters, and sorts what's left of the
+    query string. Every form of YouTube video link (``youtu.be``, shorts,
+    embeds, ``&t=`` offsets) collapses to ``https://youtube.com/watch?v=ID``.
+    Strings that aren't http(s) URLs are returned stripped.
+    """
+    url = url.strip()
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.netloc:
+        return url
+    if video := youtube_id(url):
+        return f"https://youtube.com/watch?v={video}"
+    host = (parts.hostname or "").lower().removeprefix("www.")
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or ""
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not _is_tracking(k, host))
+    # http and https almost always serve the same item; treat them as one.
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def item_hash(identifier: str) -> bytes:
+    """16-byte digest of a GUID or URL, normalizing URLs first."""
+    return hashlib.blake2b(normalize_url(identifier).encode("utf-8"), digest_size=16).digest()
@@ -0,0 +1,774 @@
+"""Staged transcript pipeline and transcript cache for the video skills.
+
+``/youtube-catchup`` runs discover -> fetch transcript -> chunk ->
+summarize -> write. Discovery, fetching and summarizing each have a
+bounded pool of worker threads, so one channel's feed can still be
+downloading while another video is being summarized; chunks are cut on
+demand by the summarize workers and notes are written by the caller.
+Work is queued by channel priority: ``priority: high`` channels are
+discovered, fetched and summarized first.
+
+Transcripts go into a compressed cache keyed by video ID
+(``.claude/cache/transcripts/``). ``/video-summarize`` reads from the same
+cache, so a video a catchup run already fetched is never downloaded
+again. Reading an entry bumps its mtime, and ``evict`` removes the
+least-recently-used entries once the cache is over its size limit.
+Transcripts are read back line by line and cut into word-bounded chunks
+as they're read, so a three-hour video is never held as one string::
+
+    python -m lifemgr videos catchup [--summarize CMD] [--write]
+    python -m lifemgr videos chunks URL [--words 1500]
+    python -m lifemgr videos transcript URL
+
+Without ``--summarize`` the catchup run stops after fetching. It prints
+one JSON line per new video with its chunk count, and the skill reads the
+chunks with ``videos chunks``. ``--summarize CMD`` pipes each chunk to a
+local command (for example ``ollama run llama3.2``) and ``--write`` then
+writes the Capture notes and marks the videos seen. A channel's feed
+validators are only kept once all of its new videos are marked, so a
+run without ``--write``, or one where a transcript failed, gets the
+same videos again next time instead of a ``304``.
+
+Transcripts come from ``--transcript-url`` (a URL template with
+``{video_id}`` that returns WebVTT or ``[h:mm:ss] text`` lines), or from
+the ``youtube-transcript-api`` package when it's installed. Point both
+templates at ``lifemgr standin`` to run everything offline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import codecs
+import gzip
+import http.client
+import itertools
+import json
+import os
+import queue
+import re
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from datetime import date
+from pathlib import Path
+from typing import IO, Callable, Iterable, Iterator
+from urllib.parse import urlsplit
+
+from . import frontmatter, paths
+from .capture import CaptureIndex
+from .feeds import ConnectionPool, FeedItem, FetchResult, body_chunks, fetch_feed
+from .seen import SeenStore, Source
+from .urls import youtube_id
+
+CACHE_DIR = paths.CACHE_DIR / "transcripts"
+#: Default cache size limit; ``evict`` trims least-recently-read entries beyond it.
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+CHANNEL_FEED = "https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+CHUNK_WORDS = 1500
+
+_RANK = {"high": 0, "low": 2}
+_VIDEO_ID = re.compile(r"^[\w-]{1,64}$")
+_CUE = re.compile(r"^(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})\s+-->")
+_STAMP = re.compile(r"^\[?(?:(\d+):)?(\d{1,2}):(\d{2})(?:[.,]\d+)?\]?\s+")
+_TAG = re.compile(r"<[^>]*>")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+
+#: One transcript line: start offset in seconds (if known) and its text.
+Line = tuple[float | None, str]
+
+
+class TranscriptError(Exception):
+    """A transcript couldn't be fetched (none published, HTTP error, ...)."""
+
+
+@dataclass
+class Video:
+    video_id: str
+    url: str
+    title: str = ""
+    channel: str = ""
+    published: str = ""
+    priority: str | None = None
+    source_id: int | None = None
+
+    @property
+    def rank(self) -> int:
+        return _RANK.get(self.priority or "", 1)
+
+    @classmethod
+    def from_item(cls, item: FeedItem, source: Source | None = None) -> "Video | None":
+        video_id = youtube_id(item.url) or item.guid.removeprefix("yt:video:")
+        if not _VIDEO_ID.match(video_id or ""):
+            return None
+        return cls(video_id, item.url or f"https://www.youtube.com/watch?v={video_id}", item.title,
+                   item.author or (source.name if source else ""), item.published,
+                   source.priority if source else None, source.id if source else None)
+
+
+@dataclass
+class Chunk:
+    index: int
+    start: float | None
+    words: int
+    text: str
+
+
+@dataclass
+class VideoResult:
+    video: Video
+    chunks: int = 0
+    #: ``(start, summary)`` per chunk, in order; empty when not summarizing.
+    parts: list[tuple[float | None, str]] = field(default_factory=list)
+    cached: bool = False
+    error: str | None = None
+    note: Path | None = None
+
+
+# -- cache ----------------------------------------------------------------
+
+
+class TranscriptCache:
+    """Gzipped transcripts in ``root/<id[:2]>/<id>.txt.gz``, one line per cue.
+
+    Entries are written to a temp file and renamed into place, so readers
+    never see a partial transcript and concurrent writers of the same video
+    can't corrupt each other.
+    """
+
+    def __init__(self, root: str | Path = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def path(self, video_id: str) -> Path:
+        if not _VIDEO_ID.match(video_id):
+            raise ValueError(f"invalid video id {video_id!r}")
+        return self.root / video_id[:2] / f"{video_id}.txt.gz"
+
+    def __contains__(self, video_id: str) -> bool:
+        return self.path(video_id).exists()
+
+    def lines(self, video_id: str) -> Iterator[Line]:
+        """Stream a cached transcript; raises ``KeyError`` when it isn't cached."""
+        path = self.path(video_id)
+        try:
+            fh = gzip.open(path, "rt", encoding="utf-8")
+        except FileNotFoundError:
+            raise KeyError(video_id) from None
+        with fh:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            for raw in fh:
+                start, _, text = raw.rstrip("\n").partition("\t")
+                yield (float(start) if start else None), text
+
+    @contextmanager
+    def writer(self, video_id: str) -> Iterator[IO[str]]:
+        """Text handle for a new entry; it only replaces the old one on success."""
+        path = self.path(video_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{video_id}.", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as gz, \
+                    codecs.getwriter("utf-8")(gz) as fh:
+                yield fh
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def put(self, video_id: str, lines: Iterable[Line]) -> int:
+        """Store a transcript from an iterable of lines; returns the line count."""
+        count = 0
+        with self.writer(video_id) as fh:
+            for start, text in lines:
+                fh.write(("" if start is None else f"{start:.1f}") + "\t" + text.replace("\n", " ") + "\n")
+                count += 1
+        return count
+
+    def entries(self) -> list[tuple[Path, int, float]]:
+        """``(path, size, last_read)`` for every entry."""
+        found = []
+        if not self.root.is_dir():
+            return found
+        for bucket in os.scandir(self.root):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.endswith(".txt.gz") and not entry.name.startswith("."):
+                    st = entry.stat()
+                    found.append((Path(entry.path), st.st_size, st.st_mtime))
+        return found
+
+    def evict(self, max_bytes: int | None = None) -> tuple[int, int]:
+        """Drop least-recently-read entries until under ``max_bytes``; returns ``(files, bytes)``."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = freed = 0
+        for path, size, _ in sorted(entries, key=lambda e: e[2]):
+            if total - freed <= limit:
+                break
+            path.unlink(missing_ok=True)
+            removed += 1
+            freed += size
+        return removed, freed
+
+
+# -- transcript sources -----------------------------------------------------
+
+
+def check_url_template(template: str, field: str) -> str:
+    """``template`` if it is an http(s) URL template using ``{field}``; ``ValueError`` otherwise."""
+    try:
+        urls = {template.format(**{field: x}) for x in ("a", "b")}
+    except (KeyError, IndexError, ValueError) as exc:
+        raise ValueError(f"bad URL template {template!r}: only {{{field}}} can be filled in") from exc
+    if len(urls) < 2:
+        raise ValueError(f"bad URL template {template!r}: missing {{{field}}}")
+    if urlsplit(urls.pop()).scheme not in ("http", "https"):
+        raise ValueError(f"bad URL template {template!r}: not an http(s) URL")
+    return template
+
+
+class HttpTranscripts:
+    """Fetch transcripts from a URL template such as ``http://host/{video_id}.vtt``."""
+
+    def __init__(self, url_template: str, pool: ConnectionPool | None = None):
+        self.url_template = check_url_template(url_template, "video_id")
+        self.pool = pool or ConnectionPool()
+
+    def __call__(self, video_id: str) -> Iterator[Line]:
+        parts = urlsplit(self.url_template.format(video_id=video_id))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        with self.pool.connection(parts.scheme, parts.netloc) as conn:
+            try:
+                conn.request("GET", target, headers={"Accept-Encoding": "gzip, deflate"})
+                resp = conn.getresponse()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                conn.close()
+                conn.request("GET", target, headers={"Accept-Encoding": "gzip, deflate"})
+                resp = conn.getresponse()
+            if resp.status != 200:
+                resp.read()
+                raise TranscriptError(f"HTTP {resp.status} {resp.reason}")
+            yield from parse_transcript(_text_lines(body_chunks(resp)))
+            if resp.will_close:
+                conn.close()
+
+
+def youtube_transcripts(languages: Iterable[str] = ("en",)) -> Callable[[str], Iterator[Line]]:
+    """Transcript source backed by the optional ``youtube-transcript-api`` package."""
+    try:
+        from youtube_transcript_api import YouTubeTranscriptApi
+    except ImportError:
+        raise TranscriptError("pass --transcript-url or install youtube-transcript-api") from None
+    languages = list(languages)
+
+    def fetch(video_id: str) -> Iterator[Line]:
+        try:
+            if hasattr(YouTubeTranscriptApi, "get_transcript"):  # < 1.0
+                snippets = YouTubeTranscriptApi.get_transcript(video_id, languages=languages)
+                rows = ((s["start"], s["text"]) for s in snippets)
+            else:
+                snippets = YouTubeTranscriptApi().fetch(video_id, languages=languages)
+                rows = ((s.start, s.text) for s in snippets)
+        except Exception as exc:  # the package raises a zoo of its own types
+            raise TranscriptError(f"{type(exc).__name__}: {exc}") from exc
+        for start, text in rows:
+            text = " ".join(text.split())
+            if text:
+                yield float(start), text
+
+    return fetch
+
+
+def _text_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *complete, pending = pending.split("\n")
+        yield from complete
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def parse_transcript(lines: Iterable[str]) -> Iterator[Line]:
+    """WebVTT or ``[h:mm:ss] text`` lines to ``(start, text)``, one line at a time.
+
+    Inline cue tags are stripped, and auto-caption lines repeated across
+    overlapping cues are only kept once.
+    """
+    start: float | None = None
+    previous = ""
+    in_header = False
+    for raw in lines:
+        line = raw.strip().lstrip("\ufeff")
+        if not line:
+            in_header = False
+            continue
+        if line.startswith(("WEBVTT", "NOTE", "STYLE", "REGION")):
+            in_header = True
+            continue
+        if in_header:
+            continue
+        if cue := _CUE.match(line):
+            h, m, s, ms = cue.groups()
+            start = int(h or 0) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
+            continue
+        if line.isdigit():
+            continue
+        if stamp := _STAMP.match(line):
+            h, m, s = stamp.groups()
+            start = int(h or 0) * 3600 + int(m) * 60 + int(s)
+            line = line[stamp.end():]
+        text = " ".join(_TAG.sub("", line).split())
+        if text and text != previous:
+            previous = text
+            yield start, text
+
+
+# -- chunking and summarizing ---------------------------------------------
+
+
+def chunk_transcript(lines: Iterable[Line], words: int = CHUNK_WORDS) -> Iterator[Chunk]:
+    """Cut a line stream into chunks of about ``words`` words.
+
+    Only the chunk being built is held in memory. A chunk closes at the
+    first sentence end past the target, or at 1.25x the target otherwise.
+    """
+    buf: list[str] = []
+    count = 0
+    start: float | None = None
+    index = 0
+    for line_start, text in lines:
+        if not buf:
+            start = line_start
+        buf.append(text)
+        count += len(text.split())
+        if count >= words * 1.25 or (count >= words and text.endswith((".", "!", "?"))):
+            yield Chunk(index, start, count, " ".join(buf))
+            index += 1
+            buf, count = [], 0
+    if buf:
+        yield Chunk(index, start, count, " ".join(buf))
+
+
+def excerpt(video: Video, chunk: Chunk, *, words: int = 60) -> str:
+    """Offline stand-in summarizer: the chunk's leading sentences."""
+    out: list[str] = []
+    n = 0
+    for sentence in _SENTENCE.split(chunk.text):
+        out.append(sentence)
+        n += len(sentence.split())
+        if n >= words:
+            break
+    return " ".join(out)
+
+
+def command_summarizer(command: str, *, timeout: float = 600.0) -> Callable[[Video, Chunk], str]:
+    """Summarize each chunk by piping a prompt to ``command`` and reading stdout."""
+    argv = shlex.split(command)
+
+    def summarize(video: Video, chunk: Chunk) -> str:
+        prompt = (f"Summarize part {chunk.index + 1} of the transcript of the YouTube video "
+                  f"\"{video.title}\" by {video.channel} as concise Markdown bullet points.\n\n{chunk.text}\n")
+        proc = subprocess.run(argv, input=prompt, capture_output=True, text=True, timeout=timeout)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{argv[0]} exited {proc.returncode}: {proc.stderr.strip()[:200]}")
+        return proc.stdout.strip()
+
+    return summarize
+
+
+# -- pipeline -------------------------------------------------------------
+
+
+class _Stage:
+    """Fixed pool of worker threads fed from a priority queue."""
+
+    def __init__(self, name: str, workers: int, on_error: Callable[[tuple, Exception], None]):
+        self.queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self.on_error = on_error
+        self.cancelled = False
+        self.threads = [threading.Thread(target=self._work, name=f"{name}-{i}", daemon=True)
+                        for i in range(max(1, workers))]
+        for t in self.threads:
+            t.start()
+
+    def submit(self, rank: tuple, fn: Callable[..., None], *args: object) -> None:
+        if not self.cancelled:
+            self.queue.put((rank, next(self._seq), fn, args))
+
+    def _work(self) -> None:
+        while True:
+            _, _, fn, args = self.queue.get()
+            if fn is None:
+                return
+            try:
+                fn(*args)
+            except Exception as exc:
+                # A job that dies silently would leave ``run`` waiting for its event forever.
+                self.on_error(args, exc)
+
+    def cancel(self) -> None:
+        """Drop queued work and refuse new work; running jobs still finish."""
+        self.cancelled = True
+        with self.queue.mutex:
+            self.queue.queue.clear()
+
+    def close(self) -> None:
+        for _ in self.threads:
+            self.queue.put(((float("inf"),), next(self._seq), None, ()))
+        for t in self.threads:
+            t.join()
+
+
+@dataclass
+class _Job:
+    video: Video
+    seq: int
+    total: int | None = None
+    parts: dict[int, tuple[float | None, str]] = field(default_factory=dict)
+    cached: bool = False
+    chunks: Iterator[Chunk] | None = None
+    pulled: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def rank(self) -> tuple[int, int]:
+        return (self.video.rank, self.seq)
+
+
+class TranscriptPipeline:
+    """Discover -> fetch -> chunk -> summarize, with results yielded to the caller.
+
+    The calling thread coordinates: it filters discovered videos through
+    ``accept``, records feed validators and receives finished videos, so
+    the SQLite stores are only ever touched from one thread. That thread
+    is also where the write stage runs. ``summarize`` may be ``None`` to
+    stop after fetching and chunking.
+
+    Chunks are pulled rather than pushed: each video has one "next chunk"
+    task queued at a time, and the summarize worker that takes it reads
+    the next chunk from the cache and queues the task again. Workers always
+    take the highest-priority video's next chunk, and at most one chunk per
+    worker is in memory.
+    """
+
+    def __init__(self, transcripts: Callable[[str], Iterable[Line]], cache: TranscriptCache,
+                 summarize: Callable[[Video, Chunk], str] | None = None, *,
+                 pool: ConnectionPool | None = None, feed_url: str = CHANNEL_FEED,
+                 discover_workers: int = 8, fetch_workers: int = 4, summarize_workers: int = 4,
+                 chunk_words: int = CHUNK_WORDS, max_items: int = 15):
+        self.transcripts = transcripts
+        self.cache = cache
+        self.summarize = summarize
+        self.pool = pool or ConnectionPool()
+        self.feed_url = check_url_template(feed_url, "channel_id")
+        self.workers = {"discover": discover_workers, "fetch": fetch_workers, "summarize": summarize_workers}
+        self.chunk_words = chunk_words
+        self.max_items = max_items
+
+    def run(self, sources: Iterable[Source] = (), videos: Iterable[Video] = (), *,
+            accept: Callable[[Video], bool] | None = None,
+            on_feed: Callable[[Source, FetchResult], None] | None = None) -> Iterator[VideoResult]:
+        """Process channel ``sources`` and explicit ``videos``; yields results as they finish."""
+        self._events: queue.Queue = queue.Queue()
+        stages = self._stages = {name: _Stage(name, n, self._failed) for name, n in self.workers.items()}
+        jobs: dict[str, _Job] = {}
+        seq = itertools.count()
+        feeds = 0
+
+        def start(video: Video) -> None:
+            if video.video_id in jobs or (accept and not accept(video)):
+                return
+            job = jobs[video.video_id] = _Job(video, next(seq))
+            stages["fetch"].submit(job.rank, self._fetch, job)
+
+        try:
+            for source in sources:
+                feeds += 1
+                stages["discover"].submit((_RANK.get(source.priority or "", 1), feeds), self._discover, source)
+            for video in videos:
+                start(video)
+            while feeds or jobs:
+                kind, *payload = self._events.get()
+                if kind == "feed":
+                    feeds -= 1
+                    source, result = payload
+                    if on_feed:
+                        on_feed(source, result)
+                    for item in result.items:
+                        if video := Video.from_item(item, source):
+                            start(video)
+                    continue
+                job = payload[0]
+                if jobs.get(job.video.video_id) is not job:
+                    continue  # already reported as failed
+                if kind == "error":
+                    del jobs[job.video.video_id]
+                    yield VideoResult(job.video, cached=job.cached, error=payload[1])
+                    continue
+                if kind == "chunked":
+                    job.total = payload[1]
+                elif kind == "summary":
+                    index, start_at, text = payload[1:]
+                    job.parts[index] = (start_at, text)
+                if job.total is not None and (self.summarize is None or len(job.parts) == job.total):
+                    del jobs[job.video.video_id]
+                    yield VideoResult(job.video, job.total, [job.parts[i] for i in sorted(job.parts)], job.cached)
+        finally:
+            # Drop queued work so an abandoned run shuts down promptly.
+            for stage in stages.values():
+                stage.cancel()
+            for stage in stages.values():
+                stage.close()
+
+    def _failed(self, args: tuple, exc: Exception) -> None:
+        """Report a job that raised, so the coordinator's counts still reach zero."""
+        error = f"{type(exc).__name__}: {exc}"
+        if isinstance(args[0], Source):
+            self._events.put(("feed", args[0], FetchResult(args[0], error=error)))
+        else:
+            self._events.put(("error", args[0], error))
+
+    def _discover(self, source: Source) -> None:
+        result = fetch_feed(replace(source, key=self.feed_url.format(channel_id=source.key)), self.pool,
+                            max_items=self.max_items)
+        self._events.put(("feed", source, result))
+
+    def _fetch(self, job: _Job) -> None:
+        video_id = job.video.video_id
+        try:
+            if video_id in self.cache:
+                job.cached = True
+            else:
+                self.cache.put(video_id, self.transcripts(video_id))
+            if self.summarize is not None:
+                self._stages["summarize"].submit(job.rank + (0,), self._summarize_next, job)
+                return
+            total = sum(1 for _ in chunk_transcript(self.cache.lines(video_id), self.chunk_words))
+        except Exception as exc:
+            self._events.put(("error", job, f"{type(exc).__name__}: {exc}"))
+            return
+        self._events.put(("chunked", job, total) if total else ("error", job, "empty transcript"))
+
+    def _summarize_next(self, job: _Job) -> None:
+        try:
+            with job.lock:
+                if job.chunks is None:
+                    job.chunks = chunk_transcript(self.cache.lines(job.video.video_id), self.chunk_words)
+                chunk = next(job.chunks, None)
+                job.pulled += chunk is not None
+        except Exception as exc:
+            self._events.put(("error", job, f"{type(exc).__name__}: {exc}"))
+            return
+        if chunk is None:
+            self._events.put(("chunked", job, job.pulled) if job.pulled else ("error", job, "empty transcript"))
+            return
+        self._stages["summarize"].submit(job.rank + (chunk.index + 1,), self._summarize_next, job)
+        try:
+            text = self.summarize(job.video, chunk)
+        except Exception as exc:
+            text = f"_(summary failed: {type(exc).__name__}: {exc})_"
+        self._events.put(("summary", job, chunk.index, chunk.start, text))
+
+
+# -- notes ----------------------------------------------------------------
+
+
+def clock(seconds: float | None) -> str:
+    if seconds is None:
+        return ""
+    s = int(seconds)
+    return f"{s // 3600}:{s // 60 % 60:02d}:{s % 60:02d}" if s >= 3600 else f"{s // 60}:{s % 60:02d}"
+
+
+def write_note(result: VideoResult, folder: str | Path = paths.CAPTURE_DIR, *, today: str | None = None) -> Path:
+    """Write a Capture note for a summarized video; returns its path."""
+    video = result.video
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    meta = {"title": video.title or video.video_id, "source": video.url, "channel": video.channel,
+            "published": video.published[:10], "created": today or date.today().isoformat(),
+            "type": "video", "tags": ["capture", "youtube"]}
+    lines = [frontmatter.render(meta), f"# {meta['title']}", ""]
+    for i, (start, text) in enumerate(result.parts):
+        if len(result.parts) > 1:
+            at = clock(start)
+            lines += [f"## Part {i + 1}" + (f" ({at})" if at else ""), ""]
+        lines += [text, ""]
+    stem = re.sub(r'[\\/:*?"<>|#^\[\]]+', "", meta["title"]).strip()[:120] or video.video_id
+    path = folder / f"{stem}.md"
+    if path.exists():
+        path = folder / f"{stem} ({video.video_id}).md"
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text("\n".join(lines), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+# -- CLI ----------------------------------------------------------------
+
+
+def _summarizer(spec: str | None) -> Callable[[Video, Chunk], str] | None:
+    if not spec:
+        return None
+    return excerpt if spec == "excerpt" else command_summarizer(spec)
+
+
+def _transcripts(args: argparse.Namespace, pool: ConnectionPool) -> Callable[[str], Iterable[Line]]:
+    if args.transcript_url:
+        return HttpTranscripts(args.transcript_url, pool)
+    return youtube_transcripts(args.lang.split(","))
+
+
+def _template(field: str) -> Callable[[str], str]:
+    def check(value: str) -> str:
+        try:
+            return check_url_template(value, field)
+        except ValueError as exc:
+            raise argparse.ArgumentTypeError(str(exc)) from None
+    return check
+
+
+def _video_arg(value: str) -> Video:
+    video_id = youtube_id(value) or value
+    if not _VIDEO_ID.match(video_id):
+        raise argparse.ArgumentTypeError(f"not a YouTube URL or video id: {value!r}")
+    return Video(video_id, f"https://www.youtube.com/watch?v={video_id}")
+
+
+def _result_json(result: VideoResult) -> str:
+    v = result.video
+    out = {"video_id": v.video_id, "url": v.url, "title": v.title, "channel": v.channel,
+           "published": v.published, "priority": v.priority, "chunks": result.chunks,
+           "cached": result.cached, "error": result.error}
+    if result.parts:
+        out["summary"] = [{"start": clock(s), "text": t} for s, t in result.parts]
+    if result.note:
+        out["note"] = str(result.note)
+    return json.dumps(out, ensure_ascii=False)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="lifemgr videos", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", default=str(paths.CATCHUP_DB), help="catchup store (default: %(default)s)")
+    parser.add_argument("--cache", default=str(CACHE_DIR), help="transcript cache (default: %(default)s)")
+    parser.add_argument("--cache-mb", type=int, default=CACHE_MAX_BYTES // 2**20, help="cache size limit")
+    parser.add_argument("--transcript-url", type=_template("video_id"), help="transcript URL template with {video_id}")
+    parser.add_argument("--lang", default="en", help="transcript languages for youtube-transcript-api")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("catchup", help="run the pipeline over followed channels, print JSON lines")
+    p.add_argument("--feed-url", default=CHANNEL_FEED, type=_template("channel_id"),
+                   help="channel feed URL template with {channel_id}")
+    p.add_argument("--summarize", metavar="CMD", help="command to pipe chunks to, or 'excerpt'")
+    p.add_argument("--write", action="store_true", help="write Capture notes and mark videos seen")
+    p.add_argument("--capture-dir", default=str(paths.CAPTURE_DIR))
+    p.add_argument("--max-items", type=int, default=15, help="feed entries read per channel")
+    p.add_argument("--words", type=int, default=CHUNK_WORDS, help="words per chunk")
+    p.add_argument("--fetch-workers", type=int, default=4)
+    p.add_argument("--summarize-workers", type=int, default=4)
+    p.add_argument("video", nargs="*", type=_video_arg, help="also process these URLs / IDs")
+
+    p = sub.add_parser("chunks", help="print a video's transcript chunks as JSON lines")
+    p.add_argument("video", type=_video_arg)
+    p.add_argument("--words", type=int, default=CHUNK_WORDS)
+
+    p = sub.add_parser("transcript", help="print a video's transcript")
+    p.add_argument("video", type=_video_arg)
+    p.add_argument("--timestamps", action="store_true")
+
+    p = sub.add_parser("cache", help="show cache size, optionally evict")
+    p.add_argument("--evict", action="store_true")
+    args = parser.parse_args(argv)
+
+    cache = TranscriptCache(args.cache, args.cache_mb * 2**20)
+    if args.cmd == "cache":
+        if args.evict:
+            removed, freed = cache.evict()
+            print(f"evicted {removed} transcripts ({freed / 2**20:.1f} MB)", file=sys.stderr)
+        entries = cache.entries()
+        print(json.dumps({"transcripts": len(entries), "bytes": sum(e[1] for e in entries),
+                          "limit": cache.max_bytes}))
+        return 0
+
+    pool = ConnectionPool()
+    try:
+        if args.cmd in ("chunks", "transcript"):
+            video_id = args.video.video_id
+            try:
+                if video_id not in cache:
+                    cache.put(video_id, _transcripts(args, pool)(video_id))
+            except TranscriptError as exc:
+                print(f"{video_id}: {exc}", file=sys.stderr)
+                return 1
+            if args.cmd == "chunks":
+                for chunk in chunk_transcript(cache.lines(video_id), args.words):
+                    print(json.dumps({"index": chunk.index, "start": clock(chunk.start), "words": chunk.words,
+                                      "text": chunk.text}, ensure_ascii=False))
+            else:
+                for start, text in cache.lines(video_id):
+                    print(f"[{clock(start)}] {text}" if args.timestamps and start is not None else text)
+            return 0
+        return _catchup(args, cache, pool)
+    finally:
+        pool.close()
+
+
+def _catchup(args: argparse.Namespace, cache: TranscriptCache, pool: ConnectionPool) -> int:
+    try:
+        transcripts = _transcripts(args, pool)
+    except TranscriptError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    pipeline = TranscriptPipeline(transcripts, cache, _summarizer(args.summarize), pool=pool,
+                                  feed_url=args.feed_url, fetch_workers=args.fetch_workers,
+                                  summarize_workers=args.summarize_workers, chunk_words=args.words,
+                                  max_items=args.max_items)
+    started = time.perf_counter()
+    done = failed = 0
+    with SeenStore(args.db) as store, CaptureIndex(args.capture_dir) as captured:
+        captured.refresh()
+
+        def accept(video: Video) -> bool:
+            ids = (video.video_id, video.url, f"yt:video:{video.video_id}")
+            return not store.is_seen(*ids) and bool(captured.unseen([video.url], refresh=False))
+
+        def on_feed(source: Source, result: FetchResult) -> None:
+            if result.ok:
+                # The validators are held back until these videos are written and marked seen.
+                new = [(v.video_id, v.url, f"yt:video:{v.video_id}") for item in result.items
+                       if (v := Video.from_item(item, source)) and accept(v)]
+                store.record_fetch(source.id, etag=result.etag, last_modified=result.last_modified, pending=new)
+            else:
+                print(f"{source.name or source.key}: {result.error}", file=sys.stderr)
+
+        for result in pipeline.run(store.sources("channel"), args.video, accept=accept, on_feed=on_feed):
+            if result.error:
+                failed += 1
+            elif args.write and result.parts:
+                result.note = write_note(result, args.capture_dir)
+                captured.add(result.note)
+                store.mark_seen([result.video.video_id, result.video.url], result.video.source_id)
+            done += 1
+            print(_result_json(result), flush=True)
+    removed, _ = cache.evict()
+    print(f"{done} videos, {failed} failed, {removed} transcripts evicted "
+          f"in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from lifemgr.capture import CaptureIndex
+
+
+def note(path, url, *, mtime=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f'---\ntitle: "{path.stem}"\nsource: "{url}"\n---\n\nSummary.\n', encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "Capture"
+    note(root / "2026" / "a.md", "https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+    note(root / "2026" / "b.md", "https://blog.example/p/1?utm_source=rss")
+    note(root / "top.md", "https://blog.example/p/top")
+    return root
+
+
+@pytest.fixture
+def index(tmp_path, root):
+    with CaptureIndex(root, tmp_path / "index.db") as index:
+        yield index
+
+
+def test_lookup_normalizes_urls(root, index):
+    found = index.lookup(["https://youtu.be/dQw4w9WgXcQ", "http://blog.example/p/1/", "https://new.example/"])
+    assert found == {"https://youtu.be/dQw4w9WgXcQ": str(root / "2026" / "a.md"),
+                     "http://blog.example/p/1/": str(root / "2026" / "b.md"), "https://new.example/": None}
+    assert index.count() == (3, 3)
+
+
+def test_refresh_sees_new_removed_and_edited_notes(root, index):
+    index.refresh()
+    note(root / "2026" / "c.md", "https://blog.example/p/2")
+    (root / "top.md").unlink()
+    assert index.unseen(["https://blog.example/p/2", "https://blog.example/p/top"]) == ["https://blog.example/p/top"]
+
+    # An in-place edit leaves the directory's mtime alone.
+    b = root / "2026" / "b.md"
+    dir_mtime = b.parent.stat().st_mtime_ns
+    note(b, "https://blog.example/p/edited", mtime=b.stat().st_mtime_ns + 10**9)
+    os.utime(b.parent, ns=(dir_mtime, dir_mtime))
+    assert index.refresh() == {"dirs": 0, "indexed": 1, "removed": 0}
+    assert index.unseen(["https://blog.example/p/1", "https://blog.example/p/edited"]) == ["https://blog.example/p/1"]
+
+
+def test_removed_folder_drops_its_notes(root, index):
+    index.refresh()
+    for path in (root / "2026").iterdir():
+        path.unlink()
+    (root / "2026").rmdir()
+    assert index.refresh()["removed"] == 2
+    assert index.count() == (1, 1)
+
+
+def test_add_many_rejects_notes_outside_the_root(tmp_path, root, index):
+    index.refresh()
+    inside = note(root / "2026" / "d.md", "https://blog.example/p/3")
+    outside = note(tmp_path / "elsewhere.md", "https://blog.example/p/4")
+    with pytest.raises(ValueError, match="elsewhere.md"):
+        index.add_many([inside, outside])
+    assert index.lookup(["https://blog.example/p/3"], refresh=False) == {"https://blog.example/p/3": None}
+    assert index.add_many([inside]) == [["https://blog.example/p/3"]]
+
+
+def test_rebuild_and_corrupt_index(tmp_path, root, index):
+    index.refresh()
+    assert index.rebuild()["indexed"] == 3
+    index.close()
+    (tmp_path / "index.db").write_bytes(b"not a database" * 100)
+    with CaptureIndex(root, tmp_path / "index.db") as again:
+        assert again.unseen(["https://blog.example/p/top"]) == []
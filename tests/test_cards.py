@@ -0,0 +1,165 @@
+import pytest
+
+from lifemgr import cards
+from lifemgr.cards import CardStore, parse_note
+
+NOTE = """---
+tags: [flashcards/rust]
+---
+
+What does `?` do::Propagates the error
+Borrow checker:::Enforces aliasing XOR mutation
+"""
+
+GO_NOTE = """---
+tags: [flashcards/go]
+---
+
+What does `defer` do::Runs a call when the function returns
+Goroutine:::A function running concurrently with others
+"""
+
+
+@pytest.fixture
+def store(tmp_path):
+    with CardStore(tmp_path / "cards.db") as store:
+        yield store
+
+
+def ids(store):
+    return {r[0]: r[1] for r in store.db.execute("SELECT id, source FROM cards")}
+
+
+def test_parse_note_reads_inline_and_reversed_cards():
+    cards = [nc.card for nc in parse_note(NOTE, "rust.md")]
+    assert [(c.deck, c.front) for c in cards] == [
+        ("rust", "What does `?` do"), ("rust", "Borrow checker"), ("rust", "Enforces aliasing XOR mutation")]
+    assert parse_note(NOTE.replace("flashcards/rust", "rust"), "rust.md") == []
+
+
+def test_deleted_note_loses_its_cards(tmp_path, store):
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    (vault / "rust.md").write_text(NOTE, encoding="utf-8")
+    (vault / "go.md").write_text(GO_NOTE, encoding="utf-8")
+    assert store.import_notes([vault])["cards"] == 6
+    card = next(i for i, source in ids(store).items() if source.endswith("rust.md"))
+    store.review(card, "good")
+
+    (vault / "rust.md").unlink()
+    stats = store.import_notes([vault])
+    assert stats["removed"] == 3
+    assert all(source.endswith("go.md") for source in ids(store).values())
+    assert [r[0] for r in store.db.execute("SELECT path FROM files")] == [str((vault / "go.md").resolve())]
+    assert len(store.history(card)) == 1
+
+
+def test_note_outside_the_imported_roots_is_kept(tmp_path, store):
+    for folder, text in (("a", NOTE), ("b", GO_NOTE)):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / f"{folder}.md").write_text(text, encoding="utf-8")
+    store.import_notes([tmp_path / "a", tmp_path / "b"])
+    assert store.import_notes([tmp_path / "a"])["removed"] == 0
+    assert len(ids(store)) == 6
+
+
+def test_moved_note_keeps_one_copy_of_its_cards(tmp_path, store):
+    (tmp_path / "old").mkdir()
+    (tmp_path / "new").mkdir()
+    (tmp_path / "old" / "rust.md").write_text(NOTE, encoding="utf-8")
+    store.import_notes([tmp_path])
+    (tmp_path / "old" / "rust.md").rename(tmp_path / "new" / "rust.md")
+    store.import_notes([tmp_path])
+    assert set(ids(store).values()) == {str((tmp_path / "new" / "rust.md").resolve())}
+
+
+def test_same_question_in_two_notes_is_two_cards(tmp_path, store):
+    for name in ("rust", "rust-again"):
+        (tmp_path / f"{name}.md").write_text(NOTE, encoding="utf-8")
+    store.import_notes([tmp_path])
+    assert len(ids(store)) == 6
+    assert len(set(ids(store).values())) == 2
+
+
+def test_same_name_in_two_folders_is_two_notes(tmp_path, store):
+    for folder in ("a", "b"):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "Index.md").write_text(NOTE, encoding="utf-8")
+    store.import_notes([tmp_path])
+    assert len(ids(store)) == 6
+
+
+# IDs left behind by imports before notes_version 3 (question only) and 4 (note name).
+@pytest.mark.parametrize("version, note", [("2", None), ("3", "rust")])
+def test_old_ids_are_rekeyed_with_their_history(tmp_path, store, version, note):
+    (tmp_path / "rust.md").write_text(NOTE, encoding="utf-8")
+    store.import_notes([tmp_path])
+    card = next(c for c in store.due(10, new=10) if c.front == "Borrow checker")
+    store.review(card.id, "good")
+    old = cards.card_id(card.front, note=note)
+    store.db.execute("UPDATE cards SET id=? WHERE id=?", (old, card.id))
+    store.db.execute("UPDATE reviews SET card_id=? WHERE card_id=?", (old, card.id))
+    store.db.execute("UPDATE meta SET value=? WHERE key='notes_version'", (version,))
+
+    store.import_notes([tmp_path])
+    assert old not in ids(store) and len(ids(store)) == 3
+    assert not store.get(card.id).new and len(store.history(card.id)) == 1
+
+
+DAY = 86400.0
+NOW = 1_780_000_000.0
+
+
+def test_sm2_intervals_grow_by_ease():
+    card = cards.Card("c1", "rust", "q", "a")
+    interval, ease, due = cards.schedule(card, cards.GOOD, NOW)
+    assert (interval, ease) == (1.0, 2.5) and NOW < due <= NOW + DAY
+    card.interval, card.ease, card.reps, card.last_review = interval, ease, 1, NOW
+    assert cards.schedule(card, cards.GOOD, NOW + DAY)[0] == 6.0
+    card.interval, card.reps, card.last_review = 6.0, 2, NOW + DAY
+    interval, ease, _ = cards.schedule(card, cards.GOOD, NOW + 7 * DAY)
+    assert 6 * 2.5 * 0.95 <= interval <= 6 * 2.5 * 1.05 and ease == 2.5
+
+
+def test_sm2_again_relearns_and_lowers_ease():
+    card = cards.Card("c1", "rust", "q", "a", interval=30.0, reps=5, last_review=NOW - 30 * DAY)
+    interval, ease, due = cards.schedule(card, cards.AGAIN, NOW)
+    assert (interval, ease, due) == (0.0, 2.3, NOW + cards.RELEARN_MINUTES * 60)
+    assert cards.schedule(cards.Card("c2", "d", "q", "a", ease=1.3), cards.HARD, NOW)[1] == cards.MIN_EASE
+    with pytest.raises(ValueError):
+        cards.schedule(card, 5, NOW)
+
+
+def test_review_updates_card_and_history(tmp_path, store):
+    (tmp_path / "rust.md").write_text(NOTE, encoding="utf-8")
+    store.import_notes([tmp_path], now=NOW)
+    card = store.due(0, new=1, now=NOW)[0]
+    reviewed = store.review(card.id, "easy", now=NOW)
+    assert not reviewed.new and reviewed.interval == 4.0 and reviewed.reps == 1
+    assert [r.rating for r in store.history(card.id)] == [cards.EASY]
+    assert card.id not in {c.id for c in store.due(10, new=10, now=NOW)}
+
+
+def test_failed_export_is_retried(tmp_path, store, monkeypatch):
+    (tmp_path / "rust.md").write_text(NOTE, encoding="utf-8")
+    (tmp_path / "go.md").write_text(GO_NOTE, encoding="utf-8")
+    store.import_notes([tmp_path])
+    for card in store.due(10, new=10):
+        store.review(card.id, "good")
+
+    render = store._render_schedules
+    calls = []
+
+    def flaky(text, source):
+        calls.append(source)
+        if len(calls) == 2:
+            raise OSError("disk full")
+        return render(text, source)
+
+    monkeypatch.setattr(store, "_render_schedules", flaky)
+    with pytest.raises(OSError):
+        store.export_notes()
+    monkeypatch.setattr(store, "_render_schedules", render)
+    assert store.export_notes() == [calls[1]]
+    assert store.export_notes() == []
+    assert "<!--SR:" in (tmp_path / "go.md").read_text() and "<!--SR:" in (tmp_path / "rust.md").read_text()
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from lifemgr import feeds
+from lifemgr.feeds import fetch_feeds
+from lifemgr.seen import SeenStore
+from lifemgr.standin import StandinServer, write_feed_corpus
+
+
+@pytest.fixture
+def server(tmp_path):
+    write_feed_corpus(tmp_path / "corpus", 2, items_per_feed=3, body_chars=50)
+    with StandinServer(tmp_path / "corpus") as server:
+        yield server
+
+
+@pytest.fixture
+def store(tmp_path, server):
+    with SeenStore(tmp_path / "catchup.db") as store:
+        store.upsert_source("feed", server.url("feed0.rss"), name="RSS")
+        store.upsert_source("feed", server.url("feed1.atom"), name="Atom")
+        yield store
+
+
+def run_fetch(tmp_path, capsys):
+    assert feeds.main(["--db", str(tmp_path / "catchup.db"), "fetch"]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    return {line["feed"]: line for line in lines}
+
+
+def test_fetch_parses_rss_and_atom(store):
+    results = {r.source.name: r for r in fetch_feeds(store.sources("feed"))}
+    assert [i.title for i in results["RSS"].items] == ["Feed 0 post 0", "Feed 0 post 1", "Feed 0 post 2"]
+    assert results["Atom"].items[0].url == "https://feed1.example/p/0"
+    assert results["Atom"].items[0].guid == "tag:feed1.example,2026:0"
+    assert all(r.status == 200 and r.etag for r in results.values())
+
+
+def test_conditional_fetch_gets_304(store):
+    for r in fetch_feeds(store.sources("feed")):
+        store.record_fetch(r.source.id, etag=r.etag, last_modified=r.last_modified)
+    again = list(fetch_feeds(store.sources("feed")))
+    assert [r.status for r in again] == [304, 304]
+    assert all(not r.items for r in again)
+
+
+def test_validators_wait_until_items_are_marked(tmp_path, capsys, server, store):
+    first = run_fetch(tmp_path, capsys)
+    assert first["RSS"]["status"] == 200 and len(first["RSS"]["items"]) == 3
+    assert store.source("feed", server.url("feed0.rss")).etag is None
+
+    # Interrupted run: nothing marked, so the next fetch sees the same items.
+    second = run_fetch(tmp_path, capsys)
+    assert second["RSS"]["status"] == 200 and len(second["RSS"]["items"]) == 3
+
+    rss = store.source("feed", server.url("feed0.rss"))
+    store.mark_seen([i["guid"] for i in second["RSS"]["items"][:2]], rss.id)
+    assert store.source("feed", rss.key).etag is None
+    store.mark_seen([second["RSS"]["items"][2]["url"]], rss.id)
+    assert store.source("feed", rss.key).etag
+
+    third = run_fetch(tmp_path, capsys)
+    assert third["RSS"]["status"] == 304 and third["RSS"]["items"] == []
+    assert third["Atom"]["status"] == 200 and len(third["Atom"]["items"]) == 3
+
+
+def test_fetch_with_nothing_unseen_keeps_validators(tmp_path, capsys, server, store):
+    for r in fetch_feeds(store.sources("feed")):
+        store.mark_seen([i.guid for i in r.items], r.source.id)
+    run_fetch(tmp_path, capsys)
+    assert all(s.etag for s in store.sources("feed"))
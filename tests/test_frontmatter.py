@@ -0,0 +1,54 @@
+import pytest
+
+from lifemgr import frontmatter
+from lifemgr.frontmatter import _parse_simple
+
+
+def test_scalars_and_inline_lists():
+    meta = _parse_simple('title: "A: B"  # note\ncount: 3\nratio: 0.5\ndone: true\nnone:\ntags: [a, "b c"]\n')
+    assert meta == {"title": "A: B", "count": 3, "ratio": 0.5, "done": True, "none": None, "tags": ["a", "b c"]}
+
+
+def test_multi_item_block_list():
+    meta = _parse_simple("status: open\ntags:\n  - task\n  - work\n  - home\npriority: high\n")
+    assert meta == {"status": "open", "tags": ["task", "work", "home"], "priority": "high"}
+
+
+def test_unindented_block_list_and_urls():
+    meta = _parse_simple("source:\n- https://example.com/a?x=1\n- https://example.com/b\n")
+    assert meta == {"source": ["https://example.com/a?x=1", "https://example.com/b"]}
+
+
+def test_two_block_lists():
+    meta = _parse_simple("tags:\n  - a\n  - b\naliases:\n  - c\n  - d\n")
+    assert meta == {"tags": ["a", "b"], "aliases": ["c", "d"]}
+
+
+@pytest.mark.parametrize("raw", [
+    "tags: [a]\n  - b\n",          # block item after an inline value
+    "people:\n  - name: x\n",      # list of mappings
+    "outer:\n  inner: 1\n",        # nested mapping
+])
+def test_real_nesting_is_rejected(raw):
+    with pytest.raises(ValueError):
+        _parse_simple(raw)
+
+
+def test_split_keeps_block_list_frontmatter():
+    meta, body, body_line = frontmatter.split("---\nstatus: open\ntags:\n  - task\n  - work\n---\n# Title\n")
+    assert meta == {"status": "open", "tags": ["task", "work"]}
+    assert body == "# Title\n"
+    assert body_line == 7
+
+
+def test_split_without_frontmatter():
+    assert frontmatter.split("# Just a note\n") == ({}, "# Just a note\n", 1)
+
+
+def test_render_round_trips():
+    meta = {"title": 'He said "hi"', "n": 2, "tags": ["a", "b"], "ok": False}
+    assert frontmatter.split(frontmatter.render(meta))[0] == meta
+
+
+def test_tags_from_field_and_body():
+    assert frontmatter.tags({"tags": ["#task", "work"]}, "text #inline/tag and #task") == ["task", "work", "inline/tag"]
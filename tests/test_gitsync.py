@@ -0,0 +1,63 @@
+import os
+import subprocess
+
+import pytest
+
+from lifemgr.gitsync import sync_all, sync_repo
+
+IDENTITY = {"GIT_AUTHOR_NAME": "test", "GIT_AUTHOR_EMAIL": "test@localhost",
+            "GIT_COMMITTER_NAME": "test", "GIT_COMMITTER_EMAIL": "test@localhost"}
+
+
+def git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, env={**os.environ, **IDENTITY})
+
+
+@pytest.fixture
+def repos(tmp_path):
+    """A clone of a bare remote, and a second clone to push upstream changes from."""
+    bare, work, other = tmp_path / "up.git", tmp_path / "work", tmp_path / "other"
+    git(tmp_path, "init", "-q", "--bare", str(bare))
+    git(tmp_path, "clone", "-q", str(bare), str(work))
+    (work / "README.md").write_text("# repo\n")
+    git(work, "add", "README.md")
+    git(work, "commit", "-q", "-m", "init")
+    git(work, "push", "-q", "origin", "HEAD")
+    git(tmp_path, "clone", "-q", str(bare), str(other))
+    return work, other
+
+
+def push_upstream_change(other):
+    (other / "NEWS.md").write_text("news\n")
+    git(other, "add", "NEWS.md")
+    git(other, "commit", "-q", "-m", "news")
+    git(other, "push", "-q")
+
+
+def test_pull_fast_forwards_a_clean_repo(repos):
+    work, other = repos
+    push_upstream_change(other)
+    result, _ = sync_repo(work, pull=True)
+    assert (result.action, result.behind, result.error) == ("pulled", 0, None)
+    assert (work / "NEWS.md").exists()
+
+
+def test_pull_leaves_a_dirty_repo_alone(repos):
+    work, other = repos
+    push_upstream_change(other)
+    (work / "README.md").write_text("# local edit\n")
+    result, entry = sync_repo(work, pull=True)
+    assert (result.action, result.behind, result.dirty) == ("fetched", 1, 1)
+    assert not (work / "NEWS.md").exists()
+
+    again, _ = sync_repo(work, entry, pull=True)
+    assert again.action == "cached"
+
+
+def test_unchanged_repos_are_cached(tmp_path, repos):
+    work, other = repos
+    state = tmp_path / "git-sync.json"
+    assert [r.action for r in sync_all([work], state_path=state)] == ["fetched"]
+    assert [r.action for r in sync_all([work], state_path=state)] == ["cached"]
+    push_upstream_change(other)
+    assert [(r.action, r.behind) for r in sync_all([work], state_path=state)] == [("fetched", 1)]
@@ -0,0 +1,123 @@
+import json
+import threading
+from datetime import date
+
+import pytest
+
+from lifemgr.memories import MemoryStore
+
+TODAY = date(2026, 6, 15)
+
+
+@pytest.fixture
+def root(tmp_path):
+    return tmp_path / "memories"
+
+
+@pytest.fixture
+def store(tmp_path, root):
+    with MemoryStore(root, tmp_path / "a.db") as store:
+        yield store
+
+
+@pytest.fixture
+def other(tmp_path, root, store):
+    """A second store on the same folder, as another process would open it."""
+    with MemoryStore(root, tmp_path / "b.db") as other:
+        yield other
+
+
+def generation(root):
+    return json.loads((root / "log.jsonl").read_text().splitlines()[0])["generation"]
+
+
+def test_sync_replays_external_appends(root, store, other):
+    first = store.add("Prefers short PR descriptions", type="preference", tags=["writing"])
+    assert other.sync() == 1
+    assert other.get(first.id).tags == ["writing"]
+    assert other.sync() == 0
+
+    # A line still being written is left for the next sync.
+    with open(root / "log.jsonl", "a") as fh:
+        fh.write('{"op": "pin", "id": "' + first.id + '", "pin')
+    assert other.sync() == 0
+    with open(root / "log.jsonl", "a") as fh:
+        fh.write('ned": true}\n')
+    assert other.sync() == 1 and other.get(first.id).pinned
+
+
+def test_sync_rebuilds_after_a_new_generation(root, store, other):
+    for i in range(3):
+        store.add(f"Memory {i}", f"body {i}", day=f"2026-06-0{i + 1}")
+    other.sync()
+    before = generation(root)
+    store._rewrite_log()
+    assert generation(root) != before
+    other.sync()
+    assert other.count() == 3
+    assert [m.title for m in other.find()] == ["Memory 2", "Memory 1", "Memory 0"]
+
+
+def test_load_fills_the_budget_by_score(store):
+    old = store.add("Old insight", "x " * 400, day="2025-01-01")
+    tagged = store.add("Git habit", "Rebases before pushing.", type="preference", tags=["git"], day="2026-05-01")
+    recent = store.add("Recent note", "Something from yesterday.", day="2026-06-14")
+    pinned = store.add("Pinned rule", "Never force-push main.", day="2024-01-01", pinned=True)
+
+    budget = pinned.tokens + tagged.tokens + recent.tokens + 10
+    chosen = [m.id for m, _ in store.load(budget=budget, tags=["git"], today=TODAY)]
+    assert chosen == [pinned.id, tagged.id, recent.id]
+    assert old.tokens > budget - sum(store.get(i).tokens for i in chosen)
+    assert store.load(budget=5, today=TODAY) == []
+
+
+def test_compact_merges_near_duplicates(root, store, other):
+    body = "Always run the full test suite before tagging a release, including the slow integration tests."
+    older = store.add("Run tests before release", body, tags=["release"], day="2026-06-01")
+    newer = store.add("Run tests before release", body + " Really.", tags=["ci"], day="2026-06-10")
+    store.add("Unrelated", "Coffee after noon ruins sleep.", day="2026-06-05")
+    store.add("Run tests before release", body, type="decision", day="2026-06-02")
+
+    assert store.compact(dry_run=True) == [[newer.id, older.id]]
+    assert store.count() == 4
+    assert store.compact() == [[newer.id, older.id]]
+    assert store.count() == 3
+    assert store.get(newer.id).tags == ["ci", "release"]
+    assert (root / "archive" / older.file).exists() and not (root / older.file).exists()
+    other.sync()
+    assert older.id not in {m.id for m in other.find()} and other.count() == 3
+
+
+def test_writers_wait_for_the_lock(store, other):
+    done = threading.Event()
+
+    def capture():
+        with MemoryStore(other.root, other.db_path) as writer:
+            writer.add("Captured during compaction")
+        done.set()
+
+    with store._locked():
+        thread = threading.Thread(target=capture)
+        thread.start()
+        assert not done.wait(0.3)
+        store._rewrite_log()
+    thread.join(5)
+    assert done.is_set()
+    store.sync()
+    assert [m.title for m in store.find()] == ["Captured during compaction"]
+
+
+def test_migrate_index_json_is_idempotent(root, store):
+    root.mkdir(exist_ok=True)
+    (root / "2026-01-02-tabs.md").write_text("---\ntype: preference\n---\n# Tabs\n\nPrefers tabs.\n")
+    (root / "2026-02-03-untracked.md").write_text("# Untracked\n\nFound on disk.\n")
+    (root / "about-me.md").write_text("# About\n")
+    (root / "index.json").write_text(json.dumps({"memories": [
+        {"file": "2026-01-02-tabs.md", "date": "2026-01-02", "tags": ["#Editor"], "title": "Tabs over spaces"},
+        {"file": "missing.md"}]}))
+    assert store.migrate_index_json() == 2
+    assert store.migrate_index_json() == 0
+    found = {m.file: m for m in store.find()}
+    assert set(found) == {"2026-01-02-tabs.md", "2026-02-03-untracked.md"}
+    tabs = found["2026-01-02-tabs.md"]
+    assert (tabs.title, tabs.type, tabs.tags) == ("Tabs over spaces", "preference", ["editor"])
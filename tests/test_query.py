@@ -0,0 +1,60 @@
+import pytest
+
+from lifemgr.query import Condition, Issue, NoteTable, issue_number, plan_issues
+
+
+def issue(number, *, status="open", depends_on=(), project="acme"):
+    return Issue(project, str(number), f"{project}/issues/{number:03d}", "TASK", f"Issue {number}", status,
+                 [str(d) for d in depends_on])
+
+
+@pytest.mark.parametrize("ref", ["TASK-007", "007", 7, "007-fix-login", "BUG-7"])
+def test_issue_number(ref):
+    assert issue_number(ref) == "7"
+
+
+def test_plan_orders_open_issues_after_their_dependencies():
+    plan = plan_issues([issue(1, status="done"), issue(2, depends_on=[3]), issue(3, depends_on=[1]),
+                        issue(4), issue(5, depends_on=[9])])
+    assert [i.number for i in plan.order] == ["3", "2", "4", "5"]
+    assert [i.number for i in plan.ready] == ["3", "4"]
+    assert {i.number: i.waiting_on for i in plan.blocked} == {"2": ["3"], "5": ["9"]}
+    assert plan.cycles == []
+
+
+def test_plan_reports_cycles_as_blocked():
+    plan = plan_issues([issue(1, depends_on=[3]), issue(2, depends_on=[1]), issue(3, depends_on=[2]), issue(4)])
+    assert [i.number for i in plan.ready] == ["4"]
+    assert [i.number for i in plan.blocked] == ["1", "2", "3"]
+    assert [sorted(c) for c in plan.cycles] == [["acme#1", "acme#2", "acme#3"]]
+
+
+def test_dependencies_stay_within_a_project():
+    plan = plan_issues([issue(1, project="a", status="done"), issue(2, project="b", depends_on=[1])])
+    assert [i.key for i in plan.blocked] == ["b#2"]
+
+
+def test_table_matches_block_list_tags(tmp_path):
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    (vault / "one.md").write_text("---\ntags:\n  - task\n  - area/work\nstatus: open\n---\nbody\n")
+    (vault / "two.md").write_text("---\ntags: [idea]\nstatus: open\n---\nbody\n")
+    tbl = NoteTable(vault, "**/*.md", cache_dir=tmp_path / "cache")
+    tbl.refresh()
+    assert [r["name"] for r in tbl.select(["tags~task"])] == ["one"]
+    assert [r["name"] for r in tbl.select(["status=open"], sort=["-name"])] == ["two", "one"]
+
+
+def test_list_values_in_conditions(tmp_path):
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    (vault / "one.md").write_text("---\ntags: [task, area/work]\n---\n")
+    (vault / "two.md").write_text("---\ntags: [task]\n---\n")
+    tbl = NoteTable(vault, "**/*.md", cache_dir=tmp_path / "cache")
+    tbl.refresh()
+    assert Condition.parse("tags=[a, b]").value == ("a", "b")
+    assert [r["name"] for r in tbl.select(["tags=[area/work, task]"])] == ["one"]
+    assert [r["name"] for r in tbl.select(["tags~[task, area/work]"])] == ["one"]
+    assert [r["name"] for r in tbl.select(["tags!=[task]"])] == ["one"]
+    # Same conditions again come from the memo.
+    assert [r["name"] for r in tbl.select(["tags=[area/work, task]"])] == ["one"]
@@ -0,0 +1,105 @@
+import json
+import os
+
+import pytest
+
+from lifemgr import search
+from lifemgr.search import VaultIndex, chunk_markdown
+
+SLEEP = """---
+tags: [health, learning]
+status: active
+---
+# Sleep
+
+Notes on sleep hygiene.
+
+## Caffeine
+
+No coffee after noon.
+
+```
+# not a heading
+```
+
+## Light
+Morning light sets the clock.
+"""
+
+
+@pytest.fixture
+def vault(tmp_path):
+    vault = tmp_path / "vault"
+    (vault / "05 Personal").mkdir(parents=True)
+    (vault / "07 Knowledge Base").mkdir()
+    (vault / ".obsidian").mkdir()
+    (vault / "05 Personal" / "Sleep.md").write_text(SLEEP, encoding="utf-8")
+    (vault / "07 Knowledge Base" / "Coffee.md").write_text(
+        "---\ntags: [food]\n---\n# Coffee\n\nCoffee brewing ratios and caffeine content.\n", encoding="utf-8")
+    (vault / ".obsidian" / "ignored.md").write_text("caffeine\n", encoding="utf-8")
+    return vault
+
+
+@pytest.fixture
+def index(tmp_path, vault):
+    with VaultIndex(vault, tmp_path / "index") as index:
+        index.update()
+        yield index
+
+
+def test_chunk_markdown_splits_at_headings_outside_fences():
+    body = SLEEP.split("---\n", 2)[2]
+    chunks = chunk_markdown(body, first_line=5)
+    assert [(c.heading, c.line_start, c.line_end) for c in chunks] == [
+        ("Sleep", 5, 8), ("Sleep > Caffeine", 9, 16), ("Sleep > Light", 17, 18)]
+    assert "# not a heading" in chunks[1].text
+    assert SLEEP.splitlines()[chunks[2].line_start - 1] == "## Light"
+
+
+def test_long_sections_split_at_blank_lines(monkeypatch):
+    monkeypatch.setattr(search, "MAX_CHUNK_CHARS", 40)
+    chunks = chunk_markdown("# A\n" + "\n".join(f"paragraph {i} " * 3 + "\n" for i in range(4)))
+    assert len(chunks) > 1 and all(c.heading == "A" for c in chunks)
+    assert [c.line_start for c in chunks] == sorted(c.line_start for c in chunks)
+
+
+def test_update_is_incremental(vault, index):
+    assert index.stats() == {"notes": 2, "chunks": 4, "embedded": 0}
+    assert index.update() == {"scanned": 2, "indexed": 0, "unchanged": 0, "removed": 0, "chunks": 0}
+
+    coffee = vault / "07 Knowledge Base" / "Coffee.md"
+    st = coffee.stat()
+    os.utime(coffee, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    (vault / "05 Personal" / "Sleep.md").unlink()
+    (vault / "New.md").write_text("# New\n\nFresh caffeine note.\n", encoding="utf-8")
+    stats = index.update()
+    assert (stats["indexed"], stats["unchanged"], stats["removed"]) == (1, 1, 1)
+    assert {h.path for h in index.query("caffeine")} == {"07 Knowledge Base/Coffee.md", "New.md"}
+
+
+def test_query_filters(index):
+    hits = index.query("caffeine", tags=["#Health"])
+    assert [(h.path, h.heading, h.line_start, h.line_end) for h in hits] == [
+        ("05 Personal/Sleep.md", "Sleep > Caffeine", 9, 16)]
+    assert "**" in hits[0].snippet and hits[0].tags == ["health", "learning"]
+    assert [h.path for h in index.query("caffeine", folder="07 Knowledge Base/")] == ["07 Knowledge Base/Coffee.md"]
+    assert [h.path for h in index.query("caffeine", where={"status": "active"})] == ["05 Personal/Sleep.md"]
+    assert index.query("caffeine", tags=["missing"]) == []
+
+
+def test_rrf_fusion_rewards_agreement():
+    fused = search._fuse([(1, 9.0), (2, 8.0), (3, 7.0)], [(3, 0.9), (1, 0.8)])
+    assert [cid for cid, _ in fused] == [1, 3, 2]
+    assert fused[0][1] == pytest.approx(1 / 61 + 1 / 62)
+
+
+def test_query_updates_only_when_stale(tmp_path, vault, capsys):
+    def query(*flags):
+        argv = ["--vault", str(vault), "--index-dir", str(tmp_path / "index"), "query", "morning", "--json", *flags]
+        assert search.main(argv) == 0
+        return [h["path"] for h in json.loads(capsys.readouterr().out)]
+
+    assert query() == ["05 Personal/Sleep.md"]
+    (vault / "Morning.md").write_text("# Morning\n\nMorning routine.\n", encoding="utf-8")
+    assert query() == ["05 Personal/Sleep.md"]
+    assert sorted(query("--refresh")) == ["05 Personal/Sleep.md", "Morning.md"]
@@ -0,0 +1,122 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+from lifemgr import templates
+from lifemgr.templates import IssueNumbers, Template, new_issues, write_batch
+
+NOW = datetime(2026, 10, 18, 9, 5)
+
+TEMPLATE = """---
+status: open  # open | in_progress | blocked
+created: "YYYY-MM-DD"
+owner: "TODO: who"
+---
+
+# BUG-###: [Bug Title]
+
+Seen on {{date:dddd, MMMM Do}} at {{time}}.
+
+```
+### YYYY-MM-DD HH:MM
+```
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(templates.paths, "CACHE_DIR", tmp_path / "cache")
+
+
+@pytest.fixture
+def ideas(tmp_path):
+    issue = tmp_path / "ideas" / "acme" / "issues" / "007-old-bug"
+    issue.mkdir(parents=True)
+    (issue / "BUG-007.md").write_text("# BUG-007: Old bug\n", encoding="utf-8")
+    return tmp_path / "ideas"
+
+
+def test_render_fills_placeholders():
+    template = Template(TEMPLATE)
+    assert set(template.fields) == {"status", "created", "owner", "number", "title", "date", "time"}
+    text = template.render({"title": "Login fails", "owner": "sam", "unknown": 1}, now=NOW, number=12)
+    assert text.startswith('---\nstatus: open  # open | in_progress | blocked\ncreated: "2026-10-18"\n'
+                           'owner: "sam"\n---\n')
+    assert "# BUG-012: Login fails\n" in text
+    assert "Seen on Sunday, October 18th at 09:05." in text
+
+
+def test_unfilled_placeholders_keep_their_text():
+    text = Template(TEMPLATE).render(now=NOW)
+    assert 'owner: "TODO: who"' in text and "# BUG-###: [Bug Title]" in text
+
+
+def test_fenced_code_is_copied_as_is():
+    text = Template(TEMPLATE).render(now=NOW, number=1)
+    assert text.endswith("```\n### YYYY-MM-DD HH:MM\n```\n")
+
+
+def test_options_are_validated():
+    template = Template(TEMPLATE)
+    assert template.fields["status"].options == ("open", "in_progress", "blocked")
+    assert 'status: "blocked"  # open' in template.render({"status": "blocked"}, now=NOW)
+    with pytest.raises(ValueError, match="is not one of open"):
+        template.render({"status": "done"}, now=NOW)
+    with pytest.raises(ValueError, match="not an issue number"):
+        template.render(now=NOW, number="abc")
+
+
+def test_allocate_continues_from_the_index(tmp_path, ideas):
+    with IssueNumbers(ideas, tmp_path / "numbers.db") as numbers:
+        assert numbers.highest("acme") == 7
+        assert numbers.allocate("acme", 2) == [8, 9]
+        assert numbers.allocate("acme") == [10]
+        assert numbers.allocate("other") == [1]
+
+
+def test_allocators_sharing_a_database_get_distinct_numbers(tmp_path, ideas):
+    got: list[int] = []
+    lock = threading.Lock()
+
+    def allocate():
+        with IssueNumbers(ideas, tmp_path / "numbers.db") as numbers:
+            for _ in range(5):
+                found = numbers.allocate("acme")
+                with lock:
+                    got.extend(found)
+
+    threads = [threading.Thread(target=allocate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert sorted(got) == list(range(8, 28))
+
+
+def test_write_batch_handles_existing_names(tmp_path):
+    taken = tmp_path / "notes" / "a.md"
+    taken.parent.mkdir()
+    taken.write_text("old\n", encoding="utf-8")
+    notes = [(taken, "new\n"), (taken, "newer\n")]
+
+    assert write_batch(notes, exists="skip") == [None, None]
+    assert taken.read_text() == "old\n"
+    assert write_batch(notes) == [taken.with_name("a (2).md"), taken.with_name("a (3).md")]
+    assert write_batch(notes, exists="replace") == [taken, taken]
+    assert taken.read_text() == "newer\n"
+    assert sorted(p.name for p in taken.parent.iterdir()) == ["a (2).md", "a (3).md", "a.md"]
+    with pytest.raises(ValueError):
+        write_batch(notes, exists="overwrite")
+
+
+def test_new_issues_are_numbered_in_order(tmp_path, ideas):
+    with IssueNumbers(ideas, tmp_path / "numbers.db") as numbers:
+        paths = new_issues("acme", [{"kind": "bug", "title": "Login fails"}, {"title": "Add logout"}],
+                           ideas=ideas, numbers=numbers, plan=True, now=NOW)
+        assert [p.relative_to(ideas).as_posix() for p in paths] == [
+            "acme/issues/008-login-fails/BUG-008.md", "acme/issues/009-add-logout/TASK-009.md"]
+        assert (paths[0].parent / "PLAN.md").exists()
+        assert "# 008: Login fails" in paths[0].read_text()
+        with pytest.raises(ValueError, match="kind must be one of"):
+            new_issues("acme", [{"kind": "epic"}], ideas=ideas, numbers=numbers)
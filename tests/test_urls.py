@@ -0,0 +1,34 @@
+import pytest
+
+from lifemgr.urls import item_hash, normalize_url, youtube_id
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTP://WWW.Example.com:80/post/?utm_source=x&b=2&a=1#top", "https://example.com/post?a=1&b=2"),
+    ("https://example.com/p?fbclid=abc&id=7", "https://example.com/p?id=7"),
+    ("https://example.com:8443/", "https://example.com:8443"),
+    ("https://github.com/org/repo/tree/main?ref=v1.2", "https://github.com/org/repo/tree/main?ref=v1.2"),
+    ("https://medium.com/@a/post-1?source=rss----abc", "https://medium.com/@a/post-1"),
+    ("https://example.com/p?ref=hn&id=7", "https://example.com/p?id=7"),
+    ("https://www.gitlab.com/org/repo/-/tree/main?ref=v2&utm_source=x", "https://gitlab.com/org/repo/-/tree/main?ref=v2"),
+    ("tag:example.com,2026:1", "tag:example.com,2026:1"),
+])
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
+
+
+@pytest.mark.parametrize("url", [
+    "https://youtu.be/dQw4w9WgXcQ?si=abc",
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42s",
+    "https://m.youtube.com/shorts/dQw4w9WgXcQ",
+    "https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ",
+])
+def test_youtube_links_collapse(url):
+    assert youtube_id(url) == "dQw4w9WgXcQ"
+    assert normalize_url(url) == "https://youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+def test_item_hash_uses_the_normalized_url():
+    assert item_hash("http://www.example.com/a/?utm_medium=rss") == item_hash("https://example.com/a")
+    assert item_hash("https://example.com/a?source=rss") == item_hash("https://example.com/a")
+    assert item_hash("https://github.com/o/r?ref=dev") != item_hash("https://github.com/o/r")
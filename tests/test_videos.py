@@ -0,0 +1,87 @@
+import pytest
+
+from lifemgr import videos
+from lifemgr.seen import SeenStore
+from lifemgr.standin import StandinServer, write_video_corpus
+from lifemgr.videos import HttpTranscripts, TranscriptCache, TranscriptPipeline, excerpt
+
+
+@pytest.fixture
+def server(tmp_path):
+    write_video_corpus(tmp_path / "corpus", 2, 2, minutes=2)
+    with StandinServer(tmp_path / "corpus") as server:
+        yield server
+
+
+@pytest.fixture
+def store(tmp_path, server):
+    with SeenStore(tmp_path / "catchup.db") as store:
+        for i in range(2):
+            store.upsert_source("channel", f"UCstandin{i:015d}", name=f"Channel {i}")
+        yield store
+
+
+def pipeline(tmp_path, server, feed_url="channels/{channel_id}.xml"):
+    return TranscriptPipeline(HttpTranscripts(server.url("transcripts/{video_id}.vtt")),
+                              TranscriptCache(tmp_path / "cache"), excerpt, feed_url=server.url(feed_url),
+                              chunk_words=100)
+
+
+def test_pipeline_summarizes_every_video(tmp_path, server, store):
+    results = list(pipeline(tmp_path, server).run(store.sources("channel")))
+    assert sorted(r.video.video_id for r in results) == ["c000v000000", "c000v000001", "c001v000000", "c001v000001"]
+    assert all(not r.error and r.chunks == len(r.parts) > 1 for r in results)
+
+
+def test_raising_discover_is_reported_not_hung(tmp_path, server, store, monkeypatch):
+    fetch_feed = videos.fetch_feed
+
+    def flaky(source, *args, **kwargs):
+        if source.key.endswith("000000000000001.xml"):
+            raise RuntimeError("boom")
+        return fetch_feed(source, *args, **kwargs)
+
+    monkeypatch.setattr(videos, "fetch_feed", flaky)
+    failed = []
+    results = list(pipeline(tmp_path, server).run(
+        store.sources("channel"), on_feed=lambda source, result: result.ok or failed.append(result)))
+    assert sorted(r.video.video_id for r in results) == ["c000v000000", "c000v000001"]
+    assert [(r.source.name, r.error) for r in failed] == [("Channel 1", "RuntimeError: boom")]
+
+
+@pytest.mark.parametrize("template", ["channels/{id}.xml", "channels/feed.xml", "channels/{0}.xml"])
+def test_bad_feed_template_is_rejected(tmp_path, server, template):
+    with pytest.raises(ValueError, match="bad URL template"):
+        pipeline(tmp_path, server, template)
+    with pytest.raises(SystemExit) as exc:
+        videos.main(["--db", str(tmp_path / "catchup.db"), "catchup", "--feed-url", server.url(template)])
+    assert exc.value.code == 2
+
+
+def test_non_http_template_is_rejected():
+    with pytest.raises(ValueError, match="not an http"):
+        videos.check_url_template("file:///srv/{video_id}.vtt", "video_id")
+
+
+def catchup(tmp_path, server, *args):
+    return videos.main(["--db", str(tmp_path / "catchup.db"), "--cache", str(tmp_path / "cache"),
+                        "--transcript-url", server.url("transcripts/{video_id}.vtt"), "catchup",
+                        "--feed-url", server.url("channels/{channel_id}.xml"), "--summarize", "excerpt",
+                        "--capture-dir", str(tmp_path / "Capture"), *args])
+
+
+def test_validators_wait_until_videos_are_written(tmp_path, server, store, monkeypatch):
+    monkeypatch.setattr(videos.paths, "CACHE_DIR", tmp_path / "index")
+    missing = tmp_path / "corpus" / "transcripts" / "c001v000001.vtt"
+    missing.rename(missing.with_suffix(".bak"))
+    assert catchup(tmp_path, server) == 0
+    assert all(s.etag is None for s in store.sources("channel"))
+
+    assert catchup(tmp_path, server, "--write") == 0
+    assert [s.etag is not None for s in store.sources("channel")] == [True, False]
+    assert len(list((tmp_path / "Capture").glob("*.md"))) == 3
+
+    missing.with_suffix(".bak").rename(missing)
+    assert catchup(tmp_path, server, "--write") == 0
+    assert all(s.etag is not None for s in store.sources("channel"))
+    assert len(list((tmp_path / "Capture").glob("*.md"))) == 4